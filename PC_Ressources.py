@@ -1,113 +1,3618 @@
 import os, datetime as dt
 from collections import deque
-import matplotlib.pyplot as plt, matplotlib
-from matplotlib.patches import Rectangle  # Ajout de cet import explicite
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import wmi
+import math
+import random
+import sys
+import numpy as np
 import psutil
 import logging
-import tkinter as tk
-from tkinter import ttk
 import subprocess
-import winreg
-import shutil
 import threading
 import time
+import struct
+import heapq
+import queue
+import hashlib
+import pickle
+import concurrent.futures
+import multiprocessing
+import functools
+import glob
+import fnmatch
+import tempfile
+import json
+import signal
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Tk n'est requis que par l'interface : le mode sans interface s'en passe
+try:
+    import tkinter as tk
+    from tkinter import messagebox, ttk
+except ImportError:
+    tk = ttk = messagebox = None
+
+# matplotlib, le backend TkAgg et les modules propres à Windows (wmi, winreg)
+# sont importés à la première utilisation : ni le démarrage ni les pages sans
+# graphique ne paient leur chargement.
 
 
 class SystemMonitorGUI:
-    def __init__(self):
+    def __init__(self, backend=None, history_path=None, attach=None):
         self.root = tk.Tk()
         self.root.title("Moniteur Système Avancé")
-        self.root.state('zoomed')  # Plein écran
+        try:
+            self.root.state('zoomed')  # Plein écran
+        except tk.TclError:
+            self.root.attributes('-zoomed', True)  # Équivalent sous X11
+
+        # Configuration du style
+        self.style = ttk.Style()
+        self.style.configure('Nav.TButton', padding=5)
+
+        # Création de la barre de navigation
+        self.create_navbar()
+
+        # Création du conteneur principal
+        self.main_container = ttk.Frame(self.root)
+        self.main_container.pack(fill=tk.BOTH, expand=True)
+
+        # Collecteur de métriques partagé par toutes les pages, local ou distant
+        if attach:
+            self.collector = RemoteCollector(attach)
+        else:
+            self.collector = MetricCollector(backend, store=HistoryStore(history_path, MetricCollector.SERIES),
+                                             adaptive=AdaptiveInterval())
+            self.collector.restore()
+            self.collector.alerts.open_log()
+        self.collector.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Initialisation des pages
+        self.pages = {}
+        self.create_pages()
+
+        # Overlay de diagnostic (F12) : coût du moniteur lui-même
+        self.overlay = None
+        self.root.bind('<F12>', lambda event: self.toggle_overlay())
+
+        # Afficher la page principale par défaut
+        self.show_page('main')
+        self.refresh_alerts()
+
+    def refresh_alerts(self):
+        snap = self.collector.latest()
+        alerts = snap.get('alerts', []) if snap else []
+        if alerts:
+            first = alerts[0]
+            label = f" [{first['label']}]" if first['label'] else ""
+            color = 'red' if any(a['severity'] == 'critical' for a in alerts) else 'darkorange'
+            self.alert_label.config(
+                text=f"⚠ {len(alerts)} alerte(s) : {first['rule']}{label} ({first['value']:.1f})",
+                foreground=color)
+        else:
+            self.alert_label.config(text="Aucune alerte", foreground='gray')
+        self.root.after(1000, self.refresh_alerts)
+
+    def toggle_overlay(self):
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+            return
+        self.overlay = tk.Frame(self.root, bg='#ffffe0', relief='solid', borderwidth=1)
+        self.overlay_text = tk.Label(self.overlay, font=('Courier', 9), justify=tk.LEFT,
+                                     anchor='nw', bg='#ffffe0')
+        self.overlay_text.pack(padx=5, pady=5)
+        ttk.Button(self.overlay, text="Exporter JSON",
+                   command=self.export_instrumentation).pack(anchor='e', padx=5, pady=(0, 5))
+        self.overlay.place(relx=1.0, rely=0.0, x=-10, y=50, anchor='ne')
+        self.refresh_overlay()
+
+    def refresh_overlay(self):
+        if self.overlay is None:
+            return
+        self.overlay_text.config(text=self.collector.instruments.report())
+        self.overlay.after(1000, self.refresh_overlay)
+
+    def export_instrumentation(self):
+        path = self.collector.instruments.export()
+        self.overlay_text.config(text=self.collector.instruments.report() + f"\n\nExporté : {path}")
+
+    def on_close(self):
+        # Threads et fichiers des pages d'abord, puis le collecteur qu'elles lisent
+        for page in self.pages.values():
+            page.close()
+        self.collector.stop()
+        self.root.destroy()
+
+    def create_navbar(self):
+        navbar = ttk.Frame(self.root)
+        navbar.pack(fill=tk.X, padx=5, pady=5)
+
+        # Boutons de navigation
+        ttk.Button(navbar, text="Moniteur Principal",
+                   command=lambda: self.show_page('main'),
+                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(navbar, text="Optimisation Stockage",
+                   command=lambda: self.show_page('storage'),
+                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(navbar, text="Optimisation RAM",
+                   command=lambda: self.show_page('ram'),
+                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(navbar, text="Performances",
+                   command=lambda: self.show_page('performance'),
+                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(navbar, text="Conteneurs",
+                   command=lambda: self.show_page('cgroups'),
+                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(navbar, text="Diagnostics (F12)",
+                   command=self.toggle_overlay,
+                   style='Nav.TButton').pack(side=tk.RIGHT, padx=5)
+
+        # Alertes en cours, visibles depuis toutes les pages
+        self.alert_label = ttk.Label(navbar, text="Aucune alerte", foreground='gray')
+        self.alert_label.pack(side=tk.RIGHT, padx=10)
+
+    def create_pages(self):
+        # Les pages ne sont construites qu'à leur premier affichage
+        self.page_classes = {
+            'main': MainPage,  # Page principale (avec les graphiques existants)
+            'storage': StoragePage,  # Page d'optimisation du stockage
+            'ram': RAMPage,  # Page d'optimisation de la RAM
+            'performance': PerformancePage,  # Page des performances
+            'cgroups': CgroupPage,  # Consommation par cgroup (conteneurs, services)
+        }
+
+    def show_page(self, page_name):
+        # Cacher toutes les pages
+        for page in self.pages.values():
+            page.hide()
+
+        # Afficher la page demandée, en la construisant si besoin
+        if page_name not in self.pages:
+            self.pages[page_name] = self.page_classes[page_name](self.main_container, self.collector)
+        self.pages[page_name].show()
+
+
+class MetricBackend:
+    """Interface des sources de métriques utilisées par MetricCollector.
+
+    `sample()` retourne un dict avec les clés : ram et disk (Go libres), cpu (%),
+    cpu_cores (liste de %), mem_total et mem_available (octets),
+    disk_read, disk_write, net_sent et net_recv (compteurs cumulés en octets),
+    disks {nom: (lus, écrits)} et nics {nom: (envoyés, reçus)} par périphérique.
+    Optionnellement : cpu_modes, [user, system, iowait, steal] en % par cœur ;
+    swap_in et swap_out (compteurs cumulés en octets), et mem_some / mem_full,
+    pression mémoire (PSI) en % du temps sur 10 s.
+    Les capteurs (températures...) sont lus à part, par les sources que
+    retourne `sensor_sources()`.
+    """
+    name = 'base'
+
+    def sensor_sources(self):
+        return []
+
+    def open(self):
+        """Appelé depuis le thread de collecte avant le premier échantillon."""
+        pass
+
+    def close(self):
+        pass
+
+    def sample(self):
+        raise NotImplementedError
+
+
+class PsutilBackend(MetricBackend):
+    """Lecture historique via psutil ; capteurs via WMI sous Windows."""
+    name = 'psutil'
+
+    def sensor_sources(self):
+        if sys.platform == 'win32':
+            return [WmiSensors(), BatterySensors()]
+        return [PsutilSensors(), BatterySensors()]
+
+    def sample(self):
+        mem = psutil.virtual_memory()
+        snap = {
+            'ram': mem.available / (1024 ** 3),
+            'disk': self.get_disk(),
+            'cpu': psutil.cpu_percent(interval=None),
+            'cpu_cores': psutil.cpu_percent(percpu=True),
+            'mem_total': mem.total,
+            'mem_available': mem.available,
+        }
+
+        try:
+            # Noms Linux ; Windows n'a ni iowait ni steal, ses interruptions comptent en système
+            snap['cpu_modes'] = [[t.user + getattr(t, 'nice', 0.0),
+                                  t.system + getattr(t, 'irq', 0.0) + getattr(t, 'softirq', 0.0)
+                                  + getattr(t, 'interrupt', 0.0) + getattr(t, 'dpc', 0.0),
+                                  getattr(t, 'iowait', 0.0), getattr(t, 'steal', 0.0)]
+                                 for t in psutil.cpu_times_percent(percpu=True)]
+        except Exception:
+            pass
+
+        try:
+            disk_io = psutil.disk_io_counters()
+            snap['disk_read'] = disk_io.read_bytes
+            snap['disk_write'] = disk_io.write_bytes
+            snap['disks'] = {name: (io.read_bytes, io.write_bytes)
+                             for name, io in psutil.disk_io_counters(perdisk=True).items()}
+        except Exception:
+            snap['disk_read'] = snap['disk_write'] = 0
+            snap['disks'] = {}
+
+        try:
+            nics = psutil.net_io_counters(pernic=True)
+            snap['nics'] = {name: (io.bytes_sent, io.bytes_recv) for name, io in nics.items()}
+            snap['net_sent'] = sum(io.bytes_sent for io in nics.values())
+            snap['net_recv'] = sum(io.bytes_recv for io in nics.values())
+        except Exception:
+            snap['net_sent'] = snap['net_recv'] = 0
+            snap['nics'] = {}
+
+        try:
+            swap = psutil.swap_memory()
+            snap['swap_in'], snap['swap_out'] = swap.sin, swap.sout
+        except Exception:
+            pass
+        psi = read_psi()
+        if psi is not None:
+            snap['mem_some'], snap['mem_full'] = psi
+
+        return snap
+
+    @staticmethod
+    def get_disk():
+        return psutil.disk_usage(os.path.abspath(os.sep)).free / (1024 ** 3)
+
+
+class ProcFile:
+    """Fichier /proc gardé ouvert et relu depuis le début dans un tampon réutilisé."""
+
+    def __init__(self, path, size=16384):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+
+    def read(self):
+        n = os.preadv(self.fd, [self.view], 0)
+        while n == len(self.buf):
+            # Tampon trop petit : on l'agrandit une fois pour toutes
+            self.buf = bytearray(len(self.buf) * 2)
+            self.view = memoryview(self.buf)
+            n = os.preadv(self.fd, [self.view], 0)
+        return self.view[:n]
+
+    def close(self):
+        self.view.release()
+        os.close(self.fd)
+
+
+def parse_psi(data):
+    """(some, full) : moyennes sur 10 s d'un fichier de pression (PSI), en % du temps."""
+    some = full = 0.0
+    for line in data.split(b'\n'):
+        if line.startswith(b'some '):
+            some = float(line.split()[1][6:])
+        elif line.startswith(b'full '):
+            full = float(line.split()[1][6:])
+    return some, full
+
+
+def read_psi(path='/proc/pressure/memory'):
+    """Pression mémoire actuelle, ou None si le noyau ne l'expose pas."""
+    try:
+        with open(path, 'rb') as f:
+            return parse_psi(f.read())
+    except OSError:
+        return None
+
+
+class ProcBackend(MetricBackend):
+    """Chemin rapide Linux : /proc/stat, meminfo, diskstats et net/dev lus en une passe.
+
+    Les descripteurs et tampons sont ouverts une seule fois ; chaque échantillon
+    ne coûte que quatre appels pread et un découpage des octets lus.
+    """
+    name = 'proc'
+
+    def __init__(self, root='/proc'):
+        self.files = {name: ProcFile(os.path.join(root, name))
+                      for name in ('stat', 'meminfo', 'diskstats', 'net/dev', 'vmstat')}
+        self.disk_root = os.path.abspath(os.sep)
+        self.prev_cpu = None
+        self.is_disk = {}
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        # PSI absent (noyau < 4.20) ou désactivé (psi=0) : le fichier existe mais ne se lit pas
+        try:
+            self.pressure = ProcFile(os.path.join(root, 'pressure', 'memory'), 4096)
+            self.pressure.read()
+        except OSError:
+            self.pressure = None
+
+    def sensor_sources(self):
+        return [HwmonSensors(), BatterySensors()]
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        if self.pressure is not None:
+            self.pressure.close()
+            self.pressure = None
+
+    def sample(self):
+        data = {name: bytes(f.read()) for name, f in self.files.items()}
+        snap = {}
+        self.parse_stat(data['stat'], snap)
+        self.parse_meminfo(data['meminfo'], snap)
+        self.parse_diskstats(data['diskstats'], snap)
+        self.parse_net_dev(data['net/dev'], snap)
+        self.parse_vmstat(data['vmstat'], snap)
+        if self.pressure is not None:
+            snap['mem_some'], snap['mem_full'] = parse_psi(bytes(self.pressure.read()))
+
+        st = os.statvfs(self.disk_root)
+        snap['disk'] = st.f_bavail * st.f_frsize / (1024 ** 3)
+        return snap
+
+    def parse_stat(self, data, snap):
+        # Lignes "cpu" puis "cpuN" : user nice system idle iowait irq softirq steal ...
+        rows = []
+        for line in data.split(b'\n'):
+            if not line.startswith(b'cpu'):
+                break
+            rows.append(line.split()[1:9])
+        rows = np.array(rows, dtype=np.int64)
+
+        percents = np.zeros(len(rows))
+        modes = np.zeros((len(rows), 4))
+        if self.prev_cpu is not None and self.prev_cpu.shape == rows.shape:
+            delta = rows - self.prev_cpu
+            total = delta.sum(axis=1).astype(np.float64)
+            # Cœur resté sans tic depuis le relevé précédent : 0 % plutôt qu'une division par zéro
+            scale = np.divide(100.0, total, out=np.zeros_like(total), where=total > 0)
+            percents = (total - delta[:, 3] - delta[:, 4]) * scale
+            modes = np.column_stack((delta[:, 0] + delta[:, 1], delta[:, 2] + delta[:, 5] + delta[:, 6],
+                                     delta[:, 4], delta[:, 7])) * scale[:, None]
+        self.prev_cpu = rows
+        percents = percents.round(1).tolist()
+        snap['cpu'] = percents[0]
+        snap['cpu_cores'] = percents[1:]
+        snap['cpu_modes'] = modes[1:].round(1).tolist()
+
+    @staticmethod
+    def parse_meminfo(data, snap):
+        total = available = 0
+        for line in data.split(b'\n'):
+            if line.startswith(b'MemTotal:'):
+                total = int(line.split()[1]) * 1024
+            elif line.startswith(b'MemAvailable:'):
+                available = int(line.split()[1]) * 1024
+                break
+        snap['mem_total'] = total
+        snap['mem_available'] = available
+        snap['ram'] = available / (1024 ** 3)
+
+    def parse_diskstats(self, data, snap):
+        # Comme psutil, seuls les disques entiers (présents dans /sys/block) sont sommés
+        disks = {}
+        for line in data.split(b'\n'):
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            name = fields[2]
+            is_disk = self.is_disk.get(name)
+            if is_disk is None:
+                is_disk = self.is_disk[name] = os.path.exists(b'/sys/block/' + name)
+            if is_disk:
+                disks[name.decode()] = (int(fields[5]) * 512, int(fields[9]) * 512)
+        snap['disks'] = disks
+        snap['disk_read'] = sum(r for r, _ in disks.values())
+        snap['disk_write'] = sum(w for _, w in disks.values())
+
+    def parse_vmstat(self, data, snap):
+        # Pages échangées avec le swap depuis le démarrage ; recherche directe, le fichier est long
+        for key, name in ((b'\npswpin ', 'swap_in'), (b'\npswpout ', 'swap_out')):
+            i = data.find(key)
+            if i >= 0:
+                start = i + len(key)
+                snap[name] = int(data[start:data.find(b'\n', start)]) * self.page_size
+
+    @staticmethod
+    def parse_net_dev(data, snap):
+        nics = {}
+        for line in data.split(b'\n')[2:]:
+            if b':' not in line:
+                continue
+            name, fields = line.split(b':', 1)
+            fields = fields.split()
+            nics[name.strip().decode()] = (int(fields[8]), int(fields[0]))
+        snap['nics'] = nics
+        snap['net_sent'] = sum(sent for sent, _ in nics.values())
+        snap['net_recv'] = sum(recv for _, recv in nics.values())
+
+
+class SyntheticBackend(MetricBackend):
+    """Données déterministes pour tester la charge des pages sans matériel réel."""
+    name = 'synthetic'
+
+    def __init__(self, seed=0, cores=8, mem_total=16 * 1024 ** 3):
+        self.rng = random.Random(seed)
+        self.cores = cores
+        self.mem_total = mem_total
+        self.tick = 0
+        self.disks = {'sda': [0, 0], 'nvme0n1': [0, 0]}
+        self.nics = {'eth0': [0, 0], 'lo': [0, 0]}
+        self.swap = [0, 0]
+
+    def sensor_sources(self):
+        return [SyntheticSensors()]
+
+    def wave(self, period, lo, hi, noise=0.05):
+        phase = math.sin(2 * math.pi * self.tick / period)
+        value = lo + (hi - lo) * (0.5 + 0.5 * phase)
+        return value + (hi - lo) * noise * self.rng.uniform(-1, 1)
+
+    def sample(self):
+        self.tick += 1
+        available = min(max(self.wave(600, 0.2, 0.7), 0.0), 1.0) * self.mem_total
+        cpu_cores = [round(min(max(self.wave(60 + 7 * i, 5, 95, 0.2), 0), 100), 1)
+                     for i in range(self.cores)]
+        for devices, rates in ((self.disks, (40e6, 15e6)), (self.nics, (2e6, 8e6))):
+            for i, counters in enumerate(devices.values()):
+                for j, rate in enumerate(rates):
+                    counters[j] += int(max(self.wave(120 + 30 * i, 0, rate / (i + 1), 0.3), 0))
+        snap = {
+            'ram': available / (1024 ** 3),
+            'disk': self.wave(3600, 100, 120, 0.01),
+            'cpu': round(sum(cpu_cores) / len(cpu_cores), 1),
+            'cpu_cores': cpu_cores,
+            'cpu_modes': [[round(c * 0.7, 1), round(c * 0.2, 1), round(c * 0.08, 1), round(c * 0.02, 1)]
+                          for c in cpu_cores],
+            'mem_total': self.mem_total,
+            'mem_available': int(available),
+            'disks': {name: tuple(c) for name, c in self.disks.items()},
+            'nics': {name: tuple(c) for name, c in self.nics.items()},
+        }
+        snap['disk_read'] = sum(r for r, _ in snap['disks'].values())
+        snap['disk_write'] = sum(w for _, w in snap['disks'].values())
+        snap['net_sent'] = sum(e for e, _ in snap['nics'].values())
+        snap['net_recv'] = sum(r for _, r in snap['nics'].values())
+
+        # Pression mémoire et swap suivent la mémoire disponible
+        pressure = max(self.wave(600, 30, -10, 0.2), 0.0)
+        for i in range(2):
+            self.swap[i] += int(pressure * 1e5 * self.rng.random())
+        snap['swap_in'], snap['swap_out'] = self.swap
+        snap['mem_some'], snap['mem_full'] = round(pressure, 2), round(pressure / 3, 2)
+        return snap
+
+
+BACKENDS = {b.name: b for b in (PsutilBackend, ProcBackend, SyntheticBackend)}
+
+
+def create_backend(name=None):
+    """Instancie un backend par son nom ; par défaut /proc sous Linux, psutil ailleurs."""
+    if name is None or name == 'auto':
+        name = 'proc' if sys.platform.startswith('linux') and os.path.exists('/proc/stat') else 'psutil'
+    return BACKENDS[name]()
+
+
+def read_sysfs(path):
+    """Contenu d'un petit fichier sysfs, sans le retour à la ligne, ou None."""
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def parse_cpulist(text):
+    """Liste de cœurs au format du noyau (« 0-3,8-11 ») développée."""
+    cpus = []
+    for part in text.split(','):
+        if '-' in part:
+            lo, hi = part.split('-')
+            cpus.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+@functools.lru_cache(maxsize=1)
+def numa_nodes(root='/sys/devices/system/node'):
+    """{nœud: [cœurs]} d'après sysfs ; vide hors Linux ou si la topologie est inconnue."""
+    nodes = {}
+    for path in glob.glob(os.path.join(root, 'node[0-9]*')):
+        cpulist = read_sysfs(os.path.join(path, 'cpulist'))
+        if cpulist:
+            nodes[int(os.path.basename(path)[4:])] = parse_cpulist(cpulist)
+    return dict(sorted(nodes.items()))
+
+
+class SensorSource:
+    """Interface des sources de capteurs relevées par SensorProvider.
+
+    `read()` est toujours appelé depuis le même thread dédié et retourne une
+    liste de (clé, type, libellé, valeur), le type valant 'temp' (°C),
+    'fan' (tr/min) ou 'battery' (%).
+    """
+    name = 'base'
+
+    def read(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class HwmonSensors(SensorSource):
+    """Linux : toutes les sondes de /sys/class/hwmon, à défaut les zones thermiques."""
+    name = 'hwmon'
+
+    def __init__(self, root='/sys/class'):
+        self.root = root
+        self.files = None
+
+    def discover(self):
+        found = []
+        hwmon = os.path.join(self.root, 'hwmon')
+        for entry in sorted(os.listdir(hwmon)) if os.path.isdir(hwmon) else []:
+            base = os.path.join(hwmon, entry)
+            chip = read_sysfs(os.path.join(base, 'name')) or entry
+            for fname in sorted(os.listdir(base)):
+                kind = fname.split('_')[0].rstrip('0123456789')
+                if kind not in ('temp', 'fan') or not fname.endswith('_input'):
+                    continue
+                sensor = fname[:-len('_input')]
+                label = read_sysfs(os.path.join(base, sensor + '_label')) or sensor
+                found.append((f'{entry}/{sensor}', kind, f'{chip} {label}',
+                              os.path.join(base, fname), 1000 if kind == 'temp' else 1))
+        if not any(kind == 'temp' for _, kind, *_ in found):
+            thermal = os.path.join(self.root, 'thermal')
+            for entry in sorted(os.listdir(thermal)) if os.path.isdir(thermal) else []:
+                if entry.startswith('thermal_zone'):
+                    base = os.path.join(thermal, entry)
+                    label = read_sysfs(os.path.join(base, 'type')) or entry
+                    found.append((entry, 'temp', label, os.path.join(base, 'temp'), 1000))
+
+        files = []
+        for key, kind, label, path, scale in found:
+            try:
+                files.append((key, kind, label, ProcFile(path, 64), scale))
+            except OSError:
+                pass
+        return files
+
+    def read(self):
+        if self.files is None:
+            self.files = self.discover()
+        readings = []
+        for key, kind, label, f, scale in self.files:
+            try:
+                readings.append((key, kind, label, int(bytes(f.read())) / scale))
+            except (OSError, ValueError):
+                # Sonde momentanément illisible (bus I2C occupé...) : on l'omet
+                pass
+        return readings
+
+    def close(self):
+        for _, _, _, f, _ in self.files or ():
+            f.close()
+        self.files = None
+
+
+class PsutilSensors(SensorSource):
+    """Températures et ventilateurs exposés par psutil (Linux, FreeBSD)."""
+    name = 'psutil'
+
+    def read(self):
+        readings = []
+        groups = (('temp', getattr(psutil, 'sensors_temperatures', dict)()),
+                  ('fan', getattr(psutil, 'sensors_fans', dict)()))
+        for kind, chips in groups:
+            for chip, entries in chips.items():
+                for i, e in enumerate(entries):
+                    readings.append((f'{chip}/{kind}{i}', kind, f'{chip} {e.label or i}', e.current))
+        return readings
+
+
+class BatterySensors(SensorSource):
+    """Charge de la batterie, si la machine en a une."""
+    name = 'battery'
+
+    def read(self):
+        battery = psutil.sensors_battery() if hasattr(psutil, 'sensors_battery') else None
+        if battery is None:
+            return []
+        return [('battery', 'battery', "Batterie", battery.percent)]
+
+
+class WmiSensors(SensorSource):
+    """Windows : toutes les zones thermiques ACPI, sur une connexion WMI ouverte une fois."""
+    name = 'wmi'
+
+    def __init__(self):
+        self.conn = None
+
+    def read(self):
+        if self.conn is None:
+            # WMI passe par COM, initialisé dans le thread de la source
+            import pythoncom
+            import wmi
+            pythoncom.CoInitialize()
+            self.conn = wmi.WMI(namespace="root/wmi")
+        try:
+            zones = self.conn.MSAcpi_ThermalZoneTemperature()
+        except Exception:
+            # Connexion peut-être perdue : on la rouvrira au prochain essai
+            self.conn = None
+            raise
+        return [(f'wmi/{i}', 'temp', zone.InstanceName or f"Zone {i}",
+                 float(zone.CurrentTemperature) / 10 - 273.15) for i, zone in enumerate(zones)]
+
+
+class SyntheticSensors(SensorSource):
+    """Capteurs déterministes pour accompagner SyntheticBackend."""
+    name = 'synthetic'
+
+    def __init__(self, seed=0):
+        self.gen = SyntheticBackend(seed)
+
+    def read(self):
+        self.gen.tick += 1
+        wave = self.gen.wave
+        return [('synthetic/cpu', 'temp', "CPU Package", wave(60, 40, 85)),
+                ('synthetic/gpu', 'temp', "GPU", wave(90, 35, 70)),
+                ('synthetic/nvme', 'temp', "NVMe", wave(150, 30, 55)),
+                ('synthetic/fan1', 'fan', "Ventilateur CPU", wave(60, 800, 2400)),
+                ('synthetic/battery', 'battery', "Batterie", wave(600, 20, 100, 0))]
+
+
+class SensorProvider:
+    """Relève les capteurs hors du thread de collecte et garde le dernier relevé en cache.
+
+    Chaque source a son propre thread : une sonde lente ne retarde ni les
+    autres sources ni l'échantillonnage, qui ne lit que le cache. Une source
+    en erreur ou qui dépasse `timeout` est réessayée de plus en plus
+    rarement, jusqu'à une fois toutes les `max_backoff` secondes.
+    """
+
+    def __init__(self, sources, interval=5.0, timeout=2.0, max_backoff=300.0):
+        self.sources = list(sources)
+        self.interval = interval
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.state = {}
+        self._readings = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self.sources or (self._thread is not None and self._thread.is_alive()):
+            return
+        for source in self.sources:
+            self.state[source.name] = {
+                'executor': concurrent.futures.ThreadPoolExecutor(
+                    1, thread_name_prefix='Sensor-' + source.name),
+                'future': None, 'started': 0.0, 'late': False, 'failures': 0, 'next': 0.0,
+            }
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SensorProvider", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        for source in self.sources:
+            state = self.state.pop(source.name, None)
+            if state is not None:
+                # Fermeture sur le thread de la source, sans attendre une lecture bloquée
+                state['executor'].submit(source.close)
+                state['executor'].shutdown(wait=False)
+
+    def readings(self):
+        """Dernier relevé de toutes les sources : {clé: (type, libellé, valeur)}."""
+        with self._lock:
+            merged = {}
+            for values in self._readings.values():
+                merged.update(values)
+            return merged
+
+    @staticmethod
+    def hottest(readings):
+        temps = [value for kind, _, value in readings.values() if kind == 'temp']
+        return max(temps) if temps else None
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            pending = []
+            for source in self.sources:
+                state = self.state[source.name]
+                # Une lecture encore bloquée n'est jamais doublée par une nouvelle
+                if state['future'] is None and started >= state['next']:
+                    state['future'] = state['executor'].submit(source.read)
+                    state['started'] = started
+                    state['late'] = False
+                if state['future'] is not None:
+                    pending.append(state['future'])
+            if pending:
+                concurrent.futures.wait(pending, timeout=self.timeout)
+            for source in self.sources:
+                self._check(source)
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
+
+    def _check(self, source):
+        state = self.state[source.name]
+        future = state['future']
+        if future is None:
+            return
+        now = time.monotonic()
+        if not future.done():
+            if not state['late'] and now - state['started'] > self.timeout:
+                # Les dernières valeurs connues restent affichées en attendant
+                state['late'] = True
+                self._failed(source, state, now, "délai de %.1f s dépassé" % self.timeout)
+            return
+
+        state['future'] = None
+        try:
+            values = {key: (kind, label, round(float(value), 1))
+                      for key, kind, label, value in future.result()}
+        except Exception as e:
+            # Source en erreur : ses anciennes valeurs ne sont plus fiables
+            with self._lock:
+                self._readings.pop(source.name, None)
+            if not state['late']:
+                self._failed(source, state, now, e)
+            return
+        with self._lock:
+            self._readings[source.name] = values
+        if not state['late']:
+            state['failures'] = 0
+
+    def _failed(self, source, state, now, reason):
+        state['failures'] += 1
+        delay = min(self.interval * 2 ** state['failures'], self.max_backoff)
+        state['next'] = now + delay
+        log = logging.warning if state['failures'] == 1 else logging.debug
+        log("Capteurs %s indisponibles (%s), nouvel essai dans %.1f s", source.name, reason, delay)
+
+
+class RingBuffer:
+    """Série temporelle préallouée sur NumPy, indexée par horodatage epoch (float).
+
+    Chaque point est écrit deux fois (en i et en i + capacité) : les points
+    conservés forment donc toujours une tranche contiguë, renvoyée sans copie
+    par `times()` et `values()`. Avec `width`, chaque point est une ligne de
+    `width` valeurs.
+    """
+
+    def __init__(self, capacity, width=None, dtype=np.float64):
+        self.capacity = capacity
+        self.width = width
+        shape = (2 * capacity,) if width is None else (2 * capacity, width)
+        self._t = np.full(2 * capacity, np.nan)
+        self._v = np.full(shape, np.nan, dtype=dtype)
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, t, value):
+        i = self.count % self.capacity
+        self._t[i] = self._t[i + self.capacity] = t
+        self._v[i] = self._v[i + self.capacity] = value
+        self.count += 1
+
+    def extend(self, t, values):
+        """Ajoute un bloc de points d'un coup (rechargement d'historique)."""
+        t = np.asarray(t, dtype=np.float64)
+        values = np.asarray(values, dtype=self._v.dtype)
+        if len(t) > self.capacity:
+            self.count += len(t) - self.capacity
+            t, values = t[-self.capacity:], values[-self.capacity:]
+        pos = (self.count + np.arange(len(t))) % self.capacity
+        self._t[pos] = self._t[pos + self.capacity] = t
+        self._v[pos] = self._v[pos + self.capacity] = values
+        self.count += len(t)
+
+    def _window(self):
+        if self.count <= self.capacity:
+            return 0, self.count
+        start = self.count % self.capacity
+        return start, start + self.capacity
+
+    def times(self):
+        start, stop = self._window()
+        return self._t[start:stop]
+
+    def values(self):
+        start, stop = self._window()
+        return self._v[start:stop]
+
+    def last(self):
+        if not self.count:
+            return None, None
+        i = (self.count - 1) % self.capacity
+        return self._t[i], self._v[i]
+
+    def clear(self):
+        self.count = 0
+
+
+class RateTracker:
+    """Transforme des compteurs cumulés en débits par seconde, périphérique par périphérique.
+
+    Le débit est calculé sur l'écart de temps monotone entre deux relevés. Un
+    périphérique qui apparaît n'a de débit qu'au relevé suivant ; celui qui
+    disparaît est oublié avec son historique. L'agrégat est suivi sous `TOTAL`.
+    """
+    TOTAL = '*'
+
+    def __init__(self, history=300):
+        self.prev = {}
+        self.prev_t = None
+        self.history = {}
+        self.maxlen = history
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def delta(cur, prev):
+        if cur >= prev:
+            return cur - prev
+        # Compteur 32 ou 64 bits revenu à zéro : on ne l'admet que près de la limite,
+        # sinon c'est une remise à zéro (pilote rechargé...) et l'écart est inconnu
+        for bits in (32, 64):
+            limit = 1 << bits
+            if limit // 2 <= prev < limit:
+                return cur + limit - prev
+        return 0
+
+    def update(self, counters, now, ts=None):
+        """Enregistre un relevé {nom: (compteur, ...)} pris à l'instant monotone `now`."""
+        rates = {}
+        if self.prev_t is not None and now > self.prev_t:
+            elapsed = now - self.prev_t
+            for name, values in counters.items():
+                prev = self.prev.get(name)
+                if prev is not None and len(prev) == len(values):
+                    rates[name] = tuple(self.delta(c, p) / elapsed for c, p in zip(values, prev))
+        self.prev = dict(counters)
+        self.prev_t = now
+
+        with self._lock:
+            for name in [n for n in self.history if n not in counters]:
+                del self.history[name]
+            for name, values in rates.items():
+                if name not in self.history:
+                    self.history[name] = RingBuffer(self.maxlen, width=len(values))
+                self.history[name].append(ts if ts is not None else now, values)
+        return rates
+
+    def series(self, name):
+        """Historique (horodatages, débits) d'un périphérique, copié sous verrou."""
+        with self._lock:
+            buf = self.history.get(name)
+            if buf is None:
+                return np.empty(0), np.empty((0, 0))
+            return buf.times().copy(), buf.values().copy()
+
+    def names(self):
+        with self._lock:
+            return [n for n in self.history if n != self.TOTAL]
+
+
+class RetentionSeries:
+    """Rétention à plusieurs résolutions, à la manière d'un RRD.
+
+    Les échantillons bruts récents sont gardés tels quels ; en parallèle, des
+    agrégats (min, moyenne, max) par minute et par heure couvrent plusieurs
+    jours pour une mémoire bornée. `query` choisit la résolution la plus fine
+    qui couvre la plage demandée.
+
+    L'échantillonnage pouvant être irrégulier, la moyenne d'un seau est
+    pondérée par le temps écoulé depuis le point précédent (plafonné à
+    MAX_WEIGHT secondes) : une rafale de points rapprochés ne pèse pas plus
+    que la même durée échantillonnée lentement.
+    """
+    LEVELS = ((60, 60 * 24 * 3), (3600, 24 * 30))
+    MAX_WEIGHT = 60.0
+    # Marge sur la plus longue plage brute affichée (30 min à 1 s) : un tampon tout
+    # juste plein ne couvre jamais une plage de sa propre durée
+    RAW_CAPACITY = 3600
+
+    def __init__(self, raw_capacity=RAW_CAPACITY, levels=LEVELS):
+        self.raw = RingBuffer(raw_capacity)
+        self.levels = [(step, RingBuffer(capacity, width=3)) for step, capacity in levels]
+        self._acc = [None] * len(levels)
+        self._last_t = None
+        self._lock = threading.Lock()
+
+    def weights(self, t):
+        """Poids des points d'horodatages `t` : écart au point précédent, borné."""
+        prev = self._last_t if self._last_t is not None else t[0] - 1.0
+        return np.clip(np.diff(np.r_[prev, t]), 1e-3, self.MAX_WEIGHT)
+
+    def append(self, t, value):
+        value = np.nan if value is None else float(value)
+        with self._lock:
+            self.raw.append(t, value)
+            w = min(max(t - self._last_t, 1e-3), self.MAX_WEIGHT) if self._last_t is not None else 1.0
+            self._last_t = t
+            if np.isnan(value):
+                return
+            for k, (step, buf) in enumerate(self.levels):
+                bucket = t - t % step
+                acc = self._acc[k]
+                if acc is not None and acc[0] != bucket:
+                    buf.append(acc[0], (acc[1], acc[2] / acc[3], acc[4]))
+                    acc = None
+                if acc is None:
+                    self._acc[k] = [bucket, value, value * w, w, value]
+                else:
+                    acc[1] = min(acc[1], value)
+                    acc[2] += value * w
+                    acc[3] += w
+                    acc[4] = max(acc[4], value)
+
+    def extend(self, t, values):
+        """Recharge en bloc des points plus récents que ceux déjà présents."""
+        t = np.asarray(t, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        with self._lock:
+            self.raw.extend(t, values)
+            if not len(t):
+                return
+            w = self.weights(t)
+            self._last_t = float(t[-1])
+            mask = ~np.isnan(values)
+            t, values, w = t[mask], values[mask], w[mask]
+            if not len(t):
+                return
+            for k, (step, buf) in enumerate(self.levels):
+                buckets = t - t % step
+                starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+                rows = np.column_stack((np.minimum.reduceat(values, starts),
+                                        np.add.reduceat(values * w, starts) / np.add.reduceat(w, starts),
+                                        np.maximum.reduceat(values, starts)))
+                acc = self._acc[k]
+                if acc is not None and acc[0] != buckets[0]:
+                    buf.append(acc[0], (acc[1], acc[2] / acc[3], acc[4]))
+                # Le dernier seau reste ouvert : il sera complété par les prochains points
+                buf.extend(buckets[starts[:-1]], rows[:-1])
+                last = starts[-1]
+                tail, tail_w = values[last:], w[last:]
+                self._acc[k] = [buckets[last], float(tail.min()), float((tail * tail_w).sum()),
+                                float(tail_w.sum()), float(tail.max())]
+
+    @staticmethod
+    def covers(buf, start, slack=0.0):
+        # Un tampon couvre `start` s'il n'a rien perdu ou si son plus vieux point n'est pas
+        # plus récent ; un seau agrégé couvre tout son pas, d'où la marge `slack`
+        return buf.count <= buf.capacity or buf.times()[0] <= start + slack
+
+    def query(self, start, end, stat=1):
+        """Retourne (t, v) sur [start, end] ; `stat` choisit min (0), moyenne (1) ou max (2)."""
+        with self._lock:
+            if self.covers(self.raw, start):
+                t, v = self.raw.times(), self.raw.values()
+            else:
+                for k, (step, buf) in enumerate(self.levels):
+                    if self.covers(buf, start, step) or k == len(self.levels) - 1:
+                        break
+                t, v = buf.times(), buf.values()[:, stat]
+                # Le seau en cours n'est pas encore dans le tampon : on l'ajoute
+                acc = self._acc[k]
+                if acc is not None:
+                    current = (acc[1], acc[2] / acc[3], acc[4])[stat]
+                    t, v = np.append(t, acc[0]), np.append(v, current)
+            lo, hi = np.searchsorted(t, start), np.searchsorted(t, end, side='right')
+            return t[lo:hi].copy(), v[lo:hi].copy()
+
+
+def lttb(x, y, threshold):
+    """Sous-échantillonne (x, y) à `threshold` points par Largest-Triangle-Three-Buckets."""
+    mask = ~np.isnan(y)
+    if not mask.all():
+        x, y = x[mask], y[mask]
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    out = np.empty(threshold, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Point moyen du seau suivant, sommet fixe du triangle
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return x[out], y[out]
+
+
+class HistoryStore:
+    """Historique des séries sur disque, en segments binaires à enregistrements fixes.
+
+    Chaque enregistrement est une ligne de float64 (horodatage puis une valeur
+    par série). Les ajouts sont mis en tampon en mémoire ; un thread d'écriture
+    les vide toutes les `flush_interval` secondes et appelle fsync toutes les
+    `fsync_interval` secondes. Un segment est fermé au-delà de `segment_bytes`
+    et les plus anciens sont supprimés quand le total dépasse `max_bytes`.
+
+    Un seul processus écrit dans un dossier donné : il tient un verrou sur
+    LOCK_NAME. Une deuxième instance (interface et démon `--headless` sur le
+    même historique) passe en lecture seule : elle recharge l'historique mais
+    n'y ajoute rien.
+    """
+    MAGIC = b'PCRHIST1'
+    HEADER_SIZE = 256
+    LOCK_NAME = 'writer.lock'
+
+    def __init__(self, path=None, fields=(), segment_bytes=8 * 1024 ** 2,
+                 max_bytes=128 * 1024 ** 2, flush_interval=5.0, fsync_interval=60.0):
+        self.path = path or os.path.join(os.path.expanduser('~'), '.pc_ressources', 'history')
+        self.fields = ('ts',) + tuple(fields)
+        self.record = struct.Struct('<%dd' % len(self.fields))
+        self.dtype = np.dtype([(name, '<f8') for name in self.fields])
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._fd = None
+        self._size = 0
+        self._lock_fd = None
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(self.path, exist_ok=True)
+        self.read_only = not self.acquire()
+
+    def acquire(self):
+        """Prend le verrou d'écriture du dossier ; faux s'il est tenu par un autre processus."""
+        if self._lock_fd is not None:
+            return True
+        try:
+            fd = os.open(os.path.join(self.path, self.LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o644)
+        except OSError:
+            return False
+        try:
+            try:
+                import fcntl
+            except ImportError:
+                import msvcrt
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            logging.warning("Historique %s déjà écrit par un autre processus : lecture seule", self.path)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release(self):
+        if self._lock_fd is not None:
+            # Fermer le descripteur libère le verrou (flock comme msvcrt)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def header(self):
+        names = ','.join(self.fields).encode()
+        header = self.MAGIC + struct.pack('<I', len(self.fields)) + names
+        if len(header) > self.HEADER_SIZE:
+            raise ValueError("Trop de séries pour l'en-tête de l'historique")
+        return header.ljust(self.HEADER_SIZE, b'\0')
+
+    def segments(self):
+        """Segments compatibles avec le schéma courant, du plus ancien au plus récent."""
+        header = self.header()
+        result = []
+        for name in sorted(os.listdir(self.path)):
+            if not (name.startswith('history-') and name.endswith('.bin')):
+                continue
+            full = os.path.join(self.path, name)
+            try:
+                with open(full, 'rb') as f:
+                    if f.read(self.HEADER_SIZE) == header:
+                        result.append(full)
+            except OSError:
+                continue
+        return result
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.read_only = not self.acquire()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="HistoryStore", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush(sync=True)
+        with self._io_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+        self.release()
+
+    def append(self, ts, values):
+        """Ajoute un enregistrement ; `values` suit l'ordre des séries, None devient NaN."""
+        if self.read_only:
+            return
+        row = self.record.pack(ts, *(np.nan if v is None else v for v in values))
+        with self._lock:
+            self._pending += row
+
+    def _run(self):
+        last_sync = time.monotonic()
+        while not self._stop.wait(self.flush_interval):
+            sync = time.monotonic() - last_sync >= self.fsync_interval
+            try:
+                self.flush(sync)
+            except OSError:
+                logging.exception("Échec de l'écriture de l'historique")
+            if sync:
+                last_sync = time.monotonic()
+
+    def flush(self, sync=False):
+        with self._lock:
+            data, self._pending = self._pending, bytearray()
+        with self._io_lock:
+            if data:
+                if self._fd is None or self._size + len(data) > self.segment_bytes:
+                    self._open_segment(self.record.unpack_from(data)[0])
+                os.write(self._fd, data)
+                self._size += len(data)
+            if sync and self._fd is not None:
+                os.fsync(self._fd)
+
+    def _open_segment(self, first_ts):
+        if self._fd is not None:
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+        # On reprend le dernier segment s'il a encore de la place
+        segments = self.segments()
+        if segments and os.path.getsize(segments[-1]) < self.segment_bytes:
+            full = segments[-1]
+            size = os.path.getsize(full)
+            # Un enregistrement tronqué (arrêt brutal) est écrasé
+            size -= (size - self.HEADER_SIZE) % self.record.size
+            self._fd = os.open(full, os.O_WRONLY | os.O_APPEND | getattr(os, 'O_BINARY', 0))
+            os.ftruncate(self._fd, size)
+            self._size = size
+        else:
+            full = os.path.join(self.path, 'history-%012d.bin' % int(first_ts))
+            self._fd = os.open(full, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o644)
+            os.write(self._fd, self.header())
+            self._size = self.HEADER_SIZE
+            segments.append(full)
+        self._rotate(segments)
+
+    def _rotate(self, segments):
+        sizes = [os.path.getsize(path) for path in segments]
+        total = sum(sizes)
+        for path, size in zip(segments[:-1], sizes):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                logging.warning("Impossible de supprimer le segment %s", path)
+
+    def load(self, since=None):
+        """Lit les enregistrements postérieurs à `since` en un seul tableau structuré."""
+        chunks = []
+        for path in self.segments():
+            count = (os.path.getsize(path) - self.HEADER_SIZE) // self.record.size
+            if count <= 0:
+                continue
+            if since is not None:
+                # Le dernier enregistrement suffit pour écarter un segment trop ancien
+                last = np.fromfile(path, dtype=self.dtype, count=1,
+                                   offset=self.HEADER_SIZE + (count - 1) * self.record.size)
+                if last['ts'][0] < since:
+                    continue
+            chunks.append(np.fromfile(path, dtype=self.dtype, count=count, offset=self.HEADER_SIZE))
+        if not chunks:
+            return np.empty(0, dtype=self.dtype)
+        records = np.concatenate(chunks)
+        if since is not None:
+            records = records[records['ts'] >= since]
+        return records
+
+
+class Histogram:
+    """Histogramme à classes logarithmiques : enregistrement en O(1), mémoire fixe.
+
+    Les quantiles sont exacts à la largeur d'une classe près (12 % avec 20
+    classes par décade), ce qui suffit pour suivre p50 et p99 en continu.
+    """
+
+    def __init__(self, lo=1e-6, hi=100.0, per_decade=20):
+        self.lo = lo
+        self.per_decade = per_decade
+        # Une classe de plus de chaque côté pour les valeurs hors bornes
+        self.counts = [0] * (int(math.ceil(math.log10(hi / lo) * per_decade)) + 2)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        if value <= self.lo:
+            i = 0
+        else:
+            i = min(int(math.log10(value / self.lo) * self.per_decade) + 1, len(self.counts) - 1)
+        self.counts[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                # Borne haute de la classe, sans dépasser le maximum observé
+                return min(self.lo * 10 ** (i / self.per_decade), self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.total / self.count,
+                'p50': self.quantile(0.5), 'p99': self.quantile(0.99), 'max': self.max}
+
+
+class Timer:
+    """Chronomètre réutilisable dans un `with`, qui alimente un Histogram."""
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+
+
+class Instrumentation:
+    """Ce que coûte le moniteur lui-même : durées des chemins critiques et ressources du processus.
+
+    Les durées (secondes) sont regroupées par nom dans des Histogram : appel
+    au backend, publication, rendus matplotlib, retard des `after` Tk sur
+    leur échéance... Le CPU et la mémoire du processus sont relevés à chaque
+    échantillon du collecteur.
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self.process = {'cpu_percent': None, 'rss': None, 'threads': None}
+        self.cpu_histogram = Histogram(lo=0.01, hi=10000.0)
+        self.started = time.time()
+        self._proc = psutil.Process()
+        self._prev_cpu = None
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        hist = self.histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(name, Histogram())
+        return hist
+
+    def timer(self, name):
+        return Timer(self.histogram(name))
+
+    def record(self, name, seconds):
+        self.histogram(name).record(seconds)
+
+    def sample_process(self):
+        """CPU (% d'un cœur) et mémoire résidente du moniteur depuis le relevé précédent."""
+        with self._proc.oneshot():
+            cpu = self._proc.cpu_times()
+            self.process['rss'] = self._proc.memory_info().rss
+            self.process['threads'] = self._proc.num_threads()
+        now = time.monotonic()
+        used = cpu.user + cpu.system
+        if self._prev_cpu is not None and now > self._prev_cpu[0]:
+            percent = 100.0 * (used - self._prev_cpu[1]) / (now - self._prev_cpu[0])
+            self.process['cpu_percent'] = percent
+            self.cpu_histogram.record(percent)
+        self._prev_cpu = (now, used)
+
+    def snapshot(self):
+        with self._lock:
+            names = sorted(self.histograms)
+        return {
+            'ts': time.time(),
+            'uptime': time.time() - self.started,
+            'process': dict(self.process, cpu=self.cpu_histogram.summary()),
+            'timings': {name: self.histograms[name].summary() for name in names},
+        }
+
+    def export(self, path=None):
+        """Écrit l'instantané en JSON et retourne le chemin utilisé."""
+        if path is None:
+            folder = os.path.join(os.path.expanduser('~'), '.pc_ressources')
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, dt.datetime.now().strftime('instrumentation-%Y%m%d-%H%M%S.json'))
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+    def report(self):
+        """Résumé texte pour l'overlay : une ligne par chronomètre, en millisecondes."""
+        snap = self.snapshot()
+        proc = snap['process']
+        lines = ["CPU %s %%   RSS %s Mo   threads %s" % (
+            '-' if proc['cpu_percent'] is None else '%.1f' % proc['cpu_percent'],
+            '-' if proc['rss'] is None else '%.0f' % (proc['rss'] / 1024 ** 2),
+            proc['threads'] if proc['threads'] is not None else '-')]
+        if proc['cpu'].get('count'):
+            lines.append("CPU p50 %.1f %%  p99 %.1f %%" % (proc['cpu']['p50'], proc['cpu']['p99']))
+        lines.append("%-24s %6s %8s %8s %8s" % ("", "n", "p50 ms", "p99 ms", "max ms"))
+        for name, h in snap['timings'].items():
+            if h['count']:
+                lines.append("%-24s %6d %8.2f %8.2f %8.2f" % (
+                    name[:24], h['count'], h['p50'] * 1000, h['p99'] * 1000, h['max'] * 1000))
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=8)
+def core_labels(count):
+    return tuple(f"cœur {i}" for i in range(count))
+
+
+def metric_vector(snap, metric, scalars):
+    """(libellés, valeurs) d'une métrique : une seule valeur, ou une par cœur, périphérique ou capteur.
+
+    `metric` est un nom de `scalars` (séries du collecteur), 'cpu_cores',
+    'disk_rates.read|write', 'net_rates.sent|recv' ou 'sensors.temp|fan|battery'.
+    """
+    if metric == 'cpu_cores':
+        cores = snap['cpu_cores']
+        return core_labels(len(cores)), np.asarray(cores, dtype=np.float64)
+    base, _, field = metric.partition('.')
+    if base in ('disk_rates', 'net_rates'):
+        index = {'read': 0, 'write': 1, 'sent': 0, 'recv': 1}[field]
+        rates = snap[base]
+        labels = tuple(sorted(name for name in rates if name != RateTracker.TOTAL))
+        return labels, np.array([rates[name][index] for name in labels], dtype=np.float64)
+    if base == 'sensors':
+        sensors = snap.get('sensors', {})
+        keys = sorted(key for key, (kind, _, _) in sensors.items() if kind == field)
+        return (tuple(sensors[key][1] for key in keys),
+                np.array([sensors[key][2] for key in keys], dtype=np.float64))
+    value = scalars.get(metric)
+    return ('',), np.array([np.nan if value is None else value], dtype=np.float64)
+
+
+class AlertRule:
+    """Règle d'alerte évaluée sur chaque échantillon d'une métrique.
+
+    - 'above' / 'below' : seuil, avec retour sous `clear` pour l'hystérésis ;
+    - 'rate' : variation par seconde au-dessus de `threshold` ;
+    - 'zscore' : écart à une moyenne/variance mobiles (EWMA de constante de
+      temps `tau` secondes), en nombre d'écarts-types, après `warmup` secondes.
+
+    Une alerte ne se déclenche que si le dépassement dure depuis `for_seconds`.
+    Les durées sont mesurées sur les horodatages des échantillons : elles ne
+    changent pas quand l'intervalle d'échantillonnage s'adapte.
+    """
+    KINDS = ('above', 'below', 'rate', 'zscore')
+
+    def __init__(self, name, metric, kind='above', threshold=90.0, clear=None, for_seconds=3.0,
+                 tau=20.0, warmup=30.0, severity='warning'):
+        if kind not in self.KINDS:
+            raise ValueError(f"Type de règle inconnu : {kind}")
+        self.name = name
+        self.metric = metric
+        self.kind = kind
+        self.threshold = threshold
+        self.clear = threshold if clear is None else clear
+        self.for_seconds = for_seconds
+        self.tau = tau
+        self.warmup = warmup
+        self.severity = severity
+
+
+class AlertGroup:
+    """Règles d'un même type sur une même métrique, évaluées ensemble.
+
+    L'état tient dans des matrices (règles x séries) : chaque échantillon
+    coûte quelques opérations NumPy par groupe, quel que soit le nombre de
+    règles, de cœurs ou de périphériques, et l'historique n'est jamais relu.
+    """
+    MIN_STD = 1e-6
+
+    def __init__(self, metric, kind, rules):
+        self.metric = metric
+        self.kind = kind
+        self.rules = rules
+        column = lambda attr, dtype=np.float64: np.array([getattr(r, attr) for r in rules], dtype=dtype)[:, None]
+        self.threshold = column('threshold')
+        self.clear = column('clear')
+        self.for_seconds = column('for_seconds')
+        self.tau = column('tau')
+        self.warmup = column('warmup')
+        self.labels = None
+
+    def reset(self, labels):
+        # Périphérique apparu ou disparu : les séries ne sont plus alignées, on repart de zéro
+        shape = (len(self.rules), len(labels))
+        self.labels = labels
+        self.active = np.zeros(shape, dtype=bool)
+        # Début du dépassement en cours (NaN : pas de dépassement)
+        self.since = np.full(shape, np.nan)
+        self.mean = np.zeros(shape)
+        self.var = np.zeros(shape)
+        self.seen = np.zeros(shape)
+        self.seeded = np.zeros(shape, dtype=bool)
+        self.prev = None
+        self.prev_t = None
+
+    def evaluate(self, labels, values, ts):
+        """Met à jour l'état ; retourne (déclenchées, résolues, signal), ou None si rien ne change.
+
+        Le signal (valeur, débit ou z-score) a une ligne par règle, ou une
+        seule ligne commune à toutes les règles du groupe.
+        """
+        if labels != self.labels:
+            self.reset(labels)
+        dt = ts - self.prev_t if self.prev_t is not None and ts > self.prev_t else None
+        valid = ~np.isnan(values)
+        if self.kind == 'above':
+            signal = values[None, :]
+            breach, calm = signal > self.threshold, signal < self.clear
+        elif self.kind == 'below':
+            signal = values[None, :]
+            breach, calm = signal < self.threshold, signal > self.clear
+        elif self.kind == 'rate':
+            if self.prev is None or dt is None:
+                signal = np.zeros((1, len(values)))
+                valid = np.zeros(len(values), dtype=bool)
+            else:
+                signal = ((values - self.prev) / dt)[None, :]
+                valid &= ~np.isnan(self.prev)
+            self.prev = values
+            breach, calm = signal > self.threshold, signal < self.clear
+        else:
+            # Premier point valide, ou premier après un trou : il sert de moyenne de départ
+            # (variance nulle) au lieu d'être comparé à un état sans rapport avec la métrique
+            fresh = valid & ~self.seeded
+            signal = np.where(fresh, 0.0, (values - self.mean) / np.maximum(np.sqrt(self.var), self.MIN_STD))
+            breach = (np.abs(signal) > self.threshold) & (self.seen >= self.warmup)
+            calm = np.abs(signal) < self.clear
+            # Moyenne et variance exponentielles, mises à jour après l'évaluation ; le
+            # poids d'un point dépend de l'écart au précédent, pas du nombre de points
+            if dt is not None:
+                alpha = 1 - np.exp(-dt / self.tau)
+                update = valid & ~fresh
+                diff = np.where(update, values - self.mean, 0.0)
+                step = alpha * diff
+                self.mean += step
+                self.var = np.where(update, (1 - alpha) * (self.var + diff * step), self.var)
+                self.seen += np.where(update, dt, 0.0)
+            self.mean = np.where(fresh, values, self.mean)
+            self.var = np.where(fresh, 0.0, self.var)
+            self.seen = np.where(fresh, 0.0, self.seen)
+            self.seeded = np.broadcast_to(valid, self.seeded.shape).copy()
+        if dt is not None or self.prev_t is None:
+            self.prev_t = ts
+
+        # Valeur manquante : ni dépassement ni retour au calme, l'état est gardé
+        breach &= valid
+        if not breach.any():
+            # Cas courant : rien ne dépasse, seules les alertes actives peuvent se résoudre
+            self.since.fill(np.nan)
+            if not self.active.any():
+                return None
+            fired = np.zeros(self.active.shape, dtype=bool)
+        else:
+            self.since = np.where(breach, np.fmin(self.since, ts), np.nan)
+            fired = ~self.active & (ts - self.since >= self.for_seconds)
+        resolved = self.active & calm & valid
+        if not (fired.any() or resolved.any()):
+            return None
+        self.active = (self.active | fired) & ~resolved
+        return fired, resolved, signal
+
+
+class AlertEngine:
+    """Évalue les règles d'alerte à chaque échantillon et journalise les changements d'état."""
+    LOG_NAME = 'pc_ressources.alerts'
+
+    def __init__(self, rules=(), history=500):
+        by_key = {}
+        for rule in rules:
+            by_key.setdefault((rule.metric, rule.kind), []).append(rule)
+        self.groups = [AlertGroup(metric, kind, group) for (metric, kind), group in by_key.items()]
+        self.events = deque(maxlen=history)
+        self.log = logging.getLogger(self.LOG_NAME)
+        self._active = {}
+
+    def open_log(self, path=None):
+        """Ajoute un fichier journal des alertes (par défaut ~/.pc_ressources/alerts.log)."""
+        if path is None:
+            folder = os.path.join(os.path.expanduser('~'), '.pc_ressources')
+            os.makedirs(folder, exist_ok=True)
+            path = os.path.join(folder, 'alerts.log')
+        path = os.path.abspath(path)
+        if not any(getattr(h, 'baseFilename', None) == path for h in self.log.handlers):
+            handler = logging.FileHandler(path, encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+            self.log.addHandler(handler)
+            self.log.setLevel(logging.INFO)
+        return path
+
+    def evaluate(self, snap, scalars):
+        """Évalue toutes les règles sur un instantané ; retourne les nouveaux événements."""
+        ts = snap['ts']
+        vectors = {}
+        events = []
+        for group in self.groups:
+            if group.metric not in vectors:
+                vectors[group.metric] = metric_vector(snap, group.metric, scalars)
+            labels, values = vectors[group.metric]
+            changes = group.evaluate(labels, values, ts)
+            if changes is None:
+                continue
+            fired, resolved, signal = changes
+            for state, mask in (('firing', fired), ('resolved', resolved)):
+                for r, i in zip(*np.nonzero(mask)):
+                    rule = group.rules[r]
+                    event = {'ts': ts, 'rule': rule.name, 'label': labels[i], 'state': state,
+                             'severity': rule.severity, 'metric': rule.metric,
+                             'value': float(values[i]), 'signal': float(signal[min(r, len(signal) - 1), i])}
+                    events.append(event)
+        for event in events:
+            key = (event['rule'], event['label'])
+            text = f"{event['rule']}{' [' + event['label'] + ']' if event['label'] else ''} : {event['value']:.1f}"
+            if event['state'] == 'firing':
+                self._active[key] = event
+                self.log.warning("ALERTE %s (%s)", text, event['severity'])
+            else:
+                self._active.pop(key, None)
+                self.log.info("FIN %s", text)
+            self.events.append(event)
+        return events
+
+    def pending(self):
+        """Vrai si une règle dépasse déjà son seuil sans s'être encore déclenchée."""
+        return any(group.labels is not None and not np.isnan(group.since).all() for group in self.groups)
+
+    def active(self):
+        """Alertes en cours, les plus récentes d'abord."""
+        return sorted(self._active.values(), key=lambda event: -event['ts'])
+
+
+DEFAULT_ALERTS = (
+    AlertRule("CPU saturé", 'cpu', 'above', 90, clear=80, for_seconds=5),
+    AlertRule("Cœur saturé", 'cpu_cores', 'above', 98, clear=90, for_seconds=10, severity='info'),
+    AlertRule("RAM disponible faible", 'ram', 'below', 1.0, clear=1.5, for_seconds=3),
+    AlertRule("Stockage presque plein", 'disk', 'below', 5.0, clear=6.0, for_seconds=3),
+    AlertRule("Température élevée", 'temp', 'above', 85, clear=80, for_seconds=3, severity='critical'),
+    AlertRule("Capteur très chaud", 'sensors.temp', 'above', 90, clear=85, for_seconds=3, severity='critical'),
+    AlertRule("Échauffement rapide", 'temp', 'rate', 2.0, clear=0.5, for_seconds=3),
+    AlertRule("CPU inhabituel", 'cpu', 'zscore', 4.0, clear=2.0, for_seconds=3, warmup=120, severity='info'),
+    AlertRule("Lecture disque inhabituelle", 'disk_rates.read', 'zscore', 6.0, clear=3.0,
+              for_seconds=3, warmup=120, severity='info'),
+    AlertRule("Trafic réseau inhabituel", 'net_rates.recv', 'zscore', 6.0, clear=3.0,
+              for_seconds=3, warmup=120, severity='info'),
+)
+
+
+class AdaptiveInterval:
+    """Intervalle d'échantillonnage piloté par l'activité et par un budget CPU.
+
+    Après chaque échantillon, la plus forte variation des séries suivies
+    (rapportée à son échelle dans SCALES) mesure l'activité : au-delà de 1,
+    ou si une alerte est en cours ou sur le point de se déclencher,
+    l'intervalle est divisé par deux. Après `calm_samples` échantillons
+    calmes, il est multiplié par 1,5. Il ne descend jamais sous ce que
+    permet `budget` (% d'un cœur) vu le coût mesuré d'un échantillon, et
+    remonte dès que le processus entier dépasse ce budget.
+    """
+    SCALES = {'cpu': 10.0, 'ram': 0.25, 'temp': 3.0,
+              'disk_read_rate': 20e6, 'disk_write_rate': 20e6,
+              'net_sent_rate': 5e6, 'net_recv_rate': 5e6}
+
+    def __init__(self, min_interval=0.25, max_interval=10.0, budget=2.0, calm_samples=3):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget = budget
+        self.calm_samples = calm_samples
+        self.prev = None
+        self.calm = 0
+        self.cost = None
+
+    def activity(self, values):
+        prev, self.prev = self.prev, values
+        if prev is None:
+            return 0.0
+        changes = [abs(values[name] - prev[name]) / scale for name, scale in self.SCALES.items()
+                   if values.get(name) is not None and prev.get(name) is not None]
+        return max(changes, default=0.0)
+
+    def update(self, interval, values, cost, alerting=False, process_cpu=None):
+        """Retourne l'intervalle du prochain échantillon ; `cost` est la durée CPU du précédent."""
+        self.cost = cost if self.cost is None else 0.8 * self.cost + 0.2 * cost
+        activity = self.activity(values)
+        if alerting or activity >= 1.0:
+            self.calm = 0
+            interval *= 0.5
+        elif activity < 0.25:
+            self.calm += 1
+            if self.calm >= self.calm_samples:
+                self.calm = 0
+                interval *= 1.5
+        else:
+            self.calm = 0
+
+        if process_cpu is not None and process_cpu > self.budget:
+            # Moniteur trop gourmand dans son ensemble : on ralentit quoi qu'il arrive
+            interval = max(interval, self.min_interval) * 1.5
+        floor = max(self.min_interval, 100 * self.cost / self.budget)
+        return min(max(interval, floor), self.max_interval)
+
+
+class MetricCollector:
+    """Échantillonne toutes les métriques sur un thread dédié, à horloge unique.
+
+    Chaque tick produit un instantané (dict) publié dans un tampon protégé par
+    un verrou ; les pages Tk ne font que lire ces instantanés et les afficher.
+    """
+
+    SERIES = ('ram', 'disk', 'cpu', 'temp',
+              'disk_read_rate', 'disk_write_rate', 'net_sent_rate', 'net_recv_rate')
+    SENSOR_HISTORY = 600
+    CORE_HISTORY = 600
+    CPU_MODES = ('user', 'system', 'iowait', 'steal')
+    RATE_COLUMNS = {'disk_rates': ('read', 'write'), 'net_rates': ('sent', 'recv')}
+
+    def __init__(self, backend=None, interval=1.0, maxlen=3600, store=None, alerts=DEFAULT_ALERTS,
+                 adaptive=None):
+        self.backend = backend if isinstance(backend, MetricBackend) else create_backend(backend)
+        self.interval = interval
+        self.adaptive = adaptive
+        self.store = store
+        self.disk_rates = RateTracker()
+        self.net_rates = RateTracker()
+        self.swap_rates = RateTracker()
+        self.history = {name: RetentionSeries() for name in self.SERIES}
+        self.sensors = SensorProvider(self.backend.sensor_sources())
+        self.sensor_history = {}
+        # Pression mémoire (some, full) et swap (entrées, sorties par seconde)
+        self.pressure_history = RingBuffer(self.SENSOR_HISTORY, width=2)
+        self.swap_history = RingBuffer(self.SENSOR_HISTORY, width=2)
+        # Historique par cœur : un tampon (temps × cœurs) pour le total et pour chaque mode
+        self.core_history = {}
+        self.instruments = Instrumentation()
+        self.alerts = AlertEngine(alerts)
+        self._buffer = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self.store is not None:
+            self.store.start()
+        self.sensors.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MetricCollector", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.sensors.stop()
+        if self.store is not None:
+            self.store.stop()
+
+    def restore(self, hours=24):
+        """Recharge depuis le disque les `hours` dernières heures dans l'historique."""
+        if self.store is None:
+            return 0
+        records = self.store.load(since=time.time() - hours * 3600)
+        for name in self.SERIES:
+            self.history[name].extend(records['ts'], records[name])
+        return len(records)
+
+    def sample(self, ts=None, mono=None):
+        """Lit toutes les métriques une seule fois pour le tick courant.
+
+        `ts` et `mono` remplacent les horloges réelles pour rejouer un
+        échantillonnage à cadence simulée (mesures de performance).
+        """
+        ts = time.time() if ts is None else ts
+        mono = time.monotonic() if mono is None else mono
+        snap = self.backend.sample()
+        snap['ts'] = ts
+        snap['mono'] = mono
+
+        # Capteurs : dernier relevé en cache, la température affichée est la plus haute
+        snap['sensors'] = self.sensors.readings()
+        snap['temp'] = SensorProvider.hottest(snap['sensors'])
+
+        # Débits en octets/s, par périphérique et agrégés
+        disks = dict(snap.get('disks', {}))
+        disks[RateTracker.TOTAL] = (snap['disk_read'], snap['disk_write'])
+        snap['disk_rates'] = self.disk_rates.update(disks, mono, ts)
+        nics = dict(snap.get('nics', {}))
+        nics[RateTracker.TOTAL] = (snap['net_sent'], snap['net_recv'])
+        snap['net_rates'] = self.net_rates.update(nics, mono, ts)
+        if 'swap_in' in snap:
+            rates = self.swap_rates.update({RateTracker.TOTAL: (snap['swap_in'], snap['swap_out'])}, mono)
+            snap['swap_rates'] = rates.get(RateTracker.TOTAL)
+        return snap
+
+    def series_values(self, snap):
+        """Valeurs scalaires d'un instantané pour chacune des séries de SERIES."""
+        disk = snap['disk_rates'].get(RateTracker.TOTAL, (None, None))
+        net = snap['net_rates'].get(RateTracker.TOTAL, (None, None))
+        return {'ram': snap['ram'], 'disk': snap['disk'], 'cpu': snap['cpu'], 'temp': snap['temp'],
+                'disk_read_rate': disk[0], 'disk_write_rate': disk[1],
+                'net_sent_rate': net[0], 'net_recv_rate': net[1]}
+
+    def query(self, name, start, end, stat=1):
+        """Historique (t, v) d'une série sur [start, end], à la résolution adaptée."""
+        return self.history[name].query(start, end, stat)
+
+    def _publish(self, snap):
+        values = self.series_values(snap)
+        for name, value in values.items():
+            self.history[name].append(snap['ts'], value)
+        if self.store is not None:
+            self.store.append(snap['ts'], [values[name] for name in self.SERIES])
+        if self.alerts.groups:
+            with self.instruments.timer('collector.alerts'):
+                self.alerts.evaluate(snap, values)
+            snap['alerts'] = self.alerts.active()
+        sensors = snap.get('sensors', {})
+        with self._lock:
+            for key in [k for k in self.sensor_history if k not in sensors]:
+                del self.sensor_history[key]
+            for key, (_, _, value) in sensors.items():
+                if key not in self.sensor_history:
+                    self.sensor_history[key] = RingBuffer(self.SENSOR_HISTORY)
+                self.sensor_history[key].append(snap['ts'], value)
+            swap = snap.get('swap_rates') or (np.nan, np.nan)
+            self.pressure_history.append(snap['ts'], (snap.get('mem_some', np.nan), snap.get('mem_full', np.nan)))
+            self.swap_history.append(snap['ts'], swap)
+            self.append_cores(snap)
+            self._seq += 1
+            snap['seq'] = self._seq
+            self._buffer.append(snap)
+        self.instruments.sample_process()
+
+    def _run(self):
+        self.backend.open()
+        sample_timer = self.instruments.timer('collector.sample')
+        publish_timer = self.instruments.timer('collector.publish')
+        lag = self.instruments.histogram('collector.lag')
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            lag.record(max(time.monotonic() - next_tick, 0))
+            try:
+                started = time.thread_time()
+                with sample_timer:
+                    snap = self.sample()
+                    snap['interval'] = self.interval
+                with publish_timer:
+                    self._publish(snap)
+                if self.adaptive is not None:
+                    alerting = bool(snap.get('alerts')) or self.alerts.pending()
+                    self.interval = self.adaptive.update(
+                        self.interval, self.series_values(snap), time.thread_time() - started,
+                        alerting, self.instruments.process['cpu_percent'])
+            except Exception:
+                logging.exception("Échec de l'échantillonnage des métriques")
+
+            # Horloge absolue : une lecture lente ne décale pas les ticks suivants,
+            # les ticks déjà manqués sont sautés plutôt que rattrapés en rafale.
+            next_tick += self.interval
+            now = time.monotonic()
+            if next_tick <= now:
+                next_tick += ((now - next_tick) // self.interval + 1) * self.interval
+            self._stop.wait(next_tick - now)
+        self.backend.close()
+
+    def sensor_series(self, key):
+        """Historique (horodatages, valeurs) d'un capteur, copié sous verrou."""
+        with self._lock:
+            buf = self.sensor_history.get(key)
+            if buf is None:
+                return np.empty(0), np.empty(0)
+            return buf.times().copy(), buf.values().copy()
+
+    def append_cores(self, snap):
+        """Ajoute une colonne à l'historique par cœur, recréé si le nombre de cœurs change."""
+        cores = snap['cpu_cores']
+        total = self.core_history.get('total')
+        if total is None or total.width != len(cores):
+            self.core_history = {'total': RingBuffer(self.CORE_HISTORY, width=len(cores))}
+        self.core_history['total'].append(snap['ts'], cores)
+        modes = snap.get('cpu_modes')
+        if not modes or len(modes) != len(cores):
+            return
+        modes = np.asarray(modes, dtype=np.float64)
+        for i, mode in enumerate(self.CPU_MODES):
+            if mode not in self.core_history:
+                self.core_history[mode] = RingBuffer(self.CORE_HISTORY, width=len(cores))
+            self.core_history[mode].append(snap['ts'], modes[:, i])
+
+    def core_series(self, mode='total', start=None):
+        """(horodatages, valeurs temps × cœurs) de l'utilisation par cœur, copiés sous verrou.
+
+        Avec `start`, l'historique part du dernier point antérieur à `start` :
+        c'est lui qui borne l'intervalle mesuré par le premier point suivant.
+        """
+        with self._lock:
+            buf = self.core_history.get(mode)
+            if buf is None:
+                return np.empty(0), np.empty((0, 0))
+            t = buf.times()
+            i = max(np.searchsorted(t, start) - 1, 0) if start is not None else 0
+            return t[i:].copy(), buf.values()[i:].copy()
+
+    def rate_series(self, name, start, end):
+        """Débits (horodatages, lignes) d'un périphérique, `name` valant 'disk_rates.sda' ou 'net_rates.eth0'.
+
+        Le nom `*` désigne l'agrégat. Renvoie None si le périphérique est inconnu.
+        """
+        base, _, device = name.partition('.')
+        if base not in self.RATE_COLUMNS:
+            return None
+        tracker = getattr(self, base)
+        if device != RateTracker.TOTAL and device not in tracker.names():
+            return None
+        t, v = tracker.series(device)
+        keep = (t >= start) & (t <= end)
+        return t[keep], v[keep]
+
+    def memory_series(self):
+        """(horodatages, pression some/full en %, swap entrées/sorties en octets/s), copiés sous verrou."""
+        with self._lock:
+            return (self.pressure_history.times().copy(), self.pressure_history.values().copy(),
+                    self.swap_history.values().copy())
+
+    def latest(self):
+        with self._lock:
+            return self._buffer[-1] if self._buffer else None
+
+    def since(self, seq):
+        """Retourne les instantanés publiés après le numéro de séquence `seq`."""
+        with self._lock:
+            if not self._buffer or self._buffer[-1]['seq'] <= seq:
+                return []
+            start = max(0, len(self._buffer) - (self._buffer[-1]['seq'] - seq))
+            return [self._buffer[i] for i in range(start, len(self._buffer))]
+
+
+class RemoteCollector(MetricCollector):
+    """Suit un démon `--headless` par HTTP au lieu d'échantillonner localement.
+
+    Expose la même interface que MetricCollector (`latest`, `since`, `query`) :
+    les pages ne font pas la différence. L'historique récent du démon est
+    rapatrié au démarrage, puis les nouveaux instantanés sont relevés à
+    chaque intervalle, sur le thread du collecteur.
+    """
+
+    def __init__(self, url, interval=1.0, maxlen=3600, timeout=5.0):
+        # Le démon choisit sa cadence ; on le relève simplement à intervalle fixe
+        # Les alertes sont évaluées par le démon et arrivent avec ses instantanés
+        super().__init__(MetricBackend(), interval, maxlen, alerts=())
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.remote_seq = 0
+
+    def fetch(self, path, **params):
+        url = self.url + path + ('?' + urllib.parse.urlencode(params) if params else '')
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.loads(response.read())
+
+    def backfill(self):
+        """Rapatrie l'historique : agrégats par minute, puis points bruts de la fenêtre récente."""
+        raw_window = self.history['ram'].raw.capacity * self.interval
+        for name in self.SERIES:
+            old = self.fetch('/api/range', series=name, last=RetentionSeries.LEVELS[0][1] * 60)
+            recent = self.fetch('/api/range', series=name, last=raw_window)
+            cut = recent['t'][0] if recent['t'] else float('inf')
+            t = [x for x in old['t'] if x < cut] + recent['t']
+            v = old['v'][:len(t) - len(recent['t'])] + recent['v']
+            self.history[name].extend(t, [np.nan if x is None else x for x in v])
+
+    def _run(self):
+        try:
+            self.backfill()
+        except (OSError, ValueError):
+            logging.warning("Historique du démon %s indisponible", self.url)
+        while not self._stop.is_set():
+            try:
+                with self.instruments.timer('collector.fetch'):
+                    data = self.fetch('/api/since', seq=self.remote_seq)
+                if data['seq'] < self.remote_seq:
+                    # Démon redémarré : sa numérotation repart de zéro
+                    self.remote_seq = 0
+                for snap in data['snapshots']:
+                    self.remote_seq = snap['seq']
+                    self._publish(snap)
+            except (OSError, ValueError, KeyError):
+                logging.warning("Démon %s injoignable", self.url)
+            self._stop.wait(self.interval)
+
+
+def format_prometheus(snap):
+    """Instantané au format texte d'exposition Prometheus."""
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f"# HELP pcr_{name} {help_text}")
+        lines.append(f"# TYPE pcr_{name} {kind}")
+        for labels, value in samples:
+            if value is None:
+                continue
+            label = '{' + ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+                                   for k, v in labels.items()) + '}' if labels else ''
+            lines.append(f"pcr_{name}{label} {value}")
+
+    metric('cpu_percent', 'gauge', "Utilisation CPU totale (%).", [({}, snap['cpu'])])
+    metric('cpu_core_percent', 'gauge', "Utilisation CPU par cœur (%).",
+           [({'core': i}, v) for i, v in enumerate(snap['cpu_cores'])])
+    metric('memory_total_bytes', 'gauge', "Mémoire totale.", [({}, snap['mem_total'])])
+    metric('memory_available_bytes', 'gauge', "Mémoire disponible.", [({}, snap['mem_available'])])
+    metric('disk_free_gigabytes', 'gauge', "Espace disque libre (Go).", [({}, snap['disk'])])
+    metric('temperature_celsius', 'gauge', "Température la plus haute.", [({}, snap['temp'])])
+    sensors = snap.get('sensors', {})
+    for kind, name, help_text in (('temp', 'sensor_temperature_celsius', "Température par capteur."),
+                                  ('fan', 'sensor_fan_rpm', "Vitesse des ventilateurs (tr/min)."),
+                                  ('battery', 'sensor_battery_percent', "Charge de la batterie (%).")):
+        metric(name, 'gauge', help_text, [({'sensor': key, 'label': label}, value)
+                                           for key, (k, label, value) in sensors.items() if k == kind])
+    for kind, label, names in (('disk', 'device', ('read', 'written')),
+                               ('net', 'interface', ('sent', 'received'))):
+        counters = snap['disks' if kind == 'disk' else 'nics']
+        rates = snap[kind + '_rates']
+        for i, name in enumerate(names):
+            metric(f'{kind}_{name}_bytes_total', 'counter', f"Octets {name} cumulés.",
+                   [({label: dev}, values[i]) for dev, values in counters.items()])
+            metric(f'{kind}_{name}_bytes_per_second', 'gauge', f"Débit {name} (octets/s).",
+                   [({label: dev}, values[i]) for dev, values in rates.items() if dev != RateTracker.TOTAL])
+    metric('memory_pressure_percent', 'gauge', "Pression mémoire (PSI, moyenne sur 10 s).",
+           [({'kind': 'some'}, snap.get('mem_some')), ({'kind': 'full'}, snap.get('mem_full'))])
+    swap = snap.get('swap_rates') or (None, None)
+    metric('swap_bytes_per_second', 'gauge', "Débit d'échange avec le swap (octets/s).",
+           [({'direction': 'in'}, swap[0]), ({'direction': 'out'}, swap[1])])
+    metric('alert_active', 'gauge', "Alertes en cours.",
+           [({'rule': a['rule'], 'label': a['label'], 'severity': a['severity']}, 1)
+            for a in snap.get('alerts', [])])
+    return ('\n'.join(lines) + '\n').encode()
+
+
+class MetricsServer:
+    """Point d'accès HTTP local aux métriques d'un collecteur.
+
+    Routes : `/metrics` (Prometheus), `/api/latest`, `/api/since?seq=N`,
+    `/api/range?series=ram&last=3600` (ou `start`/`end` en secondes epoch),
+    `/api/devices` (disques et interfaces suivis, interrogeables par
+    `/api/range?series=disk_rates.sda`) et `/api/instrumentation` (coût du
+    démon lui-même).
+    Les réponses sont mises en forme une fois par échantillon et servies
+    depuis un cache : les lectures ne déclenchent jamais d'échantillonnage.
+    """
+    MAX_CACHED = 256
+
+    def __init__(self, collector, host='127.0.0.1', port=9101):
+        self.collector = collector
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self._cache = {}
+        self._cache_seq = None
+        self._lock = threading.Lock()
+
+    def cached(self, key, build):
+        latest = self.collector.latest()
+        seq = latest['seq'] if latest else 0
+        with self._lock:
+            if seq != self._cache_seq:
+                self._cache.clear()
+                self._cache_seq = seq
+            body = self._cache.get(key)
+        if body is None:
+            body = build(latest)
+            with self._lock:
+                if self._cache_seq == seq and len(self._cache) < self.MAX_CACHED:
+                    self._cache[key] = body
+        return body
+
+    def respond(self, path, params):
+        """Retourne (code, type de contenu, corps) pour une requête GET."""
+        if path == '/metrics':
+            return 200, 'text/plain; version=0.0.4', self.cached(
+                'metrics', lambda snap: format_prometheus(snap) if snap else b'')
+        if path == '/api/instrumentation':
+            return 200, 'application/json', json.dumps(self.collector.instruments.snapshot()).encode()
+        if path == '/api/latest':
+            return 200, 'application/json', self.cached('latest', lambda snap: json.dumps(snap).encode())
+        if path == '/api/since':
+            seq = int(params.get('seq', 0))
+
+            def build(latest):
+                # Un nouveau client ne reçoit que le dernier instantané (l'historique passe par /api/range)
+                snaps = self.collector.since(seq) if seq else ([latest] if latest else [])
+                return json.dumps({'seq': latest['seq'] if latest else 0, 'snapshots': snaps}).encode()
+            return 200, 'application/json', self.cached(('since', seq), build)
+        if path == '/api/devices':
+            return 200, 'application/json', self.cached('devices', lambda snap: json.dumps(
+                {base: sorted(getattr(self.collector, base).names())
+                 for base in self.collector.RATE_COLUMNS}).encode())
+        if path == '/api/range':
+            name = params.get('series', 'ram')
+            per_device = name.partition('.')[0] in self.collector.RATE_COLUMNS
+            if not per_device and name not in self.collector.history:
+                return 404, 'text/plain', f"Série inconnue : {name}\n".encode()
+            stat = int(params.get('stat', 1))
+            if stat not in (0, 1, 2):
+                return 400, 'text/plain', f"Requête invalide : stat={stat} (0 min, 1 moyenne, 2 max)\n".encode()
+            key = ('range', name, stat, params.get('last'), params.get('start'), params.get('end'))
+
+            def build(latest):
+                now = latest['ts'] if latest else time.time()
+                if 'last' in params:
+                    start, end = now - float(params['last']), now
+                else:
+                    start, end = float(params.get('start', now - 3600)), float(params.get('end', now))
+                if not per_device:
+                    t, v = self.collector.query(name, start, end, stat)
+                    values = [None if x != x else x for x in v.tolist()]
+                    return json.dumps({'series': name, 't': t.tolist(), 'v': values}).encode()
+                # Débits par périphérique : historique brut récent, une ligne par point
+                found = self.collector.rate_series(name, start, end)
+                if found is None:
+                    return None
+                t, v = found
+                values = [[None if x != x else x for x in row] for row in v.tolist()]
+                return json.dumps({'series': name, 'columns': self.collector.RATE_COLUMNS[name.partition('.')[0]],
+                                   't': t.tolist(), 'v': values}).encode()
+            body = self.cached(key, build)
+            if body is None:
+                return 404, 'text/plain', f"Périphérique inconnu : {name}\n".encode()
+            return 200, 'application/json', body
+        return 404, 'text/plain', b"Route inconnue\n"
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                try:
+                    code, content_type, body = server.respond(url.path, params)
+                except (ValueError, KeyError) as e:
+                    code, content_type, body = 400, 'text/plain', f"Requête invalide : {e}\n".encode()
+                self.send_response(code)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                logging.debug("HTTP %s - " + fmt, self.address_string(), *args)
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, name="MetricsServer", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+
+class FileScanner:
+    """Recherche parallèle et annulable des plus gros fichiers d'une arborescence.
+
+    Les répertoires sont répartis entre `workers` threads via une file ; la
+    taille vient du `DirEntry` de `os.scandir` (aucun stat supplémentaire sous
+    Windows). Seuls les `top_n` plus gros fichiers au-dessus de `threshold` sont
+    gardés, dans un tas borné. `progress()` et `top()` peuvent être lus à tout
+    moment pendant l'analyse.
+    """
+
+    def __init__(self, root, threshold=100_000_000, top_n=20, workers=8):
+        self.root = root
+        self.threshold = threshold
+        self.top_n = top_n
+        self.workers = workers
+        self.files = self.dirs = self.bytes = self.errors = 0
+        self.started = self.finished = None
+        self._heap = []
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def start(self):
+        self.started = time.monotonic()
+        self._queue.put(self.root)
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f"FileScanner-{i}", daemon=True).start()
+        threading.Thread(target=self._wait, name="FileScanner", daemon=True).start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def _wait(self):
+        self._queue.join()
+        self.finished = time.monotonic()
+        # Réveille les threads de travail pour qu'ils se terminent
+        for _ in range(self.workers):
+            self._queue.put(None)
+        self._done.set()
+
+    def _work(self):
+        while True:
+            path = self._queue.get()
+            if path is None:
+                return
+            try:
+                if not self._cancel.is_set():
+                    self._scan(path)
+            finally:
+                self._queue.task_done()
+
+    def _scan(self, path):
+        files = size_total = errors = 0
+        found = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            self._queue.put(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            size = entry.stat(follow_symlinks=False).st_size
+                            files += 1
+                            size_total += size
+                            if size >= self.threshold:
+                                found.append((size, entry.path))
+                    except OSError:
+                        errors += 1
+        except OSError:
+            errors += 1
+
+        # Un seul passage sous verrou par répertoire
+        with self._lock:
+            self.dirs += 1
+            self.files += files
+            self.bytes += size_total
+            self.errors += errors
+            if found:
+                self.collect(found)
+
+    def collect(self, found):
+        """Reçoit, sous verrou, les fichiers d'un répertoire dépassant le seuil."""
+        for item in found:
+            if len(self._heap) < self.top_n:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def top(self):
+        """Plus gros fichiers trouvés jusqu'ici, [(taille, chemin), ...] décroissant."""
+        with self._lock:
+            return sorted(self._heap, reverse=True)
+
+    def progress(self):
+        with self._lock:
+            elapsed = ((self.finished or time.monotonic()) - self.started) if self.started else 0.0
+            return {
+                'files': self.files,
+                'dirs': self.dirs,
+                'bytes': self.bytes,
+                'errors': self.errors,
+                'elapsed': elapsed,
+                'files_per_s': self.files / elapsed if elapsed else 0.0,
+                'done': self.done,
+                'cancelled': self.cancelled,
+            }
+
+
+def partial_hash(path, size, block=4096):
+    """Empreinte du début et de la fin d'un fichier (le fichier entier s'il est petit)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if size <= 2 * block:
+            h.update(f.read())
+        else:
+            h.update(f.read(block))
+            f.seek(-block, os.SEEK_END)
+            h.update(f.read(block))
+    return h.digest()
+
+
+def full_hash(path, chunk=1024 * 1024):
+    """Empreinte complète d'un fichier, lue par gros blocs dans un tampon réutilisé."""
+    h = hashlib.blake2b(digest_size=16)
+    buf = bytearray(chunk)
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def hash_context():
+    """Contexte multiprocessing des processus de hachage.
+
+    Jamais fork : le processus Tk a d'autres threads (collecteur, relevés) dont
+    les verrous, copiés pris, bloqueraient les enfants. forkserver part d'un
+    serveur sans thread qui a déjà importé ce module ; spawn sinon (Windows).
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+class DuplicateFinder(FileScanner):
+    """Détection de doublons en trois étapes : taille, empreinte partielle, empreinte complète.
+
+    Le parcours de FileScanner regroupe les fichiers par taille ; seules les
+    tailles partagées passent à l'empreinte du début et de la fin du fichier,
+    et seules les collisions restantes sont lues en entier. Les empreintes sont
+    calculées dans un pool de processus. Les groupes confirmés sont publiés au
+    fil de l'eau dans `groups()`.
+    """
+    BLOCK = 4096
+
+    def __init__(self, root, min_size=1024 * 1024, workers=8, hash_workers=None):
+        super().__init__(root, threshold=min_size, top_n=0, workers=workers)
+        self.hash_workers = hash_workers
+        self.by_size = {}
+        self.stage = 'parcours'
+        self.bytes_read = 0
+        self.reclaimable = 0
+        self._groups = []
+        self._finder_done = threading.Event()
+
+    def collect(self, found):
+        for size, path in found:
+            self.by_size.setdefault(size, []).append(path)
+
+    def start(self):
+        super().start()
+        threading.Thread(target=self._pipeline, name="DuplicateFinder", daemon=True).start()
+        return self
+
+    @property
+    def done(self):
+        return self._finder_done.is_set()
+
+    def wait(self, timeout=None):
+        return self._finder_done.wait(timeout)
+
+    def groups(self):
+        """Groupes confirmés [(taille, [chemins...]), ...], par place récupérable décroissante."""
+        with self._lock:
+            return sorted(self._groups, key=lambda g: g[0] * (len(g[1]) - 1), reverse=True)
+
+    def progress(self):
+        stats = super().progress()
+        with self._lock:
+            stats.update(stage=self.stage, bytes_read=self.bytes_read, reclaimable=self.reclaimable,
+                         groups=len(self._groups), done=self.done)
+        return stats
+
+    def _pipeline(self):
+        try:
+            super().wait()
+            if self.cancelled:
+                return
+            # Copie sous verrou, mais les stat() de _distinct se font hors verrou :
+            # progress() est lu depuis le thread Tk
+            with self._lock:
+                self.stage = 'empreintes partielles'
+                same_size = [(size, list(paths)) for size, paths in self.by_size.items() if len(paths) > 1]
+            candidates = []
+            for size, paths in same_size:
+                if self.cancelled:
+                    return
+                candidates.append((size, self._distinct(paths)))
+            try:
+                pool = concurrent.futures.ProcessPoolExecutor(self.hash_workers, mp_context=hash_context())
+            except (OSError, NotImplementedError):
+                pool = concurrent.futures.ThreadPoolExecutor(self.hash_workers)
+            with pool:
+                partial = self._hash_groups(pool, candidates, partial_hash, lambda size: min(size, 2 * self.BLOCK))
+                with self._lock:
+                    self.stage = 'empreintes complètes'
+                # Les petits fichiers sont déjà lus en entier par l'empreinte partielle
+                small = [g for g in partial if g[0] <= 2 * self.BLOCK]
+                self._confirm(small)
+                large = [g for g in partial if g[0] > 2 * self.BLOCK]
+                self._hash_groups(pool, large, full_hash, lambda size: size, stream=True)
+        except Exception:
+            logging.exception("Échec de la recherche de doublons")
+        finally:
+            with self._lock:
+                self.stage = 'annulé' if self.cancelled else 'terminé'
+            self._finder_done.set()
+
+    @staticmethod
+    def _distinct(paths):
+        # Les liens physiques vers un même fichier ne sont pas des doublons
+        seen, result = set(), []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino) if st.st_ino else path
+            if key not in seen:
+                seen.add(key)
+                result.append(path)
+        return result
+
+    def _hash_groups(self, pool, groups, func, cost, stream=False):
+        """Sous-groupe chaque (taille, chemins) par empreinte ; ne garde que les collisions."""
+        pending = {}
+        remaining = {}
+        for gid, (size, paths) in enumerate(groups):
+            if len(paths) < 2:
+                continue
+            remaining[gid] = {'size': size, 'left': len(paths), 'digests': {}}
+            for path in paths:
+                args = (path, size) if func is partial_hash else (path,)
+                pending[pool.submit(func, *args)] = (gid, path)
+
+        result = []
+        for future in concurrent.futures.as_completed(pending):
+            if self.cancelled:
+                for f in pending:
+                    f.cancel()
+                return []
+            gid, path = pending[future]
+            group = remaining[gid]
+            group['left'] -= 1
+            try:
+                digest = future.result()
+                group['digests'].setdefault(digest, []).append(path)
+                with self._lock:
+                    self.bytes_read += cost(group['size'])
+            except OSError:
+                with self._lock:
+                    self.errors += 1
+            if group['left'] == 0:
+                found = [(group['size'], paths) for paths in group['digests'].values() if len(paths) > 1]
+                if stream:
+                    self._confirm(found)
+                else:
+                    result.extend(found)
+                del remaining[gid]
+        return result
+
+    def _confirm(self, groups):
+        with self._lock:
+            for size, paths in groups:
+                self._groups.append((size, sorted(paths)))
+                self.reclaimable += size * (len(paths) - 1)
+
+
+class ProcessTable:
+    """Table des processus rafraîchie de façon incrémentale.
+
+    Les attributs statiques (nom, exécutable, ligne de commande, date de
+    création) sont lus une fois par PID et invalidés si le PID est réutilisé
+    par un autre processus (date de création différente). Les champs
+    dynamiques sont lus dans `Process.oneshot()` et le %CPU est calculé à
+    partir de l'écart des temps CPU entre deux rafraîchissements.
+
+    Avec `accurate`, l'USS (mémoire propre au processus) et le PSS (mémoire
+    partagée répartie entre ses utilisateurs) sont lus depuis
+    /proc/<pid>/smaps_rollup, ou `memory_full_info()` ailleurs. Cette lecture
+    parcourt les tables de pages et peut coûter plusieurs millisecondes par
+    processus : elle tourne par lots sur un pool de `workers` threads, sans
+    jamais être attendue, et chaque PID n'est relu que toutes les
+    `accurate_every` secondes. Les valeurs manquantes valent None.
+    """
+    KEYS = ('rss', 'uss', 'pss', 'cpu', 'threads')
+    CHUNK = 32
+
+    def __init__(self, top_n=50, key='rss', accurate=False, accurate_every=10.0, workers=4, proc='/proc'):
+        self.top_n = top_n
+        self.key = key
+        self.static = {}
+        self.prev = {}
+        self.prev_t = None
+        self.count = 0
+        self.accurate = accurate
+        self.accurate_every = accurate_every
+        self.workers = workers
+        self.proc = proc if os.path.exists(os.path.join(proc, 'self', 'smaps_rollup')) else None
+        self.memory = {}
+        self.pending = set()
+        self.memory_pool = None
+        self._memory_lock = threading.Lock()
+
+    @staticmethod
+    def read_static(proc):
+        info = {'create_time': proc.create_time(), 'name': proc.name(), 'exe': '', 'cmdline': ''}
+        try:
+            info['exe'] = proc.exe()
+            info['cmdline'] = ' '.join(proc.cmdline())
+        except (psutil.AccessDenied, psutil.ZombieProcess, OSError):
+            pass
+        return info
+
+    def refresh(self):
+        """Relit tous les processus et retourne les `top_n` premiers selon `key`."""
+        now = time.monotonic()
+        elapsed = now - self.prev_t if self.prev_t is not None else None
+        rows = []
+        static, prev = {}, {}
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    info = self.static.get(proc.pid)
+                    if info is None or info['create_time'] != proc.create_time():
+                        info = self.read_static(proc)
+                    mem = proc.memory_info()
+                    times = proc.cpu_times()
+                    threads = proc.num_threads()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+            cpu_time = times.user + times.system
+            last = self.prev.get(proc.pid)
+            cpu = 0.0
+            if elapsed and last is not None and last[0] == info['create_time']:
+                cpu = max(cpu_time - last[1], 0.0) / elapsed * 100
+            static[proc.pid] = info
+            prev[proc.pid] = (info['create_time'], cpu_time)
+            rows.append({'pid': proc.pid, 'name': info['name'], 'exe': info['exe'],
+                         'cmdline': info['cmdline'], 'rss': mem.rss, 'cpu': cpu, 'threads': threads})
+
+        # Les PID disparus quittent le cache
+        self.static, self.prev, self.prev_t = static, prev, now
+        self.count = len(rows)
+        if self.accurate:
+            self.attach_memory(rows, now)
+        key = self.key
+        return heapq.nlargest(self.top_n, rows, key=lambda row: row.get(key) or 0)
+
+    def attach_memory(self, rows, now):
+        """Ajoute l'USS/PSS en cache aux lignes et relance la lecture des PID périmés."""
+        stale = []
+        with self._memory_lock:
+            for pid in [p for p in self.memory if p not in self.static]:
+                del self.memory[pid]
+            for row in rows:
+                pid = row['pid']
+                cached = self.memory.get(pid)
+                create_time = self.static[pid]['create_time']
+                if cached is not None and cached[0] == create_time:
+                    row['uss'], row['pss'], row['swap'] = cached[2:]
+                if (cached is None or cached[0] != create_time or now - cached[1] >= self.accurate_every) \
+                        and pid not in self.pending:
+                    stale.append((row['rss'], pid, create_time))
+            self.pending.update(pid for _, pid, _ in stale)
+
+        # Les plus gros processus d'abord : ce sont eux qui font le classement
+        stale.sort(reverse=True)
+        with self._memory_lock:
+            # Sous verrou : `close()` peut arrêter le pool depuis le thread Tk
+            if stale and self.memory_pool is None:
+                self.memory_pool = concurrent.futures.ThreadPoolExecutor(self.workers)
+            for i in range(0, len(stale), self.CHUNK):
+                self.memory_pool.submit(self.read_memory_chunk,
+                                        [(pid, ct) for _, pid, ct in stale[i:i + self.CHUNK]])
+
+    def read_memory_chunk(self, chunk):
+        results = []
+        for pid, create_time in chunk:
+            try:
+                values = self.read_memory(pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError, ValueError):
+                # Accès refusé : on ne réessaie qu'à la prochaine échéance
+                values = (None, None, None)
+            results.append((pid, (create_time, time.monotonic()) + values))
+        with self._memory_lock:
+            for pid, entry in results:
+                self.memory[pid] = entry
+                self.pending.discard(pid)
+
+    def read_memory(self, pid):
+        """(uss, pss, swap) en octets ; pss et swap valent None si la plateforme ne les donne pas."""
+        if self.proc is None:
+            info = psutil.Process(pid).memory_full_info()
+            return info.uss, getattr(info, 'pss', None), getattr(info, 'swap', None)
+        fields = {}
+        for line in read_small(f"{self.proc}/{pid}/smaps_rollup").split(b'\n'):
+            name, _, rest = line.partition(b':')
+            if name in (b'Pss', b'Private_Clean', b'Private_Dirty', b'Swap'):
+                fields[name] = int(rest.split()[0]) * 1024
+        if not fields:
+            # Fichier vide : processus noyau ou zombie
+            raise ValueError(pid)
+        return (fields.get(b'Private_Clean', 0) + fields.get(b'Private_Dirty', 0),
+                fields.get(b'Pss', 0), fields.get(b'Swap', 0))
+
+    def close(self):
+        """Arrête les lectures USS/PSS en attente ; le pool est recréé au prochain besoin."""
+        with self._memory_lock:
+            pool, self.memory_pool = self.memory_pool, None
+            # Les lectures annulées seront relancées au prochain relevé
+            self.pending.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def read_small(path, size=4096):
+    """Lecture brute d'un petit fichier /proc, sans objet fichier Python."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+class IOTopTable:
+    """Processus les plus actifs en entrées/sorties, par écart de compteurs entre deux relevés.
+
+    Sous Linux, /proc/<pid>/stat et /proc/<pid>/io sont lus directement
+    (deux petites lectures par processus) ; ailleurs, psutil fournit
+    `io_counters()`. « disque » vient de read_bytes/write_bytes ; « autres »
+    est le reste des octets lus/écrits par appels système (sockets, tubes,
+    lectures servies par le cache), seule approximation du réseau par
+    processus sans capture de paquets. Les connexions ouvertes sont comptées
+    par PID tous les `connections_every` relevés, car c'est la partie la
+    plus coûteuse. Le moniteur lui-même est exclu.
+    """
+    KEYS = ('disk', 'other', 'connections')
+
+    def __init__(self, top_n=15, key='disk', history=300, connections_every=5, proc='/proc'):
+        self.top_n = top_n
+        self.key = key
+        self.maxlen = history
+        self.connections_every = connections_every
+        self.proc = proc if os.path.exists(os.path.join(proc, 'self', 'io')) else None
+        self.prev = {}
+        self.prev_t = None
+        self.connections = {}
+        self.history = {}
+        self.refreshes = 0
+        self.count = 0
+        self.own_pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def read_proc(self):
+        """{pid: ((pid, démarrage), nom, read_bytes, write_bytes, rchar, wchar)} depuis /proc."""
+        counters = {}
+        with os.scandir(self.proc) as it:
+            for entry in it:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                try:
+                    stat = read_small(entry.path + '/stat')
+                    io = read_small(entry.path + '/io').split()
+                except OSError:
+                    # Processus disparu, ou d'un autre utilisateur
+                    continue
+                end = stat.rfind(b')')
+                start_time = stat[end + 2:].split(None, 20)[19]
+                counters[pid] = ((pid, start_time), stat[stat.find(b'(') + 1:end].decode(errors='replace'),
+                                 int(io[9]), int(io[11]), int(io[1]), int(io[3]))
+        return counters
+
+    @staticmethod
+    def read_psutil():
+        counters = {}
+        for proc in psutil.process_iter():
+            try:
+                with proc.oneshot():
+                    io = proc.io_counters()
+                    counters[proc.pid] = ((proc.pid, proc.create_time()), proc.name(), io.read_bytes,
+                                          io.write_bytes, getattr(io, 'read_chars', io.read_bytes),
+                                          getattr(io, 'write_chars', io.write_bytes))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, AttributeError):
+                continue
+        return counters
+
+    def read_connections(self):
+        counts = {}
+        try:
+            for conn in psutil.net_connections(kind='inet'):
+                if conn.pid:
+                    counts[conn.pid] = counts.get(conn.pid, 0) + 1
+        except (psutil.AccessDenied, OSError):
+            return self.connections
+        return counts
+
+    def refresh(self):
+        """Relit les compteurs et retourne les `top_n` processus les plus actifs selon `key`."""
+        now = time.monotonic()
+        counters = self.read_proc() if self.proc else self.read_psutil()
+        counters.pop(self.own_pid, None)
+        if self.refreshes % self.connections_every == 0:
+            self.connections = self.read_connections()
+        self.refreshes += 1
+
+        elapsed = now - self.prev_t if self.prev_t is not None else None
+        rows = []
+        for pid, (ident, name, read, write, rchar, wchar) in counters.items():
+            last = self.prev.get(pid)
+            if not elapsed or last is None or last[0] != ident:
+                continue
+            disk_read = max(read - last[1], 0) / elapsed
+            disk_write = max(write - last[2], 0) / elapsed
+            other = max((rchar - last[3]) + (wchar - last[4]) - (read - last[1]) - (write - last[2]), 0) / elapsed
+            rows.append({'pid': pid, 'name': name, 'read': disk_read, 'write': disk_write, 'other': other,
+                         'disk': disk_read + disk_write, 'connections': self.connections.get(pid, 0)})
+        # Seul l'état du relevé courant est gardé : les PID disparus sont oubliés
+        self.prev = {pid: (c[0],) + c[2:] for pid, c in counters.items()}
+        self.prev_t = now
+        self.count = len(counters)
+
+        key = self.key
+        top = heapq.nlargest(self.top_n, (row for row in rows if row[key] > 0), key=lambda row: row[key])
+        ts = time.time()
+        with self._lock:
+            # Historique réservé au top N : un processus qui en sort perd le sien
+            keep = {row['pid'] for row in top}
+            for pid in [p for p in self.history if p not in keep]:
+                del self.history[pid]
+            for row in top:
+                if row['pid'] not in self.history:
+                    self.history[row['pid']] = RingBuffer(self.maxlen, width=3)
+                self.history[row['pid']].append(ts, (row['read'], row['write'], row['other']))
+        return top
+
+    def series(self, pid):
+        """Historique (horodatages, [lus, écrits, autres]) d'un processus du top N."""
+        with self._lock:
+            buf = self.history.get(pid)
+            if buf is None:
+                return np.empty(0), np.empty((0, 3))
+            return buf.times().copy(), buf.values().copy()
+
+
+class CgroupCollector:
+    """Consommation de chaque cgroup (v2) : CPU, mémoire, E/S et pression (PSI).
+
+    Chaque groupe garde ses fichiers ouverts (ProcFile) d'un relevé à
+    l'autre. La découverte relit chaque dossier connu à chaque relevé (un
+    scandir) : la date de modification d'un dossier cgroup ne change pas
+    toujours à la création d'un sous-groupe, elle ne suffit donc pas.
+    `root` peut pointer vers une arborescence factice (tmpfs) pour les essais.
+    """
+    FILES = ('cpu.stat', 'memory.current', 'memory.stat', 'io.stat',
+             'cpu.pressure', 'memory.pressure', 'io.pressure')
+    KEYS = ('cpu', 'memory', 'io', 'pressure')
+
+    def __init__(self, root='/sys/fs/cgroup', top_n=20, key='cpu'):
+        self.root = root
+        self.top_n = top_n
+        self.key = key
+        self.groups = {}
+        self.prev_t = None
+        self.count = 0
+        self.fd_limited = False
+        self.raise_fd_limit()
+
+    @property
+    def available(self):
+        return os.path.exists(os.path.join(self.root, 'cgroup.controllers'))
+
+    @staticmethod
+    def raise_fd_limit(wanted=65536):
+        """Relève la limite douce de descripteurs : jusqu'à sept fichiers ouverts par groupe."""
+        try:
+            import resource
+        except ImportError:
+            return
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard != resource.RLIM_INFINITY:
+            wanted = min(wanted, hard)
+        if soft != resource.RLIM_INFINITY and soft < wanted:
+            try:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+            except (ValueError, OSError):
+                pass
+
+    def open_files(self, path):
+        files = {}
+        for name in self.FILES:
+            full = os.path.join(path, name)
+            if not os.path.exists(full):
+                continue
+            try:
+                files[name] = ProcFile(full, 4096)
+            except OSError:
+                # Plus de descripteurs disponibles : ce fichier sera rouvert à chaque lecture
+                self.fd_limited = True
+                files[name] = full
+        return files
+
+    def discover(self):
+        """Met à jour la liste des groupes ; un groupe disparu ferme ses fichiers."""
+        seen = set()
+        stack = [self.root]
+        while stack:
+            path = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    children = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+            except OSError:
+                # Groupe supprimé depuis le relevé précédent
+                continue
+            seen.add(path)
+            if path not in self.groups:
+                self.groups[path] = {'files': self.open_files(path), 'prev': None}
+            stack.extend(children)
+        for path in [p for p in self.groups if p not in seen]:
+            self.close_group(self.groups.pop(path))
+
+    @staticmethod
+    def close_group(group):
+        for f in group['files'].values():
+            if isinstance(f, ProcFile):
+                f.close()
+
+    def close(self):
+        for group in self.groups.values():
+            self.close_group(group)
+        self.groups = {}
+
+    @staticmethod
+    def read(f):
+        return bytes(f.read()) if isinstance(f, ProcFile) else read_small(f, 65536)
+
+    @staticmethod
+    def parse_keyed(data):
+        """Lignes « clé valeur » (cpu.stat, memory.stat)."""
+        values = {}
+        for line in data.split(b'\n'):
+            parts = line.split()
+            if len(parts) == 2:
+                values[parts[0]] = int(parts[1])
+        return values
+
+    @staticmethod
+    def parse_io(data):
+        """Octets lus et écrits, tous périphériques confondus (io.stat)."""
+        read = write = 0
+        for field in data.split():
+            if field.startswith(b'rbytes='):
+                read += int(field[7:])
+            elif field.startswith(b'wbytes='):
+                write += int(field[7:])
+        return read, write
+
+    def sample(self, path, group):
+        files = group['files']
+        values = {}
+        try:
+            if 'cpu.stat' in files:
+                stat = self.parse_keyed(self.read(files['cpu.stat']))
+                values['usage_usec'] = stat.get(b'usage_usec', 0)
+                values['throttled_usec'] = stat.get(b'throttled_usec', 0)
+            if 'memory.current' in files:
+                values['memory'] = int(self.read(files['memory.current']))
+            if 'memory.stat' in files:
+                stat = self.parse_keyed(self.read(files['memory.stat']))
+                values['anon'] = stat.get(b'anon', 0)
+                values['file'] = stat.get(b'file', 0)
+            if 'io.stat' in files:
+                values['io_read'], values['io_write'] = self.parse_io(self.read(files['io.stat']))
+            for kind in ('cpu', 'memory', 'io'):
+                name = kind + '.pressure'
+                if name in files:
+                    values[kind + '_pressure'] = parse_psi(self.read(files[name]))[0]
+        except (OSError, ValueError):
+            # Groupe supprimé entre la découverte et la lecture
+            return None
+        return values
+
+    def refresh(self):
+        """Relit tous les groupes et retourne les `top_n` premiers selon `key`."""
+        self.discover()
+        now = time.monotonic()
+        elapsed = now - self.prev_t if self.prev_t is not None else None
+        self.prev_t = now
+
+        rows = []
+        for path, group in list(self.groups.items()):
+            values = self.sample(path, group)
+            if values is None:
+                continue
+            prev, group['prev'] = group['prev'], values
+            if not elapsed or prev is None:
+                continue
+            delta = lambda name: max(values.get(name, 0) - prev.get(name, 0), 0) / elapsed
+            row = {
+                'path': '/' if path == self.root else '/' + os.path.relpath(path, self.root),
+                'cpu': delta('usage_usec') / 1e4,
+                'throttled': delta('throttled_usec') / 1e4,
+                'memory': values.get('memory', 0),
+                'anon': values.get('anon', 0),
+                'file': values.get('file', 0),
+                'io_read': delta('io_read'),
+                'io_write': delta('io_write'),
+                'cpu_pressure': values.get('cpu_pressure', 0.0),
+                'memory_pressure': values.get('memory_pressure', 0.0),
+                'io_pressure': values.get('io_pressure', 0.0),
+            }
+            row['io'] = row['io_read'] + row['io_write']
+            row['pressure'] = max(row['cpu_pressure'], row['memory_pressure'], row['io_pressure'])
+            rows.append(row)
+
+        self.count = len(self.groups)
+        key = self.key
+        # La racine agrège toute la machine : elle n'entre pas dans le classement
+        return heapq.nlargest(self.top_n, (row for row in rows if row['path'] != '/'),
+                              key=lambda row: row[key])
+
+
+class DirectoryIndex:
+    """Index persistant des tailles et nombres de fichiers agrégés par répertoire.
+
+    Chaque répertoire est mémorisé avec son mtime et son inode : lors d'un
+    rafraîchissement, un répertoire inchangé est seulement stat-é et ses
+    fichiers ne sont pas relistés ; seuls les répertoires modifiés (ajout,
+    suppression ou renommage d'entrées) sont relus avec `os.scandir`. La
+    modification sur place d'un fichier ne change pas le mtime de son dossier :
+    `refresh(full=True)` force alors une relecture complète, faite d'office
+    si la dernière date de plus de FULL_EVERY secondes.
+    """
+    FULL_EVERY = 24 * 3600
+    # Champs d'un nœud : mtime_ns, inode, taille propre, fichiers propres,
+    # sous-répertoires, taille totale, fichiers totaux
+    MTIME, INO, OWN_SIZE, OWN_FILES, CHILDREN, TOTAL_SIZE, TOTAL_FILES = range(7)
+
+    def __init__(self, root, path=None, workers=8):
+        self.root = os.path.abspath(root)
+        if path is None:
+            digest = hashlib.sha1(self.root.encode('utf-8', 'surrogateescape')).hexdigest()[:12]
+            path = os.path.join(os.path.expanduser('~'), '.pc_ressources', f'index-{digest}.pickle')
+        self.path = path
+        self.workers = workers
+        self.nodes = {}
+        self.full_at = 0.0
+        self.full = False
+        self.checked = self.rescanned = 0
+        self.elapsed = 0.0
+        self._cancel = threading.Event()
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return False
+        if data.get('root') != self.root:
+            return False
+        self.nodes = data['nodes']
+        self.full_at = data.get('full_at', 0.0)
+        return True
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({'root': self.root, 'nodes': self.nodes, 'full_at': self.full_at}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _visit(self, path, full):
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return None, False
+        old = self.nodes.get(path)
+        if not full and old is not None and old[self.MTIME] == st.st_mtime_ns and old[self.INO] == st.st_ino:
+            return old, False
+
+        own_size = own_files = 0
+        children = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            children.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            own_size += entry.stat(follow_symlinks=False).st_size
+                            own_files += 1
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return (st.st_mtime_ns, st.st_ino, own_size, own_files, tuple(children), 0, 0), True
+
+    def refresh(self, full=None):
+        """Met l'index à jour par niveaux (parcours en largeur parallélisé) ; faux si annulé.
+
+        Par défaut (`full=None`), la relecture est complète si la précédente
+        date de plus de FULL_EVERY secondes.
+        """
+        if full is None:
+            full = time.time() - self.full_at >= self.FULL_EVERY
+        self.full = full
+        self._cancel.clear()
+        start = time.monotonic()
+        self.checked = self.rescanned = 0
+        nodes = {}
+        levels = []
+        level = [self.root]
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            while level and not self._cancel.is_set():
+                levels.append(level)
+                following = []
+                for path, (node, rescanned) in zip(level, pool.map(lambda p: self._visit(p, full), level)):
+                    self.checked += 1
+                    if node is None:
+                        continue
+                    self.rescanned += rescanned
+                    nodes[path] = node
+                    following.extend(node[self.CHILDREN])
+                level = following
+        if self._cancel.is_set():
+            return False
+
+        # Agrégation des totaux des feuilles vers la racine
+        for level in reversed(levels):
+            for path in level:
+                node = nodes.get(path)
+                if node is None:
+                    continue
+                size, files = node[self.OWN_SIZE], node[self.OWN_FILES]
+                for child in node[self.CHILDREN]:
+                    sub = nodes.get(child)
+                    if sub is not None:
+                        size += sub[self.TOTAL_SIZE]
+                        files += sub[self.TOTAL_FILES]
+                nodes[path] = node[:self.TOTAL_SIZE] + (size, files)
+        self.nodes = nodes
+        if full:
+            self.full_at = time.time()
+        self.elapsed = time.monotonic() - start
+        return True
+
+    def biggest(self, n=20, depth=None):
+        """Les `n` plus gros répertoires, à la manière de `du`, éventuellement à une profondeur donnée."""
+        base = self.root.rstrip(os.sep).count(os.sep)
+        candidates = ((node[self.TOTAL_SIZE], node[self.TOTAL_FILES], path)
+                      for path, node in self.nodes.items()
+                      if depth is None or path.rstrip(os.sep).count(os.sep) - base == depth)
+        return heapq.nlargest(n, candidates)
+
+    def children(self, path):
+        """Sous-répertoires directs de `path`, [(taille, chemin), ...] par taille décroissante."""
+        node = self.nodes.get(path)
+        if node is None:
+            return []
+        items = [(self.nodes[c][self.TOTAL_SIZE], c) for c in node[self.CHILDREN] if c in self.nodes]
+        if node[self.OWN_SIZE]:
+            items.append((node[self.OWN_SIZE], os.path.join(path, '.')))
+        return sorted(items, reverse=True)
+
+
+def squarify(sizes, x, y, width, height):
+    """Disposition « squarified » d'un treemap : un rectangle (x, y, l, h) par taille triée décroissante."""
+    total = float(sum(sizes))
+    if total <= 0 or width <= 0 or height <= 0:
+        return [(x, y, 0, 0) for _ in sizes]
+    scale = width * height / total
+    areas = [size * scale for size in sizes]
+    rects = []
+
+    def worst(row, side):
+        s = sum(row)
+        return max(max(side * side * a / (s * s), (s * s) / (side * side * a)) for a in row)
+
+    i = 0
+    while i < len(areas):
+        side = min(width, height)
+        row = [areas[i]]
+        i += 1
+        # On agrandit la rangée tant que le pire rapport d'aspect s'améliore
+        while i < len(areas) and areas[i] > 0 and worst(row + [areas[i]], side) <= worst(row, side):
+            row.append(areas[i])
+            i += 1
+        s = sum(row)
+        if width >= height:
+            w = s / height if height else 0
+            offset = y
+            for a in row:
+                h = a / w if w else 0
+                rects.append((x, offset, w, h))
+                offset += h
+            x, width = x + w, width - w
+        else:
+            h = s / width if width else 0
+            offset = x
+            for a in row:
+                w = a / h if h else 0
+                rects.append((offset, y, w, h))
+                offset += w
+            y, height = y + h, height - h
+    return rects
 
-        # Configuration du style
-        self.style = ttk.Style()
-        self.style.configure('Nav.TButton', padding=5)
 
-        # Création de la barre de navigation
-        self.create_navbar()
+class CleanupTarget:
+    """Dossiers dont le contenu peut être supprimé ; les dossiers racines eux-mêmes sont gardés.
 
-        # Création du conteneur principal
-        self.main_container = ttk.Frame(self.root)
-        self.main_container.pack(fill=tk.BOTH, expand=True)
+    `patterns` accepte les jokers de glob (profils de navigateurs...). Avec
+    `min_age`, seuls les fichiers non modifiés depuis ce nombre de secondes
+    sont concernés. Avec `keep_hidden`, les entrées cachées (.nom) restent en
+    place : dans les dossiers temporaires partagés, ce sont les verrous et
+    sockets des autres programmes. `checked` coche la cible par défaut.
+    """
 
-        # Initialisation des pages
-        self.pages = {}
-        self.create_pages()
+    def __init__(self, name, patterns, group='système', min_age=0, keep_hidden=False, checked=False):
+        self.name = name
+        self.patterns = patterns
+        self.group = group
+        self.min_age = min_age
+        self.keep_hidden = keep_hidden
+        self.checked = checked
 
-        # Afficher la page principale par défaut
-        self.show_page('main')
+    def roots(self):
+        found = []
+        for pattern in self.patterns:
+            found.extend(path for path in glob.glob(os.path.expanduser(pattern)) if os.path.isdir(path))
+        return sorted(set(found))
 
-    def create_navbar(self):
-        navbar = ttk.Frame(self.root)
-        navbar.pack(fill=tk.X, padx=5, pady=5)
 
-        # Boutons de navigation
-        ttk.Button(navbar, text="Moniteur Principal",
-                   command=lambda: self.show_page('main'),
-                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+def cleanup_targets():
+    """Cibles de nettoyage connues pour la plateforme courante."""
+    if os.name == 'nt':
+        local = os.environ.get('LOCALAPPDATA', os.path.expanduser('~\\AppData\\Local'))
+        windir = os.environ.get('WINDIR', 'C:\\Windows')
+        return [
+            CleanupTarget("Prefetch", [os.path.join(windir, 'Prefetch')], checked=True),
+            CleanupTarget("Temporaires Windows", [os.path.join(windir, 'Temp'), tempfile.gettempdir()],
+                          min_age=24 * 3600, keep_hidden=True),
+            CleanupTarget("Cache Chrome", [os.path.join(local, 'Google', 'Chrome', 'User Data', '*', 'Cache')],
+                          'navigateurs', checked=True),
+            CleanupTarget("Cache Edge", [os.path.join(local, 'Microsoft', 'Edge', 'User Data', '*', 'Cache')],
+                          'navigateurs', checked=True),
+            CleanupTarget("Cache Firefox", [os.path.join(local, 'Mozilla', 'Firefox', 'Profiles', '*', 'cache2')],
+                          'navigateurs', checked=True),
+        ]
+    cache = os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+    return [
+        CleanupTarget("Cache Chrome/Chromium", [os.path.join(cache, name, '*', 'Cache')
+                                                for name in ('google-chrome', 'chromium')],
+                      'navigateurs', checked=True),
+        CleanupTarget("Cache Firefox", [os.path.join(cache, 'mozilla', 'firefox', '*', 'cache2')],
+                      'navigateurs', checked=True),
+        CleanupTarget("Cache utilisateur", [cache], 'utilisateur'),
+        CleanupTarget("Corbeille", ['~/.local/share/Trash/files', '~/.local/share/Trash/info'], 'utilisateur'),
+        CleanupTarget("Fichiers temporaires", [tempfile.gettempdir(), '/var/tmp'], min_age=24 * 3600,
+                      keep_hidden=True),
+    ]
 
-        ttk.Button(navbar, text="Optimisation Stockage",
-                   command=lambda: self.show_page('storage'),
-                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
 
-        ttk.Button(navbar, text="Optimisation RAM",
-                   command=lambda: self.show_page('ram'),
-                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+class Cleaner:
+    """Nettoyage concurrent en deux temps : estimation (dry-run), puis suppression.
 
-        ttk.Button(navbar, text="Performances",
-                   command=lambda: self.show_page('performance'),
-                   style='Nav.TButton').pack(side=tk.LEFT, padx=5)
+    `estimate()` parcourt toutes les racines des cibles en parallèle et
+    dresse la liste des fichiers à supprimer ; un dossier qui est la racine
+    d'une autre cible n'est compté qu'une fois, par cette cible. `delete()`
+    supprime exactement ces fichiers par lots dans un pool borné, puis les
+    sous-dossiers devenus vides. Les deux étapes tournent hors du thread Tk,
+    sont annulables et se lisent par `progress()`.
+    """
+    CHUNK = 256
+    MAX_ERRORS = 1000
+    # Sockets de sessions en cours (X, tmux, ssh-agent, services systemd), verrous et
+    # fichiers pid : jamais touchés, qu'il s'agisse de dossiers ou de fichiers
+    KEEP = ('.X11-unix', '.ICE-unix', '.XIM-unix', '.font-unix', '.Test-unix',
+            'tmux-*', 'ssh-*', 'systemd-private-*',
+            '.X*-lock', '*.lock', '*.pid', 'LCK..*', 'lock')
 
-    def create_pages(self):
-        # Page principale (avec les graphiques existants)
-        self.pages['main'] = MainPage(self.main_container)
+    def __init__(self, targets, workers=8):
+        self.targets = list(targets)
+        self.workers = workers
+        self.plan = {t.name: [] for t in self.targets}
+        self.dirs = {t.name: [] for t in self.targets}
+        self.stats = {t.name: {'files': 0, 'bytes': 0, 'deleted': 0, 'freed': 0, 'errors': 0}
+                      for t in self.targets}
+        self.errors = []
+        self.stage = 'prêt'
+        self.started = self.finished = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._thread = None
 
-        # Page d'optimisation du stockage
-        self.pages['storage'] = StoragePage(self.main_container)
+    def estimate(self):
+        return self._start('estimation', self._estimate)
 
-        # Page d'optimisation de la RAM
-        self.pages['ram'] = RAMPage(self.main_container)
+    def delete(self, names=None):
+        """Supprime les fichiers estimés des cibles `names` (toutes par défaut)."""
+        names = [t.name for t in self.targets] if names is None else list(names)
+        return self._start('suppression', lambda: self._delete(names))
 
-        # Page des performances
-        self.pages['performance'] = PerformancePage(self.main_container)
+    def _start(self, stage, run):
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Nettoyage déjà en cours")
+        self.stage = stage
+        self.started, self.finished = time.monotonic(), None
+        self._cancel.clear()
 
-    def show_page(self, page_name):
-        # Cacher toutes les pages
-        for page in self.pages.values():
-            page.hide()
+        def work():
+            try:
+                run()
+            finally:
+                self.finished = time.monotonic()
+        self._thread = threading.Thread(target=work, name="Cleaner", daemon=True)
+        self._thread.start()
+        return self
 
-        # Afficher la page demandée
-        self.pages[page_name].show()
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        return self._thread is None or not self._thread.is_alive()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def error(self, name, path, exc):
+        # Appelé sous verrou
+        self.stats[name]['errors'] += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append((name, path, str(exc)))
+
+    def _estimate(self):
+        roots = {target.name: target.roots() for target in self.targets}
+        excluded = {os.path.normcase(root) for paths in roots.values() for root in paths}
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            futures = [pool.submit(self._scan_root, target, root, excluded - {os.path.normcase(root)})
+                       for target in self.targets for root in roots[target.name]]
+            concurrent.futures.wait(futures)
+
+    def _scan_root(self, target, root, excluded):
+        cutoff = time.time() - target.min_age if target.min_age else None
+        stack = [root]
+        while stack and not self._cancel.is_set():
+            path = stack.pop()
+            files, dirs, errors = [], [], []
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if self.kept(target, entry.name):
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                if os.path.normcase(entry.path) in excluded:
+                                    continue
+                                stack.append(entry.path)
+                                # Seuls les dossiers anciens pourront être retirés une fois vidés
+                                if cutoff is None or entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                                    dirs.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                                # Fichiers et liens symboliques : le lien est supprimé, pas sa cible.
+                                # Sockets, tubes nommés et périphériques sont laissés en place.
+                                st = entry.stat(follow_symlinks=False)
+                                if cutoff is None or st.st_mtime < cutoff:
+                                    files.append((entry.path, st.st_size))
+                        except OSError as e:
+                            errors.append((entry.path, e))
+            except OSError as e:
+                errors.append((path, e))
+
+            # Un seul passage sous verrou par répertoire
+            with self._lock:
+                stats = self.stats[target.name]
+                stats['files'] += len(files)
+                stats['bytes'] += sum(size for _, size in files)
+                self.plan[target.name].extend(files)
+                self.dirs[target.name].extend(dirs)
+                for failed, exc in errors:
+                    self.error(target.name, failed, exc)
+
+    def kept(self, target, name):
+        """Vrai si l'entrée `name` doit rester en place, quel que soit son âge."""
+        if target.keep_hidden and name.startswith('.'):
+            return True
+        return any(fnmatch.fnmatchcase(name, keep) for keep in self.KEEP)
+
+    def _delete(self, names):
+        chunks = []
+        for name in names:
+            files = self.plan[name]
+            chunks.extend((name, files[i:i + self.CHUNK]) for i in range(0, len(files), self.CHUNK))
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            concurrent.futures.wait([pool.submit(self._delete_chunk, name, chunk) for name, chunk in chunks])
+        if self._cancel.is_set():
+            return
+        # Sous-dossiers vidés, du plus profond au moins profond ; un dossier encore occupé reste
+        for name in names:
+            for path in sorted(self.dirs[name], key=lambda p: p.count(os.sep), reverse=True):
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+
+    def _delete_chunk(self, name, chunk):
+        if self._cancel.is_set():
+            return
+        deleted = freed = 0
+        errors = []
+        for path, size in chunk:
+            try:
+                os.unlink(path)
+                deleted += 1
+                freed += size
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                errors.append((path, e))
+        with self._lock:
+            stats = self.stats[name]
+            stats['deleted'] += deleted
+            stats['freed'] += freed
+            for path, exc in errors:
+                self.error(name, path, exc)
+
+    def progress(self):
+        with self._lock:
+            elapsed = ((self.finished or time.monotonic()) - self.started) if self.started else 0.0
+            targets = {name: dict(stats) for name, stats in self.stats.items()}
+            errors = list(self.errors[-20:])
+        return {
+            'stage': self.stage,
+            'targets': targets,
+            'bytes': sum(t['bytes'] for t in targets.values()),
+            'freed': sum(t['freed'] for t in targets.values()),
+            'errors': sum(t['errors'] for t in targets.values()),
+            'last_errors': errors,
+            'elapsed': elapsed,
+            'done': self.done,
+            'cancelled': self.cancelled,
+        }
+
+
+def confirm_cleanup(parent, stats, names=None):
+    """Montre ce que l'estimation a trouvé et demande l'accord avant toute suppression."""
+    targets = [(name, t) for name, t in stats['targets'].items()
+               if (names is None or name in names) and t['files']]
+    if not targets:
+        messagebox.showinfo("Nettoyage", "Rien à supprimer.", parent=parent)
+        return False
+    lines = [f"{name} : {t['files']} fichiers, {t['bytes'] / 1024 ** 2:.1f} MB" for name, t in targets]
+    return messagebox.askyesno("Confirmer le nettoyage",
+                               "Supprimer définitivement ces fichiers ?\n\n" + "\n".join(lines),
+                               icon='warning', default='no', parent=parent)
+
+
+def format_cleanup(stats):
+    """Résumé texte d'un `Cleaner.progress()` : une ligne par cible, puis les dernières erreurs."""
+    stage = stats['stage'] + (" annulée" if stats['cancelled'] else " terminée" if stats['done'] else " en cours...")
+    lines = [f"Nettoyage : {stage} ({stats['elapsed']:.1f} s)"]
+    for name, t in stats['targets'].items():
+        line = f"  {name:<24} {t['files']:>8} fichiers  {t['bytes'] / 1024 ** 2:>10.1f} MB"
+        if stats['stage'] == 'suppression':
+            line += f"  -> {t['deleted']} supprimés, {t['freed'] / 1024 ** 2:.1f} MB libérés"
+        if t['errors']:
+            line += f"  ({t['errors']} erreurs)"
+        lines.append(line)
+    lines.append(f"Total : {stats['bytes'] / 1024 ** 3:.2f} GB récupérables, "
+                 f"{stats['freed'] / 1024 ** 3:.2f} GB libérés, {stats['errors']} erreurs")
+    for name, path, message in stats['last_errors']:
+        lines.append(f"  [{name}] {path} : {message}")
+    return "\n".join(lines) + "\n"
+
+
+class BlitManager:
+    """Redessine seulement les artistes animés par-dessus un fond mis en cache.
+
+    Le fond (axes, grilles, légendes...) est capturé à chaque rendu complet ;
+    les mises à jour suivantes restaurent ce fond puis ne rastérisent que les
+    artistes enregistrés. Avec `enabled=False`, chaque mise à jour retombe sur
+    un `draw_idle()` complet.
+    """
+
+    def __init__(self, canvas, enabled=True, instruments=None, name='canvas'):
+        self.canvas = canvas
+        self.enabled = enabled
+        self.background = None
+        self.artists = []
+        self.cid = canvas.mpl_connect('draw_event', self.on_draw)
+        self.blit_timer = None
+        if instruments is not None:
+            # Chronomètre sur l'instance : couvre aussi les rendus déclenchés par Tk (redimensionnement...)
+            draw, draw_timer = canvas.draw, instruments.timer(name + '.draw')
+
+            def timed_draw(*args, **kwargs):
+                with draw_timer:
+                    return draw(*args, **kwargs)
+            canvas.draw = timed_draw
+            self.blit_timer = instruments.timer(name + '.blit')
+
+    def add_artist(self, *artists):
+        for art in artists:
+            art.set_animated(self.enabled)
+            self.artists.append(art)
+
+    def remove_artist(self, *artists):
+        for art in artists:
+            if art in self.artists:
+                self.artists.remove(art)
+
+    def on_draw(self, event):
+        if not self.enabled:
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.draw_animated()
+
+    def draw_animated(self):
+        fig = self.canvas.figure
+        for art in self.artists:
+            fig.draw_artist(art)
+
+    def update(self, full=False):
+        """Blitte les artistes animés, ou redessine tout si `full` (limites changées)."""
+        if full or not self.enabled or self.background is None:
+            self.canvas.draw_idle()
+            return
+        if self.blit_timer is not None:
+            with self.blit_timer:
+                self.blit()
+        else:
+            self.blit()
+
+    def blit(self):
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def sync_treeview(tree, shown, rows):
+    """Met à jour uniquement les lignes du Treeview qui ont changé.
+
+    `shown` est le dict {iid: valeurs} affiché jusqu'ici, `rows` la liste
+    ordonnée des (iid, valeurs) voulues ; retourne le nouveau dict affiché.
+    """
+    wanted = {}
+    for index, (iid, values) in enumerate(rows):
+        wanted[iid] = values
+        if iid not in shown:
+            tree.insert('', index, iid=iid, values=values)
+        else:
+            if shown[iid] != values:
+                tree.item(iid, values=values)
+            if tree.index(iid) != index:
+                tree.move(iid, '', index)
+    for iid in shown.keys() - wanted.keys():
+        tree.delete(iid)
+    return wanted
+
+
+class BackgroundRefresh:
+    """Relevé périodique exécuté sur un thread dédié, interrogé depuis Tk sans jamais l'attendre.
+
+    `poll()` transmet le relevé terminé à `show` (ou son exception à
+    `on_error`), puis en relance un si `interval` secondes se sont écoulées
+    depuis le lancement précédent.
+    """
+
+    def __init__(self, fn, interval, show, on_error):
+        self.fn = fn
+        self.interval = interval
+        self.show = show
+        self.on_error = on_error
+        self.pool = concurrent.futures.ThreadPoolExecutor(1)
+        self.future = None
+        self.submitted = None
+
+    @property
+    def busy(self):
+        return self.future is not None
+
+    def reset(self):
+        """Le prochain `poll()` relance un relevé sans attendre l'intervalle."""
+        self.submitted = None
+
+    def poll(self):
+        future = self.future
+        if future is not None and future.done():
+            self.future = None
+            try:
+                result = future.result()
+            except Exception as e:
+                self.on_error(e)
+            else:
+                self.show(result)
+        now = time.monotonic()
+        if self.future is None and (self.submitted is None or now - self.submitted >= self.interval):
+            self.submitted = now
+            self.future = self.pool.submit(self.fn)
+
+    def delay_ms(self, poll_ms=100):
+        """Délai avant le prochain `poll()` utile : court pendant un relevé, sinon jusqu'au suivant."""
+        if self.busy or self.submitted is None:
+            return poll_ms
+        return max(int((self.submitted + self.interval - time.monotonic()) * 1000), poll_ms)
+
+    def close(self, wait=False):
+        """Arrête le thread ; avec `wait`, attend la fin du relevé en cours."""
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+        self.future = None
 
 
 class BasePage:
-    def __init__(self, container):
+    def __init__(self, container, collector=None):
+        self.collector = collector
+        self.visible = False
+        self.after_id = None
         self.frame = ttk.Frame(container)
         self.frame.pack(fill=tk.BOTH, expand=True)
         self.create_widgets()
 
     def show(self):
         self.frame.pack(fill=tk.BOTH, expand=True)
+        if not self.visible:
+            self.visible = True
+            self.resume()
 
     def hide(self):
         self.frame.pack_forget()
+        if self.visible:
+            self.visible = False
+            self.suspend()
 
     def create_widgets(self):
         pass
 
+    def resume(self):
+        """Appelé quand la page devient visible : relance sa boucle de rafraîchissement."""
+        pass
+
+    def suspend(self):
+        """Appelé quand la page est cachée : plus aucun rafraîchissement n'est programmé."""
+        self.cancel_scheduled()
+
+    def close(self):
+        """Appelé à la fermeture de l'application : libère threads et fichiers ouverts."""
+        self.cancel_scheduled()
+
+    @property
+    def instruments(self):
+        return self.collector.instruments if self.collector is not None else None
+
+    def schedule(self, ms, callback):
+        """Programme le prochain rafraîchissement de la page (un seul en attente à la fois)."""
+        self.cancel_scheduled()
+        instruments = self.instruments
+        if instruments is None:
+            self.after_id = self.frame.after(ms, callback)
+            return
+
+        # Retard de Tk sur l'échéance prévue, puis durée du rafraîchissement lui-même
+        name = type(self).__name__
+        due = time.monotonic() + ms / 1000
+
+        def timed():
+            instruments.record(name + '.lag', max(time.monotonic() - due, 0))
+            with instruments.timer(name + '.update'):
+                callback()
+        self.after_id = self.frame.after(ms, timed)
+
+    def refresh_ms(self, fastest, slowest):
+        """Délai de rafraîchissement calé sur la cadence actuelle du collecteur, borné."""
+        interval = self.collector.interval * 1000 if self.collector is not None else slowest
+        return int(min(max(interval, fastest), slowest))
+
+    def cancel_scheduled(self):
+        if self.after_id is not None:
+            self.frame.after_cancel(self.after_id)
+            self.after_id = None
+
 
 class MainPage(BasePage):
+    USE_BLIT = True
+    MAX_SENSORS = 6
+    SENSOR_WINDOW = 300
+
     def create_widgets(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         # Configuration initiale
         self.INTERVAL_MS = 5000
         self.WINDOW = 60 * 30
-        self.MAXPTS = self.WINDOW // (self.INTERVAL_MS // 1000)
+        self.RANGES = {"5 min": 300, "30 min": 1800, "6 h": 6 * 3600,
+                       "24 h": 24 * 3600, "3 jours": 3 * 24 * 3600}
 
-        # Création des buffers pour les données
-        self.ts, self.ram_vals, self.disk_vals = (deque(maxlen=self.MAXPTS) for _ in range(3))
+        # Sélecteur de plage : l'historique vient de la rétention du collecteur
+        range_frame = ttk.Frame(self.frame)
+        range_frame.pack(fill=tk.X, padx=10, pady=(5, 0))
+        ttk.Label(range_frame, text="Plage :").pack(side=tk.LEFT)
+        self.range_var = tk.StringVar(value="30 min")
+        range_box = ttk.Combobox(range_frame, textvariable=self.range_var, state='readonly',
+                                 values=list(self.RANGES), width=10)
+        range_box.pack(side=tk.LEFT, padx=5)
+        range_box.bind('<<ComboboxSelected>>', self.on_range_change)
+        # Cadence adaptative : plus rapide pendant les pics, plus lente au repos
+        self.interval_label = ttk.Label(range_frame, text="")
+        self.interval_label.pack(side=tk.RIGHT)
 
         # Création de la figure principale
         self.fig = Figure(figsize=(12, 8))
@@ -137,11 +3642,23 @@ class MainPage(BasePage):
         self.canvas = FigureCanvasTkAgg(self.fig, self.frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
+        # Seuls les lignes et les indicateurs changent entre deux rendus
+        self.blit = BlitManager(self.canvas, self.USE_BLIT, self.instruments, type(self).__name__)
+        self.blit.add_artist(self.ln_ram, self.ln_disk, self.cpu_rect, self.cpu_text,
+                             self.temp_text, self.sensor_text, *self.sensor_lines)
+        self.last_seq = 0
+
+    def resume(self):
         # Démarrage de la mise à jour
         self.start_update()
 
     def setup_axes(self):
+        import matplotlib.ticker
+
         self.ax_ram.set_xlabel("Heure")
+        # Abscisses en secondes epoch : pas de conversion de dates à chaque tick
+        self.ax_ram.xaxis.set_major_formatter(matplotlib.ticker.FuncFormatter(
+            lambda x, pos: dt.datetime.fromtimestamp(x).strftime('%H:%M:%S')))
         self.ax_ram.set_ylabel("RAM libre (Go)", color="tab:red")
         self.ax_disk.set_ylabel("Stockage libre (Go)", color="tab:blue")
 
@@ -149,83 +3666,108 @@ class MainPage(BasePage):
         labels = [l.get_label() for l in lines]
         self.ax_ram.legend(lines, labels, loc="upper right")
 
-        for ax in [self.ax_cpu, self.ax_temp]:
-            ax.set_xticks([])
-            ax.set_yticks([])
+        self.ax_cpu.set_xticks([])
+        self.ax_cpu.set_yticks([])
+        # Températures par capteur sur les dernières minutes, abscisses relatives à maintenant
+        self.ax_temp.set_xlim(-self.SENSOR_WINDOW, 0)
+        self.ax_temp.set_ylim(20, 80)
+        self.ax_temp.tick_params(labelsize=7)
 
     def setup_indicators(self):
+        from matplotlib.patches import Rectangle
+
         self.cpu_rect = Rectangle((0.1, 0.2), 0.8, 0.6, facecolor='lightgray')  # Ajusté pour laisser de l'espace en bas
-        self.temp_rect = Rectangle((0.1, 0.2), 0.8, 0.6,
-                                   facecolor='lightgray')  # Ajusté pour laisser de l'espace en bas
         self.ax_cpu.add_patch(self.cpu_rect)
-        self.ax_temp.add_patch(self.temp_rect)
 
         self.cpu_text = self.ax_cpu.text(0.5, 0.5, "CPU: ---%",
                                          horizontalalignment='center',
                                          verticalalignment='center')
-        self.temp_text = self.ax_temp.text(0.5, 0.5, "Temp: ---°C",
-                                           horizontalalignment='center',
-                                           verticalalignment='center')
+        self.temp_text = self.ax_temp.text(0.99, 0.95, "Temp: ---°C", transform=self.ax_temp.transAxes,
+                                           horizontalalignment='right',
+                                           verticalalignment='top')
+        # Lignes préallouées : un capteur qui apparaît ne force pas de rendu complet
+        self.sensor_lines = [self.ax_temp.plot([], [], lw=1)[0] for _ in range(self.MAX_SENSORS)]
+        self.sensor_text = self.ax_temp.text(0.01, 0.95, "", transform=self.ax_temp.transAxes,
+                                             verticalalignment='top', fontsize=7, family='monospace')
 
         # Déplacer les titres en bas
         self.ax_cpu.set_title("Utilisation CPU", pad=30, y=-0.2)  # y=-0.2 place le titre en dessous
-        self.ax_temp.set_title("Température", pad=30, y=-0.2)  # pad=30 ajoute de l'espace
+        self.ax_temp.set_title("Températures (5 min)", fontsize=9)
 
     def update(self):
-        now = dt.datetime.now()
-        self.ts.append(now)
-        self.ram_vals.append(self.get_ram())
-        self.disk_vals.append(self.get_disk())
-
-        current_cpu = self.get_cpu_usage()
-        current_temp = self.get_temperature()
+        snap = self.collector.latest()
+        if snap is None or snap['seq'] == self.last_seq:
+            # Pas encore de nouvel échantillon : on repasse un peu plus tard
+            self.schedule(200, self.update)
+            return
+        self.last_seq = snap['seq']
 
-        # Mise à jour des graphiques
-        self.ln_ram.set_data(self.ts, self.ram_vals)
-        self.ln_disk.set_data(self.ts, self.disk_vals)
+        current_cpu = snap['cpu']
+        current_temp = snap['temp']
 
-        # Mise à jour des limites
-        if len(self.ts) >= 2:
-            self.ax_ram.set_xlim(self.ts[0], self.ts[-1])
-        else:
-            pad = dt.timedelta(seconds=1)
-            self.ax_ram.set_xlim(self.ts[0] - pad, self.ts[0] + pad)
+        # Mise à jour des graphiques, réduits à la largeur en pixels de l'axe
+        end = snap['ts']
+        start = end - self.RANGES.get(self.range_var.get(), self.WINDOW)
+        width = max(int(self.ax_ram.bbox.width), 3)
+        t_ram, ram = lttb(*self.collector.query('ram', start, end), width)
+        t_disk, disk = lttb(*self.collector.query('disk', start, end), width)
+        self.ln_ram.set_data(t_ram, ram)
+        self.ln_disk.set_data(t_disk, disk)
 
-        if self.ram_vals:
-            self.ax_ram.set_ylim(*self.auto_lim(self.ram_vals))
-        if self.disk_vals:
-            self.ax_disk.set_ylim(*self.auto_lim(self.disk_vals))
+        # Mise à jour des limites, uniquement si les données sortent du cadre
+        rescale = self.update_xlim(t_ram)
+        rescale |= self.update_ylim(self.ax_ram, self.extrema(ram))
+        rescale |= self.update_ylim(self.ax_disk, self.extrema(disk))
 
         # Mise à jour CPU et Température
         self.update_indicators(current_cpu, current_temp)
+        rescale |= self.update_sensors(snap)
 
-        self.canvas.draw_idle()
-        self.frame.after(self.INTERVAL_MS, self.update)
+        self.blit.update(full=rescale)
+        self.interval_label.config(text=f"Échantillonnage : {snap.get('interval', self.collector.interval):.2f} s")
+        self.schedule(self.refresh_ms(1000, self.INTERVAL_MS), self.update)
 
-    def start_update(self):
+    def on_range_change(self, event=None):
+        # Nouvelle plage : on oublie les limites pour forcer un réétalonnage
+        self.ax_ram.set_xlim(0, 1)
+        self.last_seq = 0
+        self.cancel_scheduled()
         self.update()
-        self.frame.after(self.INTERVAL_MS, self.update)
 
     @staticmethod
-    def get_ram():
-        return psutil.virtual_memory().available / (1024 ** 3)
+    def extrema(values):
+        if not len(values):
+            return None
+        return float(values.min()), float(values.max())
 
-    @staticmethod
-    def get_disk():
-        return psutil.disk_usage(os.path.abspath(os.sep)).free / (1024 ** 3)
+    def update_xlim(self, times):
+        # Marge à droite pour ne décaler l'axe du temps que de loin en loin
+        if not len(times):
+            return False
+        lo, hi = times[0], times[-1]
+        margin = max((hi - lo) * 0.1, 5 * self.INTERVAL_MS / 1000)
+        x0, x1 = self.ax_ram.get_xlim()
+        if x0 <= lo and hi <= x1 and lo - x0 <= margin:
+            return False
+        self.ax_ram.set_xlim(lo, hi + margin)
+        return True
 
-    @staticmethod
-    def get_cpu_usage():
-        return psutil.cpu_percent(interval=None)
+    def update_ylim(self, ax, extrema):
+        # On garde les limites tant qu'elles contiennent les données sans trop de vide
+        if extrema is None:
+            return False
+        vmin, vmax = extrema
+        lo, hi = self.lim_from_extrema(vmin, vmax)
+        y0, y1 = ax.get_ylim()
+        if y0 <= vmin and vmax <= y1 and (hi - lo) >= 0.5 * (y1 - y0):
+            return False
+        ax.set_ylim(lo, hi)
+        return True
 
-    @staticmethod
-    def get_temperature():
-        try:
-            w = wmi.WMI(namespace="root/wmi")
-            temperature_info = w.MSAcpi_ThermalZoneTemperature()[0]
-            return float(temperature_info.CurrentTemperature) / 10 - 273.15
-        except Exception:
-            return None
+    def start_update(self):
+        # Au retour sur la page, on redessine même sans nouvel échantillon
+        self.last_seq = 0
+        self.update()
 
     def update_indicators(self, cpu_value, temp_value):
         self.cpu_text.set_text(f"CPU: {cpu_value:.1f}%")
@@ -233,19 +3775,40 @@ class MainPage(BasePage):
             self.temp_text.set_text(f"Temp: {temp_value:.1f}°C")
             temp_val = min(max(temp_value - 40, 0) / 40, 1)
             temp_color = f"#{int(255 * temp_val):02x}ff{int(255 * (1 - temp_val)):02x}"
-            self.temp_rect.set_facecolor(temp_color)
+            self.temp_text.set_bbox(dict(facecolor=temp_color, edgecolor='none'))
         else:
             self.temp_text.set_text("Temp: N/A")
-            self.temp_rect.set_facecolor('lightgray')
+            self.temp_text.set_bbox(dict(facecolor='lightgray', edgecolor='none'))
 
         cpu_color = f"#{int(255 * cpu_value / 100):02x}ff{int(255 * (1 - cpu_value / 100)):02x}"
         self.cpu_rect.set_facecolor(cpu_color)
 
+    def update_sensors(self, snap):
+        """Courbe et valeur courante de chaque capteur de température ; vrai si l'axe a changé."""
+        temps = [(key, label, value) for key, (kind, label, value) in snap.get('sensors', {}).items()
+                 if kind == 'temp'][:self.MAX_SENSORS]
+        lines, lo, hi = [], math.inf, -math.inf
+        for line, (key, label, value) in zip(self.sensor_lines, temps):
+            t, v = self.collector.sensor_series(key)
+            keep = t >= snap['ts'] - self.SENSOR_WINDOW
+            line.set_data(t[keep] - snap['ts'], v[keep])
+            if keep.any():
+                lo, hi = min(lo, np.nanmin(v[keep])), max(hi, np.nanmax(v[keep]))
+            lines.append(f"{label[:18]:<18} {value:5.1f}°C")
+        for line in self.sensor_lines[len(temps):]:
+            line.set_data([], [])
+
+        # Ventilateurs et batterie : valeur courante seulement
+        for kind, label, value in snap.get('sensors', {}).values():
+            if kind == 'fan':
+                lines.append(f"{label[:18]:<18} {value:5.0f} tr/min")
+            elif kind == 'battery':
+                lines.append(f"{label[:18]:<18} {value:5.0f} %")
+        self.sensor_text.set_text("\n".join(lines))
+        return self.update_ylim(self.ax_temp, (lo, hi) if lo <= hi else None)
+
     @staticmethod
-    def auto_lim(v, pad=0.10, min_pad=1):
-        if not v:
-            return 0, 1
-        lo, hi = min(v), max(v)
+    def lim_from_extrema(lo, hi, pad=0.10, min_pad=1):
         eps = max((hi - lo) * pad, min_pad)
         return max(0, lo - eps), hi + eps
 
@@ -266,54 +3829,287 @@ class StoragePage(BasePage):
         ttk.Button(control_frame, text="Analyser gros fichiers",
                    command=self.analyze_large_files).pack(side=tk.LEFT, padx=5, pady=5)
 
+        ttk.Button(control_frame, text="Trouver doublons",
+                   command=self.find_duplicates).pack(side=tk.LEFT, padx=5, pady=5)
+
+        ttk.Button(control_frame, text="Index des dossiers",
+                   command=self.refresh_index).pack(side=tk.LEFT, padx=5, pady=5)
+
+        ttk.Button(control_frame, text="Relire tout l'index",
+                   command=lambda: self.refresh_index(full=True)).pack(side=tk.LEFT, padx=5, pady=5)
+
+        ttk.Button(control_frame, text="Annuler",
+                   command=self.cancel_all).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Nettoyage : estimation d'abord, puis suppression des cibles cochées
+        cleanup_frame = ttk.LabelFrame(self.frame, text="Nettoyage")
+        cleanup_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.cleanup_vars = {}
+        for target in cleanup_targets():
+            var = tk.BooleanVar(value=target.checked)
+            ttk.Checkbutton(cleanup_frame, text=target.name, variable=var).pack(side=tk.LEFT, padx=5)
+            self.cleanup_vars[target.name] = (target, var)
+        ttk.Button(cleanup_frame, text="Estimer",
+                   command=self.estimate_cleanup).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(cleanup_frame, text="Nettoyer la sélection",
+                   command=self.run_cleanup).pack(side=tk.LEFT, padx=5, pady=5)
+        self.cleaner = None
+        self.winsxs_thread = None
+
+        # Racine et seuil de l'analyse
+        ttk.Label(control_frame, text="Racine :").pack(side=tk.LEFT, padx=(15, 2))
+        self.root_var = tk.StringVar(value="C:\\" if os.name == 'nt' else os.path.abspath(os.sep))
+        ttk.Entry(control_frame, textvariable=self.root_var, width=30).pack(side=tk.LEFT)
+        ttk.Label(control_frame, text="Seuil (Mo) :").pack(side=tk.LEFT, padx=(10, 2))
+        self.threshold_var = tk.StringVar(value="100")
+        ttk.Entry(control_frame, textvariable=self.threshold_var, width=8).pack(side=tk.LEFT)
+        self.scanner = None
+        self.index = None
+        self.index_thread = None
+        self.index_done = None
+
         # Zone de résultats
         self.result_text = tk.Text(self.frame, height=20)
         self.result_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
+        # Treemap des répertoires : double-clic pour entrer, clic droit pour remonter
+        self.treemap = tk.Canvas(self.frame, height=300, background='white')
+        self.treemap.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.treemap.bind('<Configure>', lambda event: self.draw_treemap())
+        self.treemap.bind('<Button-3>', self.treemap_up)
+        self.treemap_path = None
+        self.treemap_items = {}
+
     def clean_winsxs(self):
-        try:
-            os.system('Dism.exe /online /Cleanup-Image /StartComponentCleanup')
-            self.result_text.insert(tk.END, "Nettoyage WinSxS terminé\n")
-        except Exception as e:
-            self.result_text.insert(tk.END, f"Erreur: {str(e)}\n")
+        """DISM tourne dans un thread : l'interface reste utilisable pendant le nettoyage."""
+        if self.winsxs_thread is not None and self.winsxs_thread.is_alive():
+            return
+        self.winsxs_result = None
+
+        def run():
+            try:
+                done = subprocess.run(['Dism.exe', '/online', '/Cleanup-Image', '/StartComponentCleanup'],
+                                      capture_output=True, text=True)
+                self.winsxs_result = (f"Nettoyage WinSxS terminé (code {done.returncode})\n"
+                                      + (done.stderr or ""))
+            except OSError as e:
+                self.winsxs_result = f"Erreur: {str(e)}\n"
+        self.winsxs_thread = threading.Thread(target=run, name="WinSxS", daemon=True)
+        self.winsxs_thread.start()
+        self.result_text.insert(tk.END, "Nettoyage WinSxS en cours...\n")
+        self.poll_winsxs()
+
+    def poll_winsxs(self):
+        if self.winsxs_thread.is_alive():
+            self.frame.after(500, self.poll_winsxs)
+        else:
+            self.result_text.insert(tk.END, self.winsxs_result)
 
     def clean_prefetch(self):
-        prefetch_path = "C:\\Windows\\Prefetch"
-        try:
-            files = os.listdir(prefetch_path)
-            for file in files:
-                try:
-                    os.remove(os.path.join(prefetch_path, file))
-                except:
-                    continue
-            self.result_text.insert(tk.END, "Nettoyage Prefetch terminé\n")
-        except Exception as e:
-            self.result_text.insert(tk.END, f"Erreur: {str(e)}\n")
+        self.start_cleanup([t for t, _ in self.cleanup_vars.values() if t.name == "Prefetch"],
+                           delete=True)
+
+    def selected_targets(self):
+        return [target for target, var in self.cleanup_vars.values() if var.get()]
+
+    def estimate_cleanup(self):
+        self.start_cleanup(self.selected_targets())
+
+    def run_cleanup(self):
+        """Supprime, après confirmation, ce que la dernière estimation a trouvé ; estime d'abord si besoin."""
+        cleaner = self.cleaner
+        names = {t.name for t in self.selected_targets()}
+        if (cleaner is not None and cleaner.done and cleaner.stage == 'estimation'
+                and not cleaner.cancelled and names <= {t.name for t in cleaner.targets}):
+            if confirm_cleanup(self.frame, cleaner.progress(), names):
+                cleaner.delete(names)
+                self.poll_cleanup()
+        else:
+            self.start_cleanup(self.selected_targets(), delete=True)
+
+    def start_cleanup(self, targets, delete=False):
+        if self.cleaner is not None and not self.cleaner.done:
+            return
+        if not targets:
+            self.result_text.insert(tk.END, "Aucune cible de nettoyage sélectionnée ou disponible\n")
+            return
+        self.cleaner = Cleaner(targets).estimate()
+        self.cleanup_then_delete = delete
+        self.poll_cleanup()
+
+    def poll_cleanup(self):
+        cleaner = self.cleaner
+        stats = cleaner.progress()
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, format_cleanup(stats))
+        if not stats['done']:
+            self.frame.after(500, self.poll_cleanup)
+        elif stats['stage'] == 'estimation' and self.cleanup_then_delete and not stats['cancelled']:
+            # L'estimation reste affichée pendant que l'utilisateur décide
+            self.cleanup_then_delete = False
+            if confirm_cleanup(self.frame, stats):
+                cleaner.delete()
+                self.frame.after(500, self.poll_cleanup)
 
     def analyze_large_files(self):
+        self.cancel_scan()
         self.result_text.delete(1.0, tk.END)
         self.result_text.insert(tk.END, "Analyse en cours...\n")
+        self.scanner = FileScanner(self.root_var.get(), threshold=self.read_threshold()).start()
+        self.poll_scan()
 
-        def scan_directory(path):
-            large_files = []
-            for root, dirs, files in os.walk(path):
-                for file in files:
-                    try:
-                        file_path = os.path.join(root, file)
-                        size = os.path.getsize(file_path)
-                        if size > 100_000_000:  # 100 MB
-                            large_files.append((file_path, size))
-                    except:
-                        continue
-            return sorted(large_files, key=lambda x: x[1], reverse=True)[:20]
+    def cancel_all(self):
+        """Bouton « Annuler » : arrête aussi un nettoyage en cours."""
+        self.cancel_scan()
+        if self.cleaner is not None and not self.cleaner.done:
+            self.cleaner.cancel()
+
+    def cancel_scan(self):
+        # Appelé au lancement de chaque analyse : ne doit pas interrompre un nettoyage
+        if self.scanner is not None and not self.scanner.done:
+            self.scanner.cancel()
+        if self.index_thread is not None and self.index_thread.is_alive():
+            self.index.cancel()
+
+    def read_threshold(self):
+        try:
+            return float(self.threshold_var.get()) * 1_000_000
+        except ValueError:
+            return 100_000_000  # 100 MB
+
+    def find_duplicates(self):
+        """Lance la recherche de doublons au-dessus du seuil, sans bloquer l'interface."""
+        self.cancel_scan()
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, "Recherche de doublons en cours...\n")
+        self.scanner = DuplicateFinder(self.root_var.get(), min_size=self.read_threshold()).start()
+        self.poll_duplicates()
+
+    def poll_duplicates(self):
+        finder = self.scanner
+        if not isinstance(finder, DuplicateFinder):
+            return
+        stats = finder.progress()
+        scanned = max(stats['bytes'], 1)
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"Doublons ({stats['stage']}) : {stats['files']} fichiers, "
+                                        f"{stats['bytes'] / 1024 ** 3:.1f} GB vus, "
+                                        f"{stats['bytes_read'] / 1024 ** 3:.2f} GB lus "
+                                        f"({100 * stats['bytes_read'] / scanned:.1f} %)\n")
+        self.result_text.insert(tk.END, f"{stats['groups']} groupes, "
+                                        f"{stats['reclaimable'] / 1024 ** 3:.2f} GB récupérables\n\n")
+        for size, paths in finder.groups()[:50]:
+            self.result_text.insert(tk.END, f"{len(paths)} x {size / 1024 ** 2:.1f} MB :\n")
+            for path in paths:
+                self.result_text.insert(tk.END, f"    {path}\n")
+
+        if not stats['done']:
+            self.frame.after(500, self.poll_duplicates)
+
+    def refresh_index(self, full=None):
+        """Rafraîchit l'index persistant en arrière-plan ; seuls les dossiers modifiés sont relus.
+
+        Avec `full=True`, tout est relu : les fichiers qui grossissent sur place
+        (journaux, bases, images disque) ne changent pas le mtime de leur dossier.
+        """
+        if self.index_thread is not None and self.index_thread.is_alive():
+            return
+        root = os.path.abspath(self.root_var.get())
+        if self.index is None or self.index.root != root:
+            self.index = DirectoryIndex(root)
+            self.index.load()
+        self.index_done = None
+
+        def work():
+            self.index_done = self.index.refresh(full)
+            if self.index_done:
+                self.index.save()
+
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, "Mise à jour de l'index en cours...\n")
+        self.index_thread = threading.Thread(target=work, name="DirectoryIndex", daemon=True)
+        self.index_thread.start()
+        self.poll_index()
+
+    def poll_index(self):
+        index = self.index
+        if self.index_thread.is_alive():
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, f"Mise à jour de l'index en cours... "
+                                            f"{index.checked} dossiers vérifiés, "
+                                            f"{index.rescanned} relus\n")
+            self.frame.after(500, self.poll_index)
+            return
+
+        self.result_text.delete(1.0, tk.END)
+        if not self.index_done:
+            self.result_text.insert(tk.END, f"Mise à jour de l'index annulée après {index.checked} dossiers "
+                                            f"vérifiés : l'index affiché reste celui d'avant\n")
+            return
+        kind = "relecture complète" if index.full else "dossiers modifiés relus"
+        self.result_text.insert(tk.END, f"Index à jour en {index.elapsed:.1f} s ({kind}) : "
+                                        f"{index.checked} dossiers vérifiés, "
+                                        f"{index.rescanned} relus\n\n")
+        self.result_text.insert(tk.END, "Les 20 plus gros dossiers (niveau 1):\n\n")
+        for size, files, path in index.biggest(20, depth=1):
+            self.result_text.insert(tk.END, f"{path}: {size / 1024 ** 3:.2f} GB, {files} fichiers\n")
+        self.treemap_path = index.root
+        self.draw_treemap()
+
+    def draw_treemap(self):
+        canvas = self.treemap
+        canvas.delete('all')
+        self.treemap_items = {}
+        if self.index is None or self.treemap_path is None:
+            return
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        items = [(size, path) for size, path in self.index.children(self.treemap_path) if size > 0][:200]
+        rects = squarify([size for size, _ in items], 0, 0, width, height)
+        colors = ['#8dd3c7', '#ffffb3', '#bebada', '#fb8072', '#80b1d3', '#fdb462', '#b3de69', '#fccde5']
+        for k, ((size, path), (x, y, w, h)) in enumerate(zip(items, rects)):
+            rect = canvas.create_rectangle(x, y, x + w, y + h, fill=colors[k % len(colors)], outline='white')
+            self.treemap_items[rect] = path
+            canvas.tag_bind(rect, '<Double-Button-1>', lambda event, p=path: self.treemap_down(p))
+            if w > 60 and h > 30:
+                canvas.create_text(x + 4, y + 4, anchor='nw', width=w - 8,
+                                   text=f"{os.path.basename(path)}\n{size / 1024 ** 3:.2f} GB")
+        canvas.create_text(4, height - 4, anchor='sw', text=self.treemap_path)
+
+    def treemap_down(self, path):
+        if path in self.index.nodes:
+            self.treemap_path = path
+            self.draw_treemap()
+
+    def treemap_up(self, event=None):
+        if self.treemap_path is not None and self.treemap_path != self.index.root:
+            self.treemap_path = os.path.dirname(self.treemap_path)
+            self.draw_treemap()
+
+    def poll_scan(self):
+        """Affiche les résultats partiels pendant que l'analyse tourne en arrière-plan."""
+        scanner = self.scanner
+        if scanner is None or isinstance(scanner, DuplicateFinder):
+            return
+        stats = scanner.progress()
+        if stats['cancelled']:
+            status = "Analyse annulée"
+        elif stats['done']:
+            status = "Analyse terminée"
+        else:
+            status = "Analyse en cours..."
 
-        results = scan_directory("C:\\")
         self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, "Les 20 plus gros fichiers:\n\n")
-        for path, size in results:
+        self.result_text.insert(tk.END, f"{status} {stats['files']} fichiers, "
+                                        f"{stats['bytes'] / 1024 ** 3:.1f} GB vus "
+                                        f"({stats['files_per_s']:.0f} fichiers/s)\n")
+        self.result_text.insert(tk.END, f"Les {scanner.top_n} plus gros fichiers:\n\n")
+        for size, path in scanner.top():
             size_gb = size / (1024 ** 3)
             self.result_text.insert(tk.END, f"{path}: {size_gb:.2f} GB\n")
 
+        if not stats['done']:
+            self.frame.after(500, self.poll_scan)
+
 
 class RAMPage(BasePage):
     def create_widgets(self):
@@ -331,10 +4127,78 @@ class RAMPage(BasePage):
         ttk.Button(control_frame, text="Analyser Consommation RAM",
                    command=self.analyze_ram_usage).pack(side=tk.LEFT, padx=5, pady=5)
 
+        self.accurate_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_frame, text="Mémoire réelle (USS/PSS)", variable=self.accurate_var,
+                        command=self.toggle_accurate).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Pression mémoire et swap, relevés par le collecteur
+        self.create_pressure_chart()
+
+        # Vue des processus en direct : seules les lignes du top N existent
+        columns = ('pid', 'name', 'rss', 'uss', 'pss', 'cpu', 'threads', 'cmdline')
+        headings = {'pid': "PID", 'name': "Nom", 'rss': "RSS (MB)", 'uss': "USS (MB)", 'pss': "PSS (MB)",
+                    'cpu': "CPU (%)", 'threads': "Threads", 'cmdline': "Ligne de commande"}
+        self.process_tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=15)
+        for column in columns:
+            self.process_tree.heading(column, text=headings[column],
+                                      command=lambda c=column: self.sort_processes(c))
+            self.process_tree.column(column, width=400 if column == 'cmdline' else 90,
+                                     anchor=tk.W if column in ('name', 'cmdline') else tk.E)
+        self.process_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.process_table = ProcessTable()
+        self.process_rows = {}
+        self.processes = BackgroundRefresh(
+            self.process_table.refresh, self.PROCESS_INTERVAL_MS / 1000, self.show_processes,
+            lambda e: self.result_text.insert(tk.END, f"Erreur: {str(e)}\n"))
+        self.live = False
+        self.cleaner = None
+
         # Zone de résultats
-        self.result_text = tk.Text(self.frame, height=20)
+        self.result_text = tk.Text(self.frame, height=8)
         self.result_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
+    PRESSURE_WINDOW = 300
+
+    def create_pressure_chart(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=(12, 2.2))
+        self.ax_pressure = self.fig.add_subplot(1, 2, 1)
+        self.ax_pressure.set_title("Pression mémoire (% du temps bloqué)")
+        self.ax_swap = self.fig.add_subplot(1, 2, 2)
+        self.ax_swap.set_title("Swap (MB/s)")
+        self.pressure_lines = [self.ax_pressure.plot([], [], lw=1, label=label)[0]
+                               for label in ("some", "full")]
+        self.swap_lines = [self.ax_swap.plot([], [], lw=1, label=label)[0]
+                           for label in ("entrées", "sorties")]
+        for ax in (self.ax_pressure, self.ax_swap):
+            ax.set_xlim(-self.PRESSURE_WINDOW, 0)
+            ax.set_ylim(0, 1)
+            ax.grid(True)
+            ax.legend(loc='upper left', fontsize=8)
+        self.fig.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.fig, self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.X, padx=10, pady=5)
+        self.pressure_seq = None
+
+    def update_pressure_chart(self):
+        """Redessine les courbes de pression et de swap si le collecteur a publié depuis."""
+        snap = self.collector.latest() if self.collector is not None else None
+        if snap is None or snap['seq'] == self.pressure_seq:
+            return
+        self.pressure_seq = snap['seq']
+        t, pressure, swap = self.collector.memory_series()
+        keep = t >= snap['ts'] - self.PRESSURE_WINDOW
+        t = t[keep] - snap['ts']
+        for ax, lines, values in ((self.ax_pressure, self.pressure_lines, pressure[keep]),
+                                  (self.ax_swap, self.swap_lines, swap[keep] / 1024 ** 2)):
+            for i, line in enumerate(lines):
+                line.set_data(t, values[:, i])
+            top = np.nanmax(values) if values.size and not np.isnan(values).all() else 0
+            ax.set_ylim(0, max(top * 1.1, 1))
+        self.canvas.draw_idle()
+
     def optimize_system_buffer(self):
         try:
             # Vider le cache système
@@ -345,41 +4209,86 @@ class RAMPage(BasePage):
             self.result_text.insert(tk.END, f"Erreur: {str(e)}\n")
 
     def clean_browser_cache(self):
-        browsers = {
-            'Chrome': os.path.expanduser('~\\AppData\\Local\\Google\\Chrome\\User Data\\Default\\Cache'),
-            'Firefox': os.path.expanduser('~\\AppData\\Local\\Mozilla\\Firefox\\Profiles'),
-            'Edge': os.path.expanduser('~\\AppData\\Local\\Microsoft\\Edge\\User Data\\Default\\Cache')
-        }
+        """Estime les caches des navigateurs, puis les vide après confirmation, hors du thread Tk."""
+        if self.cleaner is not None and not self.cleaner.done:
+            return
+        self.cleaner = Cleaner(t for t in cleanup_targets() if t.group == 'navigateurs').estimate()
+        self.poll_cleanup()
 
-        for browser, path in browsers.items():
-            try:
-                if os.path.exists(path):
-                    shutil.rmtree(path)
-                    self.result_text.insert(tk.END, f"Cache {browser} nettoyé\n")
-            except Exception as e:
-                self.result_text.insert(tk.END, f"Erreur {browser}: {str(e)}\n")
+    def poll_cleanup(self):
+        stats = self.cleaner.progress()
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, format_cleanup(stats))
+        if stats['done'] and stats['stage'] == 'estimation' and not stats['cancelled']:
+            if not confirm_cleanup(self.frame, stats):
+                return
+            self.cleaner.delete()
+        elif stats['done']:
+            return
+        self.frame.after(500, self.poll_cleanup)
+
+    PROCESS_INTERVAL_MS = 2000
 
     def analyze_ram_usage(self):
+        """Active ou arrête la vue des processus rafraîchie en direct."""
+        self.live = not self.live
         self.result_text.delete(1.0, tk.END)
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
-            try:
-                processes.append({
-                    'name': proc.info['name'],
-                    'memory': proc.info['memory_info'].rss
-                })
-            except:
-                continue
+        if self.live:
+            self.result_text.insert(tk.END, "Vue des processus en direct activée\n")
+            self.processes.reset()
+            self.refresh_page()
+        else:
+            self.result_text.insert(tk.END, "Vue des processus en direct arrêtée\n")
+
+    def toggle_accurate(self):
+        """Mode d'analyse mémoire : USS/PSS calculés en arrière-plan, classement par PSS."""
+        accurate = self.accurate_var.get()
+        self.process_table.accurate = accurate
+        if accurate:
+            self.process_table.key = 'pss'
+        elif self.process_table.key in ('uss', 'pss'):
+            self.process_table.key = 'rss'
+        if accurate and not self.live:
+            self.analyze_ram_usage()
+
+    def resume(self):
+        self.refresh_page()
+
+    def suspend(self):
+        super().suspend()
+        self.process_table.close()
 
-        processes.sort(key=lambda x: x['memory'], reverse=True)
-        self.result_text.insert(tk.END, "Top 20 processus par utilisation RAM:\n\n")
-        for proc in processes[:20]:
-            mem_mb = proc['memory'] / (1024 ** 2)
-            self.result_text.insert(tk.END, f"{proc['name']}: {mem_mb:.1f} MB\n")
+    def close(self):
+        self.suspend()
+        self.processes.close()
+
+    def refresh_page(self):
+        self.update_pressure_chart()
+        if self.live:
+            # La lecture des processus tourne dans un thread ; Tk ne fait qu'afficher
+            self.processes.poll()
+        self.schedule(min(self.processes.delay_ms(), 1000) if self.live else 1000, self.refresh_page)
+
+    def sort_processes(self, column):
+        if column in ProcessTable.KEYS:
+            self.process_table.key = column
+
+    def show_processes(self, rows):
+        missing = "…" if self.process_table.accurate else ""
+        mb = lambda value: f"{value / 1024 ** 2:.1f}" if value is not None else missing
+        self.process_rows = sync_treeview(self.process_tree, self.process_rows, [
+            (str(row['pid']), (row['pid'], row['name'], mb(row['rss']), mb(row.get('uss')), mb(row.get('pss')),
+                               f"{row['cpu']:.1f}", row['threads'], row['cmdline'])) for row in rows])
 
 
 class PerformancePage(BasePage):
+    USE_BLIT = True
+    MAX_DEVICES = 8
+
     def create_widgets(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         # Frame principal
         main_frame = ttk.Frame(self.frame)
         main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
@@ -393,7 +4302,6 @@ class PerformancePage(BasePage):
         # Graphique CPU par cœur
         self.ax_cpu_cores = self.fig.add_subplot(gs[0, 0])
         self.ax_cpu_cores.set_title("Utilisation CPU par cœur")
-        self.ax_cpu_cores.set_ylabel("Utilisation (%)")
 
         # Graphique Mémoire détaillé
         self.ax_memory = self.fig.add_subplot(gs[0, 1])
@@ -413,6 +4321,7 @@ class PerformancePage(BasePage):
         # Création du canvas
         self.canvas = FigureCanvasTkAgg(self.fig, main_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.setup_artists()
 
         # Frame pour les contrôles
         control_frame = ttk.LabelFrame(main_frame, text="Contrôles de performance")
@@ -428,75 +4337,285 @@ class PerformancePage(BasePage):
         ttk.Button(control_frame, text="Analyser démarrage",
                    command=self.analyze_startup).pack(side=tk.LEFT, padx=10, pady=5)  # padx augmenté
 
+        # Mode affiché par la carte des cœurs
+        self.core_mode_var = tk.StringVar(value='total')
+        for mode in reversed(('total',) + MetricCollector.CPU_MODES):
+            ttk.Radiobutton(control_frame, text=self.CORE_MODES[mode], value=mode,
+                            variable=self.core_mode_var).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(control_frame, text="Cœurs :").pack(side=tk.RIGHT, padx=5)
+
+        # Processus les plus actifs en E/S, relevés dans un thread toutes les IO_INTERVAL secondes
+        io_frame = ttk.LabelFrame(main_frame, text="Processus les plus actifs en E/S")
+        io_frame.pack(fill=tk.X, pady=5)
+        columns = ('pid', 'name', 'read', 'write', 'other', 'connections')
+        headings = {'pid': "PID", 'name': "Nom", 'read': "Lecture (MB/s)", 'write': "Écriture (MB/s)",
+                    'other': "Autres E/S (MB/s)", 'connections': "Connexions"}
+        sort_keys = {'read': 'disk', 'write': 'disk', 'other': 'other', 'connections': 'connections'}
+        self.io_tree = ttk.Treeview(io_frame, columns=columns, show='headings', height=8)
+        for column in columns:
+            self.io_tree.heading(column, text=headings[column],
+                                 command=lambda c=column: self.sort_io(sort_keys.get(c)))
+            self.io_tree.column(column, width=200 if column == 'name' else 110,
+                                anchor=tk.W if column == 'name' else tk.E)
+        self.io_tree.pack(fill=tk.X, padx=5, pady=5)
+        self.io_table = IOTopTable()
+        self.io_rows = {}
+        self.io_refresh = BackgroundRefresh(
+            self.io_table.refresh, self.IO_INTERVAL, self.show_io,
+            lambda e: self.result_text.insert(tk.END, f"Erreur E/S par processus: {str(e)}\n"))
+
         # Zone de résultats avec plus de marge
         self.result_text = tk.Text(main_frame, height=6)
         self.result_text.pack(fill=tk.X, pady=10)  # pady augmenté
 
+    def resume(self):
         # Démarrer la mise à jour
         self.start_update()
 
-    def update_graphs(self):
-        # Mise à jour CPU par cœur
-        cpu_percent = psutil.cpu_percent(percpu=True)
-        self.ax_cpu_cores.clear()
-        self.ax_cpu_cores.bar(range(len(cpu_percent)), cpu_percent)
-        self.ax_cpu_cores.set_title("Utilisation CPU par cœur")
-        self.ax_cpu_cores.set_ylim(0, 100)
+    def close(self):
+        super().close()
+        self.io_refresh.close()
 
-        # Mise à jour Mémoire - Version Windows
-        mem = psutil.virtual_memory()
-        labels = ['En utilisation', 'Disponible']
-        total_gb = mem.total / (1024 ** 3)
-        used_gb = (mem.total - mem.available) / (1024 ** 3)
-        available_gb = mem.available / (1024 ** 3)
-
-        sizes = [
-            (mem.total - mem.available) / mem.total * 100,  # Utilisé
-            mem.available / mem.total * 100  # Disponible
-        ]
+    IO_INTERVAL = 2.0
 
-        self.ax_memory.clear()
-        self.ax_memory.pie(sizes, labels=labels, autopct='%1.1f%%')
-        self.ax_memory.set_title(f"Mémoire totale: {total_gb:.1f} GB\n"
-                                 f"Utilisé: {used_gb:.1f} GB\n"
-                                 f"Disponible: {available_gb:.1f} GB")
+    def sort_io(self, key):
+        if key in IOTopTable.KEYS:
+            self.io_table.key = key
 
-        # Mise à jour E/S Disque
-        try:
-            disk_io = psutil.disk_io_counters()
-            read_mb = disk_io.read_bytes / 1048576
-            write_mb = disk_io.write_bytes / 1048576
-        except Exception:
-            read_mb = write_mb = 0
+    def refresh_io(self):
+        """Affiche le dernier relevé d'E/S par processus et en relance un si besoin."""
+        self.io_refresh.poll()
 
-        self.ax_disk_io.clear()
-        self.ax_disk_io.bar(['Lecture', 'Écriture'], [read_mb, write_mb])
-        self.ax_disk_io.set_title("Activité Disque (MB/s)")
+    def show_io(self, rows):
+        mb = 1024 ** 2
+        self.io_rows = sync_treeview(self.io_tree, self.io_rows, [
+            (str(row['pid']), (row['pid'], row['name'], f"{row['read'] / mb:.2f}",
+                               f"{row['write'] / mb:.2f}", f"{row['other'] / mb:.2f}",
+                               row['connections'])) for row in rows])
 
-        # Mise à jour Réseau
-        try:
-            net_io = psutil.net_io_counters()
-            sent_mb = net_io.bytes_sent / 1048576
-            recv_mb = net_io.bytes_recv / 1048576
-        except Exception:
-            sent_mb = recv_mb = 0
+    def setup_artists(self):
+        """Crée une fois pour toutes les artistes mis à jour à chaque tick."""
+        self.blit = BlitManager(self.canvas, self.USE_BLIT, self.instruments, type(self).__name__)
 
-        self.ax_network.clear()
-        self.ax_network.bar(['Envoyé', 'Reçu'], [sent_mb, recv_mb])
-        self.ax_network.set_title("Activité Réseau (MB)")
+        # Carte de chaleur cœurs × temps : une seule image, dont seules les données changent
+        ax = self.ax_cpu_cores
+        self.core_image = ax.imshow(np.full((1, 1), np.nan), aspect='auto', origin='lower', cmap='inferno',
+                                    vmin=0, vmax=100, interpolation='nearest',
+                                    extent=(-self.CORE_WINDOW, 0, -0.5, 0.5))
+        self.fig.colorbar(self.core_image, ax=ax, label='%')
+        ax.set_xlim(-self.CORE_WINDOW, 0)
+        ax.set_xlabel('Secondes')
+        ax.set_ylabel('Cœurs CPU')
+        self.core_count = None
+        self.core_order = None
+        self.node_lines = []
+        self.blit.add_artist(self.core_image, ax.title)
 
-        # Ajout d'une grille et des étiquettes d'axes pour les graphiques en barre
-        for ax in [self.ax_disk_io, self.ax_network]:
-            ax.grid(True, axis='y')
-            ax.set_ylabel('MB')
+        # Camembert mémoire : on ne fait que déplacer les angles des secteurs
+        self.mem_wedges, self.mem_labels, self.mem_pcts = self.ax_memory.pie(
+            [50, 50], labels=['En utilisation', 'Disponible'], autopct='%1.1f%%')
+        self.mem_title = self.ax_memory.title
+        self.blit.add_artist(*self.mem_wedges, *self.mem_labels, *self.mem_pcts, self.mem_title)
 
-        for ax in [self.ax_cpu_cores]:
+        # Barres E/S disque et réseau : une paire de barres par disque / interface
+        self.io_panels = {
+            'disk': {'ax': self.ax_disk_io, 'labels': ('Lecture', 'Écriture'),
+                     'title': "Activité Disque (MB/s)"},
+            'net': {'ax': self.ax_network, 'labels': ('Envoyé', 'Reçu'),
+                    'title': "Activité Réseau (MB/s)"},
+        }
+        for panel in self.io_panels.values():
+            ax = panel['ax']
             ax.grid(True, axis='y')
-            ax.set_ylabel('%')
-            ax.set_xlabel('Cœurs CPU')
+            ax.set_ylabel('MB/s')
+            ax.set_ylim(0, 1)
+            panel.update(devices=None, known=set(), bars=[])
+            self.blit.add_artist(ax.title)
 
-        self.canvas.draw_idle()
-        self.frame.after(1000, self.update_graphs)
+    CORE_WINDOW = 300
+    CORE_MODES = {'total': "Total", 'user': "Utilisateur", 'system': "Système",
+                  'iowait': "Attente E/S", 'steal': "Steal"}
+
+    def set_core_count(self, n):
+        """Range les lignes de la carte par nœud NUMA, séparés par un trait."""
+        ax = self.ax_cpu_cores
+        for line in self.node_lines:
+            line.remove()
+        self.node_lines = []
+        # La topologie locale ne dit rien de celle d'un démon distant
+        nodes = {} if isinstance(self.collector, RemoteCollector) else numa_nodes()
+        order = [c for cpus in nodes.values() for c in cpus if c < n]
+        order += sorted(set(range(n)) - set(order))
+        self.core_order = None if order == list(range(n)) else np.array(order)
+
+        if len(nodes) > 1:
+            ticks, labels, start = [], [], 0
+            for node, cpus in nodes.items():
+                count = sum(1 for c in cpus if c < n)
+                if not count:
+                    continue
+                ticks.append(start + (count - 1) / 2)
+                labels.append(f"nœud {node}")
+                if start:
+                    self.node_lines.append(ax.axhline(start - 0.5, color='white', lw=1))
+                start += count
+            ax.set_yticks(ticks)
+            ax.set_yticklabels(labels)
+        else:
+            from matplotlib.ticker import MaxNLocator
+            ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.set_ylim(-0.5, n - 0.5)
+        self.core_image.set_extent((-self.CORE_WINDOW, 0, -0.5, n - 0.5))
+        self.core_count = n
+
+    @staticmethod
+    def max_pool(values, size):
+        """Réduit les lignes de `values` à au plus `size` paquets consécutifs, par leur maximum."""
+        step = -(-len(values) // max(size, 1))
+        if step <= 1:
+            return values
+        # Tranches à pas fixe plutôt qu'un reshape : aucune copie du tableau d'entrée
+        out = values[::step].copy()
+        for i in range(1, step):
+            part = values[i::step]
+            np.maximum(out[:len(part)], part, out=out[:len(part)])
+        return out
+
+    @staticmethod
+    def time_grid(t, values, start, end, columns):
+        """Ramène des échantillons irrégulièrement espacés sur `columns` colonnes de même durée.
+
+        Une colonne qui contient des échantillons prend leur maximum ; une
+        colonne vide prend l'échantillon suivant, qui mesure l'intervalle
+        écoulé depuis le précédent. Sans échantillon antérieur connu, elle
+        reste vide (NaN).
+        """
+        edges = start + (end - start) * np.arange(columns) / columns
+        first = np.searchsorted(t, edges)
+        counts = np.diff(np.append(first, np.searchsorted(t, end, side='right')))
+        grid = values[np.minimum(first, len(t) - 1)]
+        grid[(first == 0) | (first >= len(t))] = np.nan
+        filled = counts > 0
+        if filled.any():
+            grid[filled] = np.maximum.reduceat(values, first[filled], axis=0)
+        return grid
+
+    def update_heatmap(self, snap):
+        """Recopie l'historique par cœur dans l'image et résume le déséquilibre courant."""
+        mode = self.core_mode_var.get() or 'total'
+        start = snap['ts'] - self.CORE_WINDOW
+        t, values = self.collector.core_series(mode, start)
+        if not len(t) or values.shape[1] != self.core_count:
+            self.core_image.set_data(np.full((self.core_count, 1), np.nan))
+        else:
+            if self.core_order is not None:
+                values = values[:, self.core_order]
+            # Jamais plus de colonnes ni de lignes que de pixels : le rééchantillonnage de
+            # matplotlib coûte en proportion des données, un maximum par paquets NumPy beaucoup moins
+            bbox = self.ax_cpu_cores.bbox
+            rows = self.max_pool(values.T, int(bbox.height))
+            self.core_image.set_data(self.time_grid(t, rows.T, start, snap['ts'], max(int(bbox.width), 1)).T)
+        cores = np.asarray(snap['cpu_cores'])
+        self.ax_cpu_cores.set_title(f"Cœurs ({self.CORE_MODES[mode]}) : moy. {cores.mean():.0f} %, "
+                                    f"max {cores.max():.0f} %, σ {cores.std():.0f}")
+
+    def set_io_devices(self, panel, devices):
+        """Reconstruit les barres d'un panneau E/S quand la liste des périphériques change."""
+        ax = panel['ax']
+        self.blit.remove_artist(*panel['bars'])
+        for bar in panel['bars']:
+            bar.remove()
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+
+        x = range(len(devices))
+        first = ax.bar([i - 0.2 for i in x], [0] * len(devices), width=0.4, label=panel['labels'][0])
+        second = ax.bar([i + 0.2 for i in x], [0] * len(devices), width=0.4, label=panel['labels'][1])
+        ax.set_xticks(list(x))
+        ax.set_xticklabels(devices, rotation=30 if len(devices) > 3 else 0)
+        ax.legend(loc='upper right')
+        panel['devices'] = devices
+        panel['bars'] = list(first) + list(second)
+        self.blit.add_artist(*panel['bars'])
+
+    def update_io_panel(self, panel, rates):
+        """Affiche les débits par périphérique ; retourne True si un rendu complet est requis."""
+        rescale = False
+        names = sorted(n for n in rates if n != RateTracker.TOTAL)
+        if panel['devices'] is None or set(names) != panel['known']:
+            # Au-delà de MAX_DEVICES, on garde les plus actifs au moment du changement
+            busiest = sorted(names, key=lambda n: sum(rates[n]), reverse=True)[:self.MAX_DEVICES]
+            self.set_io_devices(panel, sorted(busiest))
+            panel['known'] = set(names)
+            rescale = True
+
+        devices = panel['devices']
+        values = [rates[n][0] / 1048576 for n in devices] + [rates[n][1] / 1048576 for n in devices]
+        rescale |= self.update_bars(panel['ax'], panel['bars'], values)
+
+        first, second = rates.get(RateTracker.TOTAL, (0, 0))
+        panel['ax'].set_title(f"{panel['title']}\n{panel['labels'][0]}: {first / 1048576:.2f}"
+                              f"  {panel['labels'][1]}: {second / 1048576:.2f}")
+        return rescale
+
+    def update_pie(self, fractions):
+        angle = 0.0
+        for wedge, label, pct, frac in zip(self.mem_wedges, self.mem_labels, self.mem_pcts, fractions):
+            theta1, theta2 = angle, angle + 360.0 * frac
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            mid = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{100 * frac:.1f}%")
+            angle = theta2
+
+    @staticmethod
+    def update_bars(ax, bars, values):
+        """Met à jour la hauteur des barres ; retourne True si l'axe a dû être réétalonné."""
+        for bar, value in zip(bars, values):
+            bar.set_height(value)
+        top = max(values) if values else 0
+        _, y1 = ax.get_ylim()
+        if top <= y1 and (top >= 0.25 * y1 or y1 <= 1):
+            return False
+        ax.set_ylim(0, max(top * 1.25, 1))
+        return True
+
+    def update_graphs(self):
+        snap = self.collector.latest()
+        if snap is None:
+            self.schedule(200, self.update_graphs)
+            return
+
+        # Mise à jour CPU par cœur
+        rescale = False
+        if len(snap['cpu_cores']) != self.core_count:
+            self.set_core_count(len(snap['cpu_cores']))
+            rescale = True
+        self.update_heatmap(snap)
+
+        # Mise à jour Mémoire - Version Windows
+        mem_total, mem_available = snap['mem_total'], snap['mem_available']
+        total_gb = mem_total / (1024 ** 3)
+        used_gb = (mem_total - mem_available) / (1024 ** 3)
+        available_gb = mem_available / (1024 ** 3)
+
+        used = (mem_total - mem_available) / mem_total
+        self.update_pie([used, 1 - used])
+        self.mem_title.set_text(f"Mémoire totale: {total_gb:.1f} GB\n"
+                                f"Utilisé: {used_gb:.1f} GB\n"
+                                f"Disponible: {available_gb:.1f} GB")
+
+        # Mise à jour E/S Disque et Réseau (débits réels, par périphérique)
+        rescale |= self.update_io_panel(self.io_panels['disk'], snap['disk_rates'])
+        rescale |= self.update_io_panel(self.io_panels['net'], snap['net_rates'])
+
+        self.blit.update(full=rescale)
+        self.refresh_io()
+        self.schedule(self.refresh_ms(500, 5000), self.update_graphs)
 
     def start_update(self):
         self.update_graphs()
@@ -545,6 +4664,7 @@ class PerformancePage(BasePage):
     def analyze_startup(self):
         """Analyse les programmes au démarrage"""
         try:
+            import winreg
             startup_items = []
 
             # Analyse du registre
@@ -577,8 +4697,121 @@ class PerformancePage(BasePage):
             self.result_text.insert(tk.END, f"Erreur: {str(e)}")
 
 
+class CgroupPage(BasePage):
+    """Groupes de contrôle (cgroup v2) les plus consommateurs : conteneurs, services, sessions."""
+    INTERVAL_MS = 1000
+
+    def create_widgets(self):
+        control_frame = ttk.LabelFrame(self.frame, text="Groupes de contrôle (cgroup v2)")
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(control_frame, text="Classer par :").pack(side=tk.LEFT, padx=5, pady=5)
+        self.sort_var = tk.StringVar(value='cpu')
+        labels = {'cpu': "CPU", 'memory': "Mémoire", 'io': "E/S", 'pressure': "Pression"}
+        for key in CgroupCollector.KEYS:
+            ttk.Radiobutton(control_frame, text=labels[key], value=key, variable=self.sort_var,
+                            command=lambda k=key: self.sort_cgroups(k)).pack(side=tk.LEFT, padx=5)
+        self.status_label = ttk.Label(control_frame, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=10)
+
+        columns = ('path', 'cpu', 'throttled', 'memory', 'anon', 'file', 'io_read', 'io_write',
+                   'cpu_pressure', 'memory_pressure', 'io_pressure')
+        headings = {'path': "Groupe", 'cpu': "CPU (%)", 'throttled': "Bridé (%)", 'memory': "Mémoire (MB)",
+                    'anon': "Anon (MB)", 'file': "Cache (MB)", 'io_read': "Lecture (MB/s)",
+                    'io_write': "Écriture (MB/s)", 'cpu_pressure': "PSI CPU", 'memory_pressure': "PSI mém.",
+                    'io_pressure': "PSI E/S"}
+        sort_keys = {'cpu': 'cpu', 'throttled': 'cpu', 'memory': 'memory', 'anon': 'memory', 'file': 'memory',
+                     'io_read': 'io', 'io_write': 'io', 'cpu_pressure': 'pressure',
+                     'memory_pressure': 'pressure', 'io_pressure': 'pressure'}
+        self.cgroup_tree = ttk.Treeview(self.frame, columns=columns, show='headings', height=20)
+        for column in columns:
+            self.cgroup_tree.heading(column, text=headings[column],
+                                     command=lambda c=column: self.sort_cgroups(sort_keys.get(c)))
+            self.cgroup_tree.column(column, width=380 if column == 'path' else 85,
+                                    anchor=tk.W if column == 'path' else tk.E)
+        self.cgroup_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.cgroups = CgroupCollector()
+        self.cgroup_rows = {}
+        self.cgroup_refresh = BackgroundRefresh(
+            self.cgroups.refresh, self.INTERVAL_MS / 1000, self.show_cgroups,
+            lambda e: self.status_label.config(text=f"Erreur: {str(e)}"))
+
+    def resume(self):
+        if not self.cgroups.available:
+            self.status_label.config(text=f"cgroup v2 indisponible ({self.cgroups.root})")
+            return
+        self.refresh_cgroups()
+
+    def close(self):
+        super().close()
+        # Le relevé en cours lit les fichiers des groupes : on l'attend avant de les fermer
+        self.cgroup_refresh.close(wait=True)
+        self.cgroups.close()
+
+    def sort_cgroups(self, key):
+        if key in CgroupCollector.KEYS:
+            self.cgroups.key = key
+            self.sort_var.set(key)
+
+    def refresh_cgroups(self):
+        # La lecture des groupes tourne dans un thread ; Tk ne fait qu'afficher
+        self.cgroup_refresh.poll()
+        self.schedule(self.cgroup_refresh.delay_ms(), self.refresh_cgroups)
+
+    def show_cgroups(self, rows):
+        mb = 1024 ** 2
+        self.cgroup_rows = sync_treeview(self.cgroup_tree, self.cgroup_rows, [
+            (row['path'], (row['path'], f"{row['cpu']:.1f}", f"{row['throttled']:.1f}",
+                           f"{row['memory'] / mb:.1f}", f"{row['anon'] / mb:.1f}", f"{row['file'] / mb:.1f}",
+                           f"{row['io_read'] / mb:.2f}", f"{row['io_write'] / mb:.2f}",
+                           f"{row['cpu_pressure']:.1f}", f"{row['memory_pressure']:.1f}",
+                           f"{row['io_pressure']:.1f}")) for row in rows])
+        status = f"{self.cgroups.count} groupes"
+        if self.cgroups.fd_limited:
+            status += " (limite de descripteurs atteinte)"
+        self.status_label.config(text=status)
+
+
+def run_headless(host='127.0.0.1', port=9101, backend=None, history_path=None):
+    """Collecte sans Tk et expose les métriques sur HTTP jusqu'à Ctrl+C ou SIGTERM."""
+    collector = MetricCollector(backend, store=HistoryStore(history_path, MetricCollector.SERIES),
+                                adaptive=AdaptiveInterval())
+    collector.restore()
+    collector.alerts.open_log()
+    collector.start()
+    server = MetricsServer(collector, host, port).start()
+    logging.info("Métriques disponibles sur http://%s:%d/metrics", host, server.port)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        while not stop.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        collector.stop()
+
+
 def main():
-    app = SystemMonitorGUI()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Moniteur Système Avancé")
+    parser.add_argument('--headless', action='store_true',
+                        help="collecte sans interface et sert les métriques sur HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9101)
+    parser.add_argument('--backend', choices=list(BACKENDS), default=None)
+    parser.add_argument('--attach', metavar='URL',
+                        help="affiche les métriques d'un démon --headless (ex. http://127.0.0.1:9101)")
+    args = parser.parse_args()
+
+    if args.headless:
+        logging.basicConfig(level=logging.INFO)
+        run_headless(args.host, args.port, args.backend)
+        return
+
+    app = SystemMonitorGUI(args.backend, attach=args.attach)
     app.root.mainloop()
 
 
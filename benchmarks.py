@@ -0,0 +1,685 @@
+"""Mesures de performance des chemins critiques de PC_Ressources, sans interface.
+
+Les pages sont rendues avec le backend Agg et des données synthétiques : aucun
+écran n'est nécessaire. `--save` enregistre les résultats comme référence,
+`--compare` les confronte à une référence et signale les régressions.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter.constants
+import types
+
+import numpy as np
+import psutil
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import PC_Ressources as pcr
+
+
+def bench_history_write(records=200_000, batch=1000):
+    """Débit d'écriture de l'historique disque (ajout + vidage + fsync final)."""
+    path = tempfile.mkdtemp(prefix='pcr-bench-')
+    try:
+        store = pcr.HistoryStore(path, fields=pcr.MetricCollector.SERIES)
+        values = [1.0] * len(pcr.MetricCollector.SERIES)
+        start = time.perf_counter()
+        for i in range(records):
+            store.append(1.7e9 + i, values)
+            if i % batch == batch - 1:
+                store.flush()
+        store.stop()
+        elapsed = time.perf_counter() - start
+        return {
+            'records': records,
+            'seconds': elapsed,
+            'records_per_s': records / elapsed,
+            'mb_per_s': records * store.record.size / elapsed / 1024 ** 2,
+        }
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def bench_history_reload(hours=24, interval=1.0):
+    """Temps de rechargement de `hours` heures d'historique dans la rétention."""
+    path = tempfile.mkdtemp(prefix='pcr-bench-')
+    try:
+        store = pcr.HistoryStore(path, fields=pcr.MetricCollector.SERIES)
+        count = int(hours * 3600 / interval)
+        now = time.time()
+        rng = np.random.default_rng(0)
+        for i, row in enumerate(rng.random((count, len(pcr.MetricCollector.SERIES))).tolist()):
+            store.append(now - (count - i) * interval, row)
+        store.stop()
+
+        collector = pcr.MetricCollector('synthetic', store=store)
+        start = time.perf_counter()
+        loaded = collector.restore(hours=hours)
+        elapsed = time.perf_counter() - start
+        return {'records': loaded, 'seconds': elapsed}
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def make_tree(path, files=100_000, per_dir=100, fanout=10, large_every=1000, large_size=200_000_000):
+    """Génère une arborescence synthétique ; les gros fichiers sont creux (sparse)."""
+    dirs = [path]
+    created = 0
+    while created < files:
+        parent = dirs[len(dirs) // fanout] if len(dirs) > 1 else path
+        current = os.path.join(parent, 'd%06d' % len(dirs))
+        os.makedirs(current, exist_ok=True)
+        dirs.append(current)
+        for _ in range(min(per_dir, files - created)):
+            with open(os.path.join(current, 'f%07d' % created), 'wb') as f:
+                f.truncate(large_size if created % large_every == 0 else created % 4096)
+            created += 1
+    return created
+
+
+def bench_scan(files=100_000, workers=8):
+    """Débit de FileScanner sur une arborescence synthétique de `files` fichiers."""
+    path = tempfile.mkdtemp(prefix='pcr-bench-')
+    try:
+        make_tree(path, files)
+        scanner = pcr.FileScanner(path, threshold=100_000_000, workers=workers).start()
+        scanner.wait()
+        stats = scanner.progress()
+        return {'files': stats['files'], 'dirs': stats['dirs'], 'seconds': stats['elapsed'],
+                'files_per_s': stats['files_per_s'], 'top': len(scanner.top())}
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def make_duplicate_tree(path, files=2000, duplicate_every=20, seed=0):
+    """Arborescence de fichiers réels de tailles variées, avec une part de doublons."""
+    rng = np.random.default_rng(seed)
+    previous = None
+    for i in range(files):
+        folder = os.path.join(path, 'd%04d' % (i // 100))
+        os.makedirs(folder, exist_ok=True)
+        if previous is not None and i % duplicate_every == 0:
+            data = previous
+        else:
+            # Tailles souvent partagées pour exercer l'étape des empreintes partielles
+            data = rng.bytes(int(rng.choice([64, 256, 1024])) * 1024)
+        with open(os.path.join(folder, 'f%06d' % i), 'wb') as f:
+            f.write(data)
+        previous = data
+
+
+def bench_duplicates(files=2000):
+    """Coût de DuplicateFinder et part des octets réellement lus par rapport aux octets vus."""
+    path = tempfile.mkdtemp(prefix='pcr-bench-')
+    try:
+        make_duplicate_tree(path, files)
+        start = time.perf_counter()
+        finder = pcr.DuplicateFinder(path, min_size=1).start()
+        finder.wait()
+        elapsed = time.perf_counter() - start
+        stats = finder.progress()
+        return {'files': stats['files'], 'seconds': elapsed, 'groups': stats['groups'],
+                'bytes_scanned': stats['bytes'], 'bytes_read': stats['bytes_read'],
+                'read_ratio': stats['bytes_read'] / max(stats['bytes'], 1),
+                'reclaimable': stats['reclaimable']}
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def bench_startup(idle_seconds=5.0, timeout=30.0):
+    """Temps d'import à froid, temps jusqu'au premier affichage et CPU de l'interface au repos.
+
+    Le premier affichage et le CPU au repos demandent un écran (DISPLAY) ;
+    sans écran, seules les mesures d'import sont renseignées.
+    """
+    code = ("import sys, time; t = time.perf_counter(); import PC_Ressources; "
+            "print(time.perf_counter() - t, 'matplotlib' in sys.modules)")
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    import_seconds, heavy = out.stdout.split()
+    result = {'import_seconds': float(import_seconds), 'matplotlib_at_import': heavy == 'True',
+              'first_paint_seconds': None, 'idle_cpu_percent': None}
+
+    path = tempfile.mkdtemp(prefix='pcr-bench-')
+    try:
+        if pcr.tk is None:
+            return result
+        start = time.perf_counter()
+        try:
+            app = pcr.SystemMonitorGUI(backend='synthetic', history_path=path)
+        except pcr.tk.TclError:
+            return result
+        try:
+            page = app.pages['main']
+            while page.blit.background is None and time.perf_counter() - start < timeout:
+                app.root.update()
+            result['first_paint_seconds'] = time.perf_counter() - start
+
+            proc = psutil.Process()
+            before, t0 = proc.cpu_times(), time.perf_counter()
+            while time.perf_counter() - t0 < idle_seconds:
+                app.root.update()
+                time.sleep(0.01)
+            after, elapsed = proc.cpu_times(), time.perf_counter() - t0
+            cpu = (after.user - before.user) + (after.system - before.system)
+            result['idle_cpu_percent'] = 100 * cpu / elapsed
+        finally:
+            app.on_close()
+        return result
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def timings(samples):
+    """Statistiques en millisecondes d'une liste de durées en secondes."""
+    ms = np.asarray(samples) * 1000
+    return {'n': len(ms), 'mean_ms': float(ms.mean()), 'p50_ms': float(np.percentile(ms, 50)),
+            'p99_ms': float(np.percentile(ms, 99))}
+
+
+def bench_collector(samples=2000):
+    """Coût d'un échantillon complet (backend + débits + capteurs en cache) par backend."""
+    names = ['synthetic', 'psutil'] + (['proc'] if os.path.exists('/proc/stat') else [])
+    result = {}
+    for name in names:
+        collector = pcr.MetricCollector(name)
+        collector.backend.open()
+        try:
+            collector.sample()
+            durations = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                collector.sample()
+                durations.append(time.perf_counter() - start)
+        finally:
+            collector.backend.close()
+        result[name] = timings(durations)
+    return result
+
+
+class HeadlessWidget:
+    """Remplaçant des widgets Tk pour rendre les pages sans écran : tout appel est accepté."""
+    pending = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: HeadlessWidget()
+
+    def after(self, ms, callback, *args):
+        # Les rafraîchissements programmés ne sont jamais exécutés : la mesure les appelle elle-même
+        HeadlessWidget.pending.append(callback)
+        return callback
+
+    def after_cancel(self, token):
+        if token in HeadlessWidget.pending:
+            HeadlessWidget.pending.remove(token)
+
+    def get(self):
+        return ''
+
+
+class HeadlessModule:
+    """Module tk/ttk de substitution : constantes réelles, widgets HeadlessWidget."""
+
+    def __getattr__(self, name):
+        return getattr(tkinter.constants, name, HeadlessWidget)
+
+
+class HeadlessCanvas(FigureCanvasAgg):
+    """Canvas Agg synchrone : `draw_idle` dessine tout de suite pour être chronométré."""
+
+    def __init__(self, figure, master=None):
+        super().__init__(figure)
+        self.draws = 0
+
+    def get_tk_widget(self):
+        return HeadlessWidget()
+
+    def draw(self):
+        self.draws += 1
+        super().draw()
+
+    def draw_idle(self, *args, **kwargs):
+        self.draw()
+
+    def blit(self, bbox=None):
+        pass
+
+
+@contextlib.contextmanager
+def headless_pages():
+    """Pages de PC_Ressources construites sans Tk, rendues dans un canvas Agg."""
+    saved = pcr.tk, pcr.ttk, sys.modules.get('matplotlib.backends.backend_tkagg')
+    pcr.tk = pcr.ttk = HeadlessModule()
+    sys.modules['matplotlib.backends.backend_tkagg'] = types.SimpleNamespace(FigureCanvasTkAgg=HeadlessCanvas)
+    try:
+        yield
+    finally:
+        pcr.tk, pcr.ttk = saved[0], saved[1]
+        if saved[2] is None:
+            sys.modules.pop('matplotlib.backends.backend_tkagg', None)
+        else:
+            sys.modules['matplotlib.backends.backend_tkagg'] = saved[2]
+        HeadlessWidget.pending.clear()
+
+
+def fill_history(collector, end, hours=24, interval=1.0):
+    """Historique synthétique de `hours` heures se terminant à `end`."""
+    count = int(hours * 3600 / interval)
+    t = end - np.arange(count, 0, -1) * interval
+    rng = np.random.default_rng(0)
+    for name in pcr.MetricCollector.SERIES:
+        collector.history[name].extend(t, 50 + 10 * rng.standard_normal(count))
+
+
+def bench_render(frames=60, ranges=('5 min', '30 min', '24 h', '3 jours'), cores=(4, 16, 64)):
+    """Durée d'une image de MainPage.update (par plage affichée) et de
+    PerformancePage.update_graphs (par nombre de cœurs), en blit avec Agg."""
+    result = {'main': {}, 'performance': {}}
+    with headless_pages():
+        # Horloge simulée à une seconde par image : débits et fenêtres réalistes
+        clock = iter(range(10 ** 9))
+        now = time.time()
+
+        def publish(collector):
+            tick = next(clock)
+            collector._publish(collector.sample(ts=now + tick, mono=tick))
+
+        collector = pcr.MetricCollector(pcr.SyntheticBackend())
+        fill_history(collector, now, hours=72)
+        publish(collector)
+        page = pcr.MainPage(HeadlessWidget(), collector)
+        page.canvas.draw()
+        for name in ranges:
+            page.range_var = types.SimpleNamespace(get=lambda name=name: name)
+            page.on_range_change()
+            draws = page.canvas.draws
+            durations = []
+            for _ in range(frames):
+                publish(collector)
+                start = time.perf_counter()
+                page.update()
+                durations.append(time.perf_counter() - start)
+            result['main'][name] = dict(timings(durations), points=len(page.ln_ram.get_xdata()),
+                                        full_draws=page.canvas.draws - draws)
+
+        for count in cores:
+            collector = pcr.MetricCollector(pcr.SyntheticBackend(cores=count))
+            publish(collector)
+            page = pcr.PerformancePage(HeadlessWidget(), collector)
+            page.update_graphs()
+            page.canvas.draw()
+            draws = page.canvas.draws
+            durations = []
+            for _ in range(frames):
+                publish(collector)
+                start = time.perf_counter()
+                page.update_graphs()
+                durations.append(time.perf_counter() - start)
+            result['performance']['%d cores' % count] = dict(timings(durations),
+                                                             full_draws=page.canvas.draws - draws)
+    return result
+
+
+def bench_heatmap(frames=30, cores=(8, 64, 256), history=(60, 600, 3600)):
+    """Mise à jour et rastérisation de la carte des cœurs de PerformancePage, historique
+    plein, selon le nombre de cœurs et la profondeur d'historique (doit rester stable)."""
+    result = {}
+    with headless_pages():
+        for count in cores:
+            for depth in history:
+                collector = pcr.MetricCollector(pcr.SyntheticBackend(cores=count), alerts=())
+                collector.CORE_HISTORY = depth
+                for tick in range(depth):
+                    collector._publish(collector.sample(ts=1.7e9 + tick, mono=tick))
+                page = pcr.PerformancePage(HeadlessWidget(), collector)
+                page.update_graphs()
+                page.canvas.draw()
+                durations = []
+                for tick in range(depth, depth + frames):
+                    collector._publish(collector.sample(ts=1.7e9 + tick, mono=tick))
+                    start = time.perf_counter()
+                    page.update_heatmap(collector.latest())
+                    page.fig.draw_artist(page.core_image)
+                    durations.append(time.perf_counter() - start)
+                result['%d cores x %d' % (count, depth)] = timings(durations)
+    return result
+
+
+def bench_ylim(sizes=(10_000, 100_000, 1_000_000), width=800, repeat=20):
+    """Limites verticales de MainPage sur de grandes fenêtres : LTTB à la largeur de l'axe, puis min/max.
+
+    Remplace la mesure d'`auto_lim` : les limites viennent désormais de la
+    série réduite qui est tracée. `scan_us` donne pour comparaison un min/max
+    sur la fenêtre complète.
+    """
+    result = {}
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        t = np.arange(size, dtype=np.float64)
+        v = np.cumsum(rng.normal(0, 1, size)) + 50
+        v[rng.integers(0, size, size // 1000)] = np.nan
+        entry = {}
+        start = time.perf_counter()
+        for _ in range(repeat):
+            t_low, v_low = pcr.lttb(t, v, width)
+        entry['lttb_us'] = (time.perf_counter() - start) / repeat * 1e6
+        start = time.perf_counter()
+        for _ in range(repeat):
+            pcr.MainPage.lim_from_extrema(*pcr.MainPage.extrema(v_low))
+        entry['limits_us'] = (time.perf_counter() - start) / repeat * 1e6
+        start = time.perf_counter()
+        for _ in range(repeat):
+            np.nanmin(v), np.nanmax(v)
+        entry['scan_us'] = (time.perf_counter() - start) / repeat * 1e6
+        result[str(size)] = entry
+    return result
+
+
+def bench_ring_append(widths=(None, 8, 64), count=20_000, capacity=600):
+    """Coût d'un RingBuffer.append, pour une valeur seule et pour des lignes de `width` valeurs."""
+    result = {}
+    rng = np.random.default_rng(0)
+    for width in widths:
+        shape = (count,) if width is None else (count, width)
+        values = rng.random(shape) * 100
+        buf = pcr.RingBuffer(capacity, width=width)
+        start = time.perf_counter()
+        for k in range(count):
+            buf.append(float(k), values[k])
+        result['scalaire' if width is None else 'largeur %d' % width] = {
+            'append_us': (time.perf_counter() - start) / count * 1e6}
+    return result
+
+
+ALERT_GROUPS = (('cpu', 'above'), ('ram', 'below'), ('cpu_cores', 'above'), ('cpu_cores', 'rate'),
+                ('cpu_cores', 'zscore'), ('disk_rates.read', 'above'), ('disk_rates.read', 'zscore'),
+                ('disk_rates.write', 'zscore'), ('net_rates.recv', 'above'), ('net_rates.recv', 'zscore'),
+                ('net_rates.sent', 'rate'), ('sensors.temp', 'above'))
+
+
+def alert_snapshots(ticks, cores, devices, sensors=8, seed=0):
+    """Instantanés synthétiques (instantané, séries scalaires), avec des pics de temps en temps."""
+    rng = np.random.default_rng(seed)
+    base = rng.random(cores) * 40
+    snaps = []
+    for tick in range(ticks):
+        spike = rng.random() < 0.05
+        load = np.clip(base + rng.normal(0, 3, cores) + (50 if spike else 0), 0, 100)
+        disks = {'disk%d' % d: tuple(rng.lognormal(13 + 2 * spike, 0.3, 2)) for d in range(devices)}
+        nics = {'nic%d' % d: tuple(rng.lognormal(11 + 2 * spike, 0.3, 2)) for d in range(devices)}
+        temps = 55 + rng.normal(0, 2, sensors) + (30 if spike else 0)
+        snap = {'ts': 1.7e9 + tick, 'cpu_cores': load.tolist(), 'disk_rates': disks, 'net_rates': nics,
+                'sensors': {'s%d' % k: ('temp', 'capteur %d' % k, t) for k, t in enumerate(temps.tolist())}}
+        snaps.append((snap, {'cpu': float(load.mean()), 'ram': 8 - 6 * spike + float(rng.random())}))
+    return snaps
+
+
+def bench_alerts(rules=(12, 300, 1200), ticks=500, cores=64, devices=16):
+    """AlertEngine.evaluate par échantillon, règles réparties sur les 12 groupes d'ALERT_GROUPS.
+
+    Les seuils de chaque groupe sont étalés pour qu'une partie des règles se
+    déclenche et se résolve pendant la mesure.
+    """
+    result = {}
+    snaps = alert_snapshots(ticks, cores, devices)
+    for count in rules:
+        per_group = max(count // len(ALERT_GROUPS), 1)
+        scales = {'above': (60, 100), 'below': (1, 5), 'rate': (20, 60), 'zscore': (4, 8)}
+        engine_rules = []
+        for metric, kind in ALERT_GROUPS:
+            lo, hi = scales[kind]
+            if metric.startswith(('disk_rates', 'net_rates')) and kind == 'above':
+                lo, hi = 5e6, 5e7
+            for k, threshold in enumerate(np.linspace(lo, hi, per_group)):
+                engine_rules.append(pcr.AlertRule('%s %s %d' % (metric, kind, k), metric, kind,
+                                                  float(threshold), for_seconds=2, warmup=30))
+        engine = pcr.AlertEngine(engine_rules)
+        logger = engine.log
+        logger.disabled = True
+        durations, events = [], 0
+        try:
+            for snap, scalars in snaps:
+                start = time.perf_counter()
+                events += len(engine.evaluate(snap, scalars))
+                durations.append(time.perf_counter() - start)
+        finally:
+            logger.disabled = False
+        result[str(len(engine_rules))] = dict(timings(durations), events=events)
+    return result
+
+
+def write_cgroup(path, tick, seed):
+    """Fichiers d'un cgroup v2 factice, compteurs avancés selon `tick`."""
+    usage = tick * (1000 + seed * 37 % 5000)
+    io = tick * (4096 * (seed % 13))
+    files = {
+        'cpu.stat': f"usage_usec {usage}\nuser_usec {usage // 2}\nsystem_usec {usage // 2}\n"
+                    f"nr_periods 0\nnr_throttled 0\nthrottled_usec 0\n",
+        'memory.current': f"{(seed % 512 + 1) * 1024 ** 2}\n",
+        'memory.stat': f"anon {(seed % 256) * 1024 ** 2}\nfile {(seed % 128) * 1024 ** 2}\nkernel 0\n",
+        'io.stat': f"8:0 rbytes={io} wbytes={io // 2} rios={tick} wios={tick} dbytes=0 dios=0\n",
+    }
+    for kind in ('cpu', 'memory', 'io'):
+        files[kind + '.pressure'] = (f"some avg10={seed % 10:.2f} avg60=0.00 avg300=0.00 total={tick}\n"
+                                     f"full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    for name, text in files.items():
+        with open(os.path.join(path, name), 'w') as f:
+            f.write(text)
+
+
+def make_cgroup_tree(root, groups, per_slice=50):
+    """Hiérarchie cgroup v2 factice : des tranches contenant chacune `per_slice` services."""
+    with open(os.path.join(root, 'cgroup.controllers'), 'w') as f:
+        f.write("cpu io memory\n")
+    write_cgroup(root, 0, 0)
+    paths = []
+    for i in range(groups):
+        path = os.path.join(root, 'slice%03d.slice' % (i // per_slice), 'svc%05d.service' % i)
+        os.makedirs(path, exist_ok=True)
+        write_cgroup(path, 0, i)
+        paths.append(path)
+    for folder in {os.path.dirname(p) for p in paths}:
+        write_cgroup(folder, 0, 0)
+    return paths
+
+
+def bench_cgroups(sizes=(100, 300, 1000), refreshes=10):
+    """CgroupCollector.refresh sur une arborescence factice (tmpfs si disponible)."""
+    result = {}
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    for count in sizes:
+        root = tempfile.mkdtemp(prefix='pcr-bench-cgroup-', dir=base)
+        collector = pcr.CgroupCollector(root)
+        try:
+            paths = make_cgroup_tree(root, count)
+            collector.refresh()
+            durations = []
+            for tick in range(1, refreshes + 1):
+                # Compteurs mis à jour hors mesure : seul le relevé est chronométré
+                for i, path in enumerate(paths):
+                    write_cgroup(path, tick, i)
+                start = time.perf_counter()
+                rows = collector.refresh()
+                durations.append(time.perf_counter() - start)
+            result['%d groups' % count] = dict(timings(durations), groups=collector.count,
+                                               top=len(rows), fd_limited=collector.fd_limited)
+        finally:
+            collector.close()
+            shutil.rmtree(root, ignore_errors=True)
+    return result
+
+
+class FakeProcess:
+    """Processus factice exposant la partie de l'API psutil lue par ProcessTable."""
+
+    def __init__(self, pid, rng):
+        self.pid = pid
+        self._name = 'proc%05d' % pid
+        self._create_time = 1.7e9 + pid
+        self._rss = int(rng.integers(1, 2048)) * 1024 ** 2
+        self._cpu = float(rng.random() * 100)
+        self._threads = int(rng.integers(1, 64))
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def create_time(self):
+        return self._create_time
+
+    def name(self):
+        return self._name
+
+    def exe(self):
+        return '/usr/bin/' + self._name
+
+    def cmdline(self):
+        return [self.exe(), '--flag', str(self.pid)]
+
+    def memory_info(self):
+        return types.SimpleNamespace(rss=self._rss)
+
+    def cpu_times(self):
+        self._cpu += 0.01
+        return types.SimpleNamespace(user=self._cpu, system=0.0)
+
+    def num_threads(self):
+        return self._threads
+
+
+def bench_processes(count=10_000, refreshes=5):
+    """ProcessTable.refresh et RAMPage.show_processes sur `count` processus factices."""
+    rng = np.random.default_rng(0)
+    procs = [FakeProcess(pid, rng) for pid in range(1, count + 1)]
+    real_iter = pcr.psutil.process_iter
+    pcr.psutil.process_iter = lambda *args, **kwargs: iter(procs)
+    try:
+        table = pcr.ProcessTable()
+        start = time.perf_counter()
+        rows = table.refresh()
+        cold = time.perf_counter() - start
+        warm = []
+        for _ in range(refreshes):
+            start = time.perf_counter()
+            rows = table.refresh()
+            warm.append(time.perf_counter() - start)
+
+        with headless_pages():
+            page = pcr.RAMPage(HeadlessWidget(), None)
+            shown = []
+            for _ in range(refreshes):
+                start = time.perf_counter()
+                page.show_processes(rows)
+                shown.append(time.perf_counter() - start)
+    finally:
+        pcr.psutil.process_iter = real_iter
+    return {'processes': count, 'cold_refresh_seconds': cold,
+            'refresh': timings(warm), 'show_rows': timings(shown)}
+
+
+BENCHMARKS = {
+    'collector': bench_collector,
+    'render': bench_render,
+    'heatmap': bench_heatmap,
+    'ylim': bench_ylim,
+    'ring_append': bench_ring_append,
+    'alerts': bench_alerts,
+    'history_write': bench_history_write,
+    'history_reload': bench_history_reload,
+    'scan': bench_scan,
+    'duplicates': bench_duplicates,
+    'processes': bench_processes,
+    'cgroups': bench_cgroups,
+    'startup': bench_startup,
+}
+
+
+def flatten(result, prefix=''):
+    """{'a': {'b': 1}} -> {'a.b': 1}, en ne gardant que les nombres."""
+    flat = {}
+    for key, value in result.items():
+        name = prefix + str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def direction(key):
+    """+1 si une valeur plus grande est meilleure, -1 si plus petite, 0 si purement informative."""
+    last = key.rsplit('.', 1)[-1]
+    if last.endswith('_per_s'):
+        return 1
+    if last.endswith(('seconds', '_ms', '_us', 'cpu_percent', 'read_ratio')):
+        return -1
+    return 0
+
+
+def compare(results, baseline, tolerance):
+    """Affiche l'écart à la référence et retourne le nombre de régressions."""
+    current, reference = flatten(results), flatten(baseline)
+    regressions = 0
+    for key in sorted(current.keys() & reference.keys()):
+        sense = direction(key)
+        old, new = reference[key], current[key]
+        if not sense or not old:
+            continue
+        change = (new - old) / abs(old)
+        worse = change * sense < -tolerance
+        regressions += worse
+        print("%-50s %12.4g %12.4g %+8.1f%%%s" % (key, old, new, 100 * change,
+                                                  "  RÉGRESSION" if worse else ""))
+    return regressions
+
+
+def environment():
+    import matplotlib
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'numpy': np.__version__, 'matplotlib': matplotlib.__version__,
+            'psutil': psutil.__version__, 'date': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('names', nargs='*', help="Mesures à lancer parmi : %s (toutes par défaut)"
+                        % ', '.join(BENCHMARKS))
+    parser.add_argument('--save', metavar='FICHIER', help="enregistre les résultats comme référence JSON")
+    parser.add_argument('--compare', metavar='FICHIER', help="compare aux résultats d'une référence JSON")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="écart relatif toléré avant de signaler une régression (défaut 0.10)")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("mesure inconnue : %s" % ', '.join(unknown))
+
+    results = {}
+    for name in args.names or BENCHMARKS:
+        results[name] = BENCHMARKS[name]()
+        print(name, json.dumps(results[name], indent=2))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print("\nComparaison avec %s (%s)" % (args.compare, baseline['environment'].get('date')))
+        regressions = compare(results, baseline['results'], args.tolerance)
+        if regressions:
+            print("%d régression(s) au-delà de %.0f %%" % (regressions, 100 * args.tolerance))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
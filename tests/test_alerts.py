@@ -0,0 +1,52 @@
+import numpy as np
+
+import PC_Ressources as pcr
+
+
+def run(engine, values, dt=1.0, metric='cpu'):
+    """Évalue une suite de valeurs ; retourne [(instant, état)] des événements."""
+    events = []
+    for k, value in enumerate(values):
+        for event in engine.evaluate({'ts': k * dt}, {metric: value}):
+            events.append((k * dt, event['state']))
+    return events
+
+
+def test_hysteresis_between_threshold_and_clear():
+    engine = pcr.AlertEngine([pcr.AlertRule("CPU", 'cpu', 'above', 90, clear=80, for_seconds=0)])
+    events = run(engine, [95, 85, 89, 95, 79, 85, 95])
+    # 85 et 89 sont entre les seuils : l'alerte reste active jusqu'à 79
+    assert events == [(0.0, 'firing'), (4.0, 'resolved'), (6.0, 'firing')]
+
+
+def test_for_seconds_is_measured_on_timestamps():
+    rule = pcr.AlertRule("CPU", 'cpu', 'above', 90, clear=80, for_seconds=5)
+    for dt in (0.25, 1.0):
+        engine = pcr.AlertEngine([rule])
+        events = run(engine, [95] * int(10 / dt), dt)
+        assert events[0] == (5.0, 'firing')
+
+
+def test_missing_value_keeps_state():
+    engine = pcr.AlertEngine([pcr.AlertRule("CPU", 'cpu', 'above', 90, clear=80, for_seconds=0)])
+    events = run(engine, [95, None, 50])
+    assert events == [(0.0, 'firing'), (2.0, 'resolved')]
+    assert engine.active() == []
+
+
+def test_per_core_rules_fire_per_label():
+    engine = pcr.AlertEngine([pcr.AlertRule("Cœur", 'cpu_cores', 'above', 90, clear=80, for_seconds=0)])
+    events = engine.evaluate({'ts': 0.0, 'cpu_cores': [10, 95, 20, 99]}, {})
+    assert sorted(e['label'] for e in events) == sorted(pcr.core_labels(4)[i] for i in (1, 3))
+
+
+def test_zscore_seeds_from_first_sample():
+    rule = pcr.AlertRule('z', 'cpu', 'zscore', 4.0, warmup=10, for_seconds=0)
+    group = pcr.AlertGroup('cpu', 'zscore', [rule])
+    # Une base loin de zéro ne déclenche rien, ni au premier point ni pendant la chauffe
+    assert group.evaluate(('',), np.array([500.0]), 0.0) is None
+    assert group.mean[0, 0] == 500.0
+    for k in range(1, 30):
+        assert group.evaluate(('',), np.array([500.0 + np.sin(k)]), float(k)) is None
+    fired, resolved, signal = group.evaluate(('',), np.array([900.0]), 30.0)
+    assert fired.all()
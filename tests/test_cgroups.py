@@ -0,0 +1,56 @@
+import os
+
+import PC_Ressources as pcr
+from benchmarks import make_cgroup_tree, write_cgroup
+
+
+def test_new_group_shows_up_on_next_refresh(tmp_path):
+    root = str(tmp_path)
+    make_cgroup_tree(root, 4, per_slice=2)
+    collector = pcr.CgroupCollector(root, top_n=100)
+    try:
+        collector.refresh()
+        count = collector.count
+        mtime = os.stat(os.path.join(root, 'slice000.slice')).st_mtime_ns
+
+        # cgroupfs ne met pas toujours à jour la date du parent : on la remet comme avant
+        path = os.path.join(root, 'slice000.slice', 'new.service')
+        os.mkdir(path)
+        write_cgroup(path, 0, 7)
+        os.utime(os.path.dirname(path), ns=(mtime, mtime))
+
+        collector.refresh()
+        assert collector.count == count + 1
+        assert path in collector.groups
+    finally:
+        collector.close()
+
+
+def test_removed_group_is_forgotten(tmp_path):
+    root = str(tmp_path)
+    paths = make_cgroup_tree(root, 4, per_slice=2)
+    collector = pcr.CgroupCollector(root, top_n=100)
+    try:
+        collector.refresh()
+        for name in os.listdir(paths[0]):
+            os.remove(os.path.join(paths[0], name))
+        os.rmdir(paths[0])
+        collector.refresh()
+        assert paths[0] not in collector.groups
+    finally:
+        collector.close()
+
+
+def test_rows_report_rates_between_refreshes(tmp_path):
+    root = str(tmp_path)
+    paths = make_cgroup_tree(root, 3)
+    collector = pcr.CgroupCollector(root, top_n=10)
+    try:
+        assert collector.refresh() == []
+        for i, path in enumerate(paths):
+            write_cgroup(path, 1, i)
+        rows = collector.refresh()
+        assert {row['path'] for row in rows} >= {'/' + os.path.relpath(p, root) for p in paths}
+        assert all(row['cpu'] >= 0 for row in rows)
+    finally:
+        collector.close()
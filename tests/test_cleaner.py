@@ -0,0 +1,52 @@
+import os
+import time
+
+import PC_Ressources as pcr
+
+
+def make_tree(root):
+    old = time.time() - 3 * 24 * 3600
+    paths = {}
+    for name in ('old.log', 'sub/old.bin', 'x.lock', 'a.pid', '.X0-lock', '.hidden/file', 'tmux-1000/default'):
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'x' * 100)
+        os.utime(path, (old, old))
+        paths[name] = path
+    fresh = os.path.join(root, 'fresh.log')
+    with open(fresh, 'wb') as f:
+        f.write(b'x' * 100)
+    paths['fresh.log'] = fresh
+    os.mkfifo(os.path.join(root, 'old.fifo'))
+    os.utime(os.path.join(root, 'old.fifo'), (old, old))
+    for folder in ('sub', '.hidden', 'tmux-1000'):
+        os.utime(os.path.join(root, folder), (old, old))
+    return paths
+
+
+def test_dry_run_deletes_nothing_then_delete_removes_only_the_plan(tmp_path):
+    root = str(tmp_path)
+    paths = make_tree(root)
+    target = pcr.CleanupTarget("tmp", [root], min_age=24 * 3600, keep_hidden=True)
+
+    cleaner = pcr.Cleaner([target]).estimate()
+    assert cleaner.wait(10)
+    planned = sorted(path for path, _ in cleaner.plan['tmp'])
+    assert planned == sorted([paths['old.log'], paths['sub/old.bin']])
+    stats = cleaner.progress()
+    assert stats['targets']['tmp']['files'] == 2 and stats['bytes'] == 200
+    assert all(os.path.exists(p) for p in paths.values())
+
+    cleaner.delete()
+    assert cleaner.wait(10)
+    stats = cleaner.progress()
+    assert stats['freed'] == 200 and stats['errors'] == 0
+    assert not os.path.exists(paths['old.log'])
+    assert not os.path.exists(os.path.join(root, 'sub'))
+    # Verrous, fichiers cachés, sessions, fichiers récents et tubes nommés restent
+    for name in ('x.lock', 'a.pid', '.X0-lock', '.hidden/file', 'tmux-1000/default', 'fresh.log'):
+        assert os.path.exists(paths[name]), name
+    assert os.path.exists(os.path.join(root, 'old.fifo'))
+    assert os.path.isdir(root)
+
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+
+import PC_Ressources as pcr
+
+
+def test_round_trip(tmp_path):
+    store = pcr.HistoryStore(str(tmp_path), fields=('ram', 'cpu'))
+    for k in range(100):
+        store.append(1000.0 + k, [k, None if k == 50 else 2 * k])
+    store.stop()
+
+    records = store.load()
+    assert records['ts'].tolist() == [1000.0 + k for k in range(100)]
+    assert records['ram'].tolist() == list(range(100))
+    assert np.isnan(records['cpu'][50])
+    assert records['cpu'][51] == 102
+    assert store.load(since=1090.0)['ts'].tolist() == [1090.0 + k for k in range(10)]
+
+
+def test_resumes_last_segment_and_drops_torn_record(tmp_path):
+    store = pcr.HistoryStore(str(tmp_path), fields=('ram',))
+    store.append(1.0, [1])
+    store.stop()
+    segment = store.segments()[-1]
+    with open(segment, 'ab') as f:
+        f.write(b'\x01\x02\x03')  # arrêt brutal au milieu d'un enregistrement
+
+    store = pcr.HistoryStore(str(tmp_path), fields=('ram',))
+    store.append(2.0, [2])
+    store.stop()
+    assert store.segments() == [segment]
+    assert store.load()['ram'].tolist() == [1.0, 2.0]
+
+
+def test_rotation_bounds_total_size(tmp_path):
+    record = 2 * 8
+    store = pcr.HistoryStore(str(tmp_path), fields=('ram',),
+                             segment_bytes=pcr.HistoryStore.HEADER_SIZE + 10 * record,
+                             max_bytes=3 * (pcr.HistoryStore.HEADER_SIZE + 10 * record))
+    for k in range(100):
+        store.append(1000.0 + k, [k])
+        store.flush()
+    store.stop()
+
+    segments = store.segments()
+    assert len(segments) <= 4
+    assert sum(os.path.getsize(p) for p in segments) <= store.max_bytes + store.segment_bytes
+    ts = store.load()['ts']
+    # Les plus anciens segments sont partis, la fin de l'historique reste intacte et ordonnée
+    assert ts[-1] == 1099.0 and ts[0] > 1000.0
+    assert np.all(np.diff(ts) > 0)
+
+
+def test_second_writer_is_read_only(tmp_path):
+    writer = pcr.HistoryStore(str(tmp_path), fields=('ram',))
+    other = pcr.HistoryStore(str(tmp_path), fields=('ram',))
+    assert not writer.read_only and other.read_only
+    writer.append(1.0, [1])
+    other.append(1.0, [99])
+    writer.stop()
+    other.stop()
+    assert writer.load()['ram'].tolist() == [1.0]
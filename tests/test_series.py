@@ -0,0 +1,78 @@
+import numpy as np
+
+import PC_Ressources as pcr
+
+
+def test_ringbuffer_wraparound_keeps_last_points_contiguous():
+    buf = pcr.RingBuffer(5)
+    for k in range(12):
+        buf.append(float(k), k * 10.0)
+    assert len(buf) == 5
+    assert buf.times().tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert buf.values().tolist() == [70.0, 80.0, 90.0, 100.0, 110.0]
+    assert buf.last() == (11.0, 110.0)
+    # Vue sans copie sur le stockage interne
+    assert np.shares_memory(buf.values(), buf._v)
+
+
+def test_ringbuffer_extend_matches_append():
+    appended, extended = pcr.RingBuffer(4, width=2), pcr.RingBuffer(4, width=2)
+    t = np.arange(7, dtype=np.float64)
+    rows = np.column_stack((t, -t))
+    for ti, row in zip(t, rows):
+        appended.append(ti, row)
+    extended.append(-1.0, (0, 0))
+    extended.extend(t, rows)
+    assert appended.times().tolist() == extended.times().tolist()
+    assert appended.values().tolist() == extended.values().tolist()
+
+
+def test_retention_consolidates_minutes():
+    series = pcr.RetentionSeries(raw_capacity=100, levels=((60, 10),))
+    for k in range(180):
+        series.append(60.0 * 100 + k, float(k % 60))
+    step, buf = series.levels[0]
+    # Deux minutes closes, la troisième est encore ouverte
+    assert buf.times().tolist() == [6000.0, 6060.0]
+    assert buf.values()[:, 0].tolist() == [0.0, 0.0]
+    assert buf.values()[:, 2].tolist() == [59.0, 59.0]
+    assert np.allclose(buf.values()[:, 1], 29.5)
+
+    # Plage plus ancienne que les points bruts : agrégats, seau en cours compris
+    t, v = series.query(6000.0, 6200.0, stat=2)
+    assert t.tolist() == [6000.0, 6060.0, 6120.0]
+    assert v.tolist() == [59.0, 59.0, 59.0]
+
+
+def test_retention_extend_matches_append():
+    t = 1.7e9 + np.arange(0, 600, 1.0)
+    v = np.sin(t / 30.0)
+    v[100:110] = np.nan
+    one, bulk = pcr.RetentionSeries(), pcr.RetentionSeries()
+    for ti, vi in zip(t, v):
+        one.append(ti, vi)
+    bulk.extend(t, v)
+    for stat in (0, 1, 2):
+        a, b = one.query(t[0] - 3600, t[-1], stat), bulk.query(t[0] - 3600, t[-1], stat)
+        assert np.array_equal(a[0], b[0])
+        assert np.allclose(a[1], b[1], equal_nan=True)
+
+
+def test_lttb_drops_nan_and_keeps_endpoints():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50.0)
+    y[::7] = np.nan
+    tx, ty = pcr.lttb(x, y, 100)
+    assert len(tx) == 100
+    assert not np.isnan(ty).any()
+    assert tx[0] == 1.0 and tx[-1] == 999.0
+    assert np.all(np.diff(tx) > 0)
+
+
+def test_lttb_short_or_empty_input_is_returned_as_is():
+    x = np.arange(5, dtype=np.float64)
+    y = np.array([1.0, np.nan, 3.0, np.nan, 5.0])
+    tx, ty = pcr.lttb(x, y, 100)
+    assert tx.tolist() == [0.0, 2.0, 4.0] and ty.tolist() == [1.0, 3.0, 5.0]
+    tx, ty = pcr.lttb(x, np.full(5, np.nan), 3)
+    assert len(tx) == 0
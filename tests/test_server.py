@@ -0,0 +1,67 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import PC_Ressources as pcr
+
+
+@pytest.fixture
+def server():
+    collector = pcr.MetricCollector(pcr.SyntheticBackend())
+    for k in range(30):
+        collector._publish(collector.sample())
+    return pcr.MetricsServer(collector)
+
+
+def test_range_returns_series(server):
+    code, content_type, body = server.respond('/api/range', {'series': 'ram', 'last': '3600'})
+    data = json.loads(body)
+    assert code == 200 and content_type == 'application/json'
+    assert data['series'] == 'ram' and len(data['t']) == len(data['v']) > 0
+
+
+@pytest.mark.parametrize('stat', ['0', '1', '2'])
+def test_range_accepts_known_stats(server, stat):
+    assert server.respond('/api/range', {'series': 'ram', 'stat': stat})[0] == 200
+
+
+@pytest.mark.parametrize('stat', ['3', '7', '-1'])
+def test_range_rejects_unknown_stat(server, stat):
+    code, _, body = server.respond('/api/range', {'series': 'ram', 'stat': stat})
+    assert code == 400 and b'stat' in body
+
+
+def test_range_rejects_unknown_series_and_device(server):
+    assert server.respond('/api/range', {'series': 'nope'})[0] == 404
+    assert server.respond('/api/range', {'series': 'disk_rates.nope'})[0] == 404
+
+
+def test_range_bad_numbers_raise_value_error(server):
+    # Le gestionnaire HTTP transforme ValueError en 400
+    with pytest.raises(ValueError):
+        server.respond('/api/range', {'series': 'ram', 'stat': 'x'})
+    with pytest.raises(ValueError):
+        server.respond('/api/range', {'series': 'ram', 'last': 'beaucoup'})
+
+
+def test_range_per_device(server):
+    devices = json.loads(server.respond('/api/devices', {})[2])
+    name = 'disk_rates.' + devices['disk_rates'][0]
+    data = json.loads(server.respond('/api/range', {'series': name, 'last': '3600'})[2])
+    assert data['columns'] == ['read', 'write']
+    assert all(len(row) == 2 for row in data['v'])
+
+
+def test_http_errors_are_answered(server):
+    server.port = 0
+    server.start()
+    try:
+        base = f"http://{server.host}:{server.port}"
+        for query in ('series=ram&stat=7', 'series=ram&last=beaucoup'):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(f"{base}/api/range?{query}", timeout=5)
+            assert error.value.code == 400
+    finally:
+        server.stop()